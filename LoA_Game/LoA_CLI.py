@@ -1,53 +1,14 @@
 #!/usr/bin/env python3
+import argparse
 import sys
-import string
 
-from linesofaction import LinesOfActionGame
-from linesofaction import _utils
+from linesofaction import notation
 from linesofaction.piece import Piece
 from linesofaction.rules import GameEndState
 
-def parse_position(pos_str):
-    '''Parses a position like "A1" into (row, col) indices.
-    
-    Columns are letters (A,B,C,...), rows are numbers starting from 1.
-    Board indexing: top-left is A1, top row is 1, leftmost column is A.
-    Internally, rows and columns are zero-based indexed.
-    '''
-    pos_str = pos_str.strip().upper()
-    if len(pos_str) < 2:
-        raise ValueError('Position too short. Must be like A1.')
-
-    # Extract the column letter(s) and row number
-    col_part = ''.join([ch for ch in pos_str if ch.isalpha()])
-    row_part = ''.join([ch for ch in pos_str if ch.isdigit()])
-
-    if not col_part or not row_part:
-        raise ValueError('Invalid position format. Example: A1, C3.')
-
-    col = 0
-    # Handle multiple letters for columns if board larger than 26 columns
-    # For a standard 8x8 board, this is not necessary, but let's be general
-    for ch in col_part:
-        col = col * 26 + (ord(ch) - ord('A'))
-
-    row = int(row_part) - 1
-    return (row, col)
-
-
-def position_to_str(row, col):
-    '''Converts (row, col) to a standard chess-like notation: A1, B3, etc.'''
-    # For columns beyond 'Z', we can use a double-letter system if needed
-    # For standard LOA (8x8), only single-letter is required
-    letters = []
-    base = col
-    while True:
-        letters.append(chr(base % 26 + ord('A')))
-        base = base // 26 - 1
-        if base < 0:
-            break
-    col_str = ''.join(reversed(letters))
-    return f'{col_str}{row+1}'
+# Kept under their historical names
+parse_position = notation.parse_square
+position_to_str = notation.square_to_str
 
 
 def print_board(engine):
@@ -56,10 +17,33 @@ def print_board(engine):
     print(f"Current Player: {engine.current_player.name.capitalize()}\n")
 
 
-def main():
+def print_pass(engine):
+    '''Tells if the last move left the opponent without a legal move.'''
+    if engine.passed is not None:
+        print(f"{engine.passed.name.capitalize()} has no legal move and passes.\n")
+
+
+def play(computer=None, budget=2.0, ponder=True, no_move='pass', repetition_draw=None, max_plies=None):
+    '''Plays a game in the terminal.
+
+    Args:
+        computer (Piece): Player moved by the computer, None for two humans.
+        budget (float): Thinking time of the computer per move (seconds).
+        ponder (bool): Let the computer think during the human's turn.
+        no_move (str): 'pass' or 'lose' when a player has no legal move (see `GameEngine`).
+        repetition_draw (int): Draw when a position occurs this many times (None: never).
+        max_plies (int): Draw after this many plies (None: no limit).
+    '''
+    from linesofaction import LinesOfActionGame
+
     # Initialize the game
-    engine = LinesOfActionGame()
+    engine = LinesOfActionGame(no_move=no_move, repetition_draw=repetition_draw, max_plies=max_plies)
     rules = engine.rules  # Just a reference if needed
+    ponderer = None
+    if computer is not None:
+        from linesofaction.movegen import Position
+        from linesofaction.ponder import Ponderer
+        ponderer = Ponderer()
     print("Welcome to Lines of Action!")
     print("Players: Black (b) and Red (r)")
     print("To move, first select a piece you own, then select a destination.")
@@ -71,12 +55,33 @@ def main():
 
         # Check if game is already over
         if engine.winner is not None:
-            if engine.winner == 'TIE':
+            if engine.adjudicated is not None:
+                print(f"The game ended in a tie ({engine.adjudicated}, after {engine.plies} plies)!")
+            elif engine.winner == 'TIE':
                 print("The game ended in a tie!")
             else:
                 print(f"The winner is: {engine.winner.name.capitalize()}!")
+            if ponderer is not None:
+                ponderer.stop()
             break
 
+        if engine.current_player == computer:
+            position = Position.from_board(engine.board, engine.current_player)
+            result = ponderer.think(position, budget=budget)
+            if result.move is None:
+                print("The computer has no valid move.")
+                break
+            origin, target = result.move
+            print(f"({engine.current_player.name.capitalize()}) Computer plays "
+                  f"{position_to_str(*origin)}-{position_to_str(*target)} "
+                  f"(depth {result.depth}, {result.nodes} nodes)\n")
+            engine.select(origin, player=True, reset=True)
+            engine.move(target)
+            print_pass(engine)
+            if ponder and engine.winner is None:
+                ponderer.ponder(Position.from_board(engine.board, engine.current_player), result)
+            continue
+
         # Prompt to select a piece
         while True:
             try:
@@ -114,15 +119,118 @@ def main():
                 move_pos_str = input(f"({engine.current_player.name.capitalize()}) Move to: ")
                 move_pos = parse_position(move_pos_str)
                 engine.move(move_pos)  # Will raise if invalid
+                print_pass(engine)
                 break
             except ValueError as e:
                 print(e)
                 print("Try another position or type Ctrl+C to exit.")
                 continue
 
-        # After a move, engine checks game state and switches player automatically.
+        # After a move, engine checks game state and switches player automatically
+        # (back to the same player if the opponent has to pass).
         # Loop continues until game over.
 
 
+def run_engine(weights=None):
+    '''Runs the line-based engine protocol on stdin/stdout.
+
+    Args:
+        weights (str): Weight file of a `NeuralEvaluator` to evaluate positions with.
+    '''
+    from linesofaction.engine_protocol import EngineProtocol
+    searcher = None
+    if weights:
+        from linesofaction.neural import NeuralEvaluator
+        from linesofaction.search import Searcher
+        net = NeuralEvaluator.load(weights)
+        searcher = Searcher(evaluate=net, batch_evaluate=net.evaluate_batch)
+    EngineProtocol(searcher=searcher).run(sys.stdin)
+
+
+def run_replay(paths, processes=None, verbose=False):
+    '''Replays game files, printing the first illegal move of every invalid game.
+
+    Returns:
+        int: Number of invalid games.
+    '''
+    import time
+    from linesofaction.replay import replay_files
+
+    start = time.perf_counter()
+    games = invalid = plies = 0
+    for result in replay_files(paths or ['-'], processes=processes):
+        games += 1
+        plies += result.plies
+        if result.error is not None:
+            invalid += 1
+            print(result)
+        elif verbose:
+            print(result)
+    elapsed = time.perf_counter() - start
+    print(f'{games} games, {invalid} invalid, {plies} plies in {elapsed:.2f}s '
+          f'({games / max(elapsed, 1e-9):.0f} games/s)', file=sys.stderr)
+    return invalid
+
+
+def run_export(paths, output, shard_size=65536, augment=None, seed=0, fmt='npz', processes=None):
+    '''Exports the positions of game files as sharded training data.'''
+    import time
+    from linesofaction.dataset import export
+
+    start = time.perf_counter()
+    summary = export(paths or ['-'], output, shard_size=shard_size, augment=augment,
+                     seed=seed, fmt=fmt, processes=processes)
+    elapsed = time.perf_counter() - start
+    print(f"{summary['games']} games ({summary['skipped']} skipped), {summary['positions']} positions "
+          f"in {summary['shards']} shards, {elapsed:.2f}s "
+          f"({summary['positions'] / max(elapsed, 1e-9):.0f} positions/s)", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Lines of Action.')
+    subparsers = parser.add_subparsers(dest='command')
+    play_parser = subparsers.add_parser('play', help='Play a game in the terminal (default).')
+    play_parser.add_argument('--computer', choices=['black', 'red'],
+                             help='Let the computer play this color.')
+    play_parser.add_argument('--budget', type=float, default=2.0,
+                             help='Thinking time of the computer per move (seconds).')
+    play_parser.add_argument('--no-ponder', action='store_true',
+                             help="Do not think during the opponent's turn.")
+    play_parser.add_argument('--no-move', choices=['pass', 'lose'], default='pass',
+                             help='What happens to a player without a legal move (default: pass).')
+    play_parser.add_argument('--repetition-draw', type=int, metavar='N',
+                             help='Draw when a position occurs N times.')
+    play_parser.add_argument('--max-plies', type=int, metavar='N', help='Draw after N plies.')
+    engine = subparsers.add_parser('engine', help='Speak the UCI-style engine protocol on stdin/stdout.')
+    engine.add_argument('--weights', help='Evaluate positions with a neural network weight file (.npz).')
+    replay = subparsers.add_parser('replay', help='Validate game files (one game of A1 moves per line).')
+    replay.add_argument('files', nargs='*', help='Game files, stdin if none (or "-").')
+    replay.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of processes (default: CPU count).')
+    replay.add_argument('-v', '--verbose', action='store_true', help='Also print the valid games.')
+    export = subparsers.add_parser('export', help='Export the positions of game files as training data.')
+    export.add_argument('files', nargs='*', help='Game files, stdin if none (or "-").')
+    export.add_argument('-o', '--output', required=True, help='Output directory.')
+    export.add_argument('--shard-size', type=int, default=65536, help='Positions per shard.')
+    export.add_argument('--augment', choices=['all', 'random'], help='Symmetry augmentation.')
+    export.add_argument('--seed', type=int, default=0, help='Seed of the random augmentation.')
+    export.add_argument('--format', choices=['npz', 'npy'], default='npz', help='Shard format.')
+    export.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of processes (default: CPU count).')
+    args = parser.parse_args(argv)
+
+    if args.command == 'engine':
+        run_engine(args.weights)
+    elif args.command == 'replay':
+        sys.exit(1 if run_replay(args.files, args.jobs, args.verbose) else 0)
+    elif args.command == 'export':
+        run_export(args.files, args.output, args.shard_size, args.augment, args.seed, args.format, args.jobs)
+    elif args.command == 'play':
+        computer = Piece[args.computer.upper()] if args.computer else None
+        play(computer, args.budget, not args.no_ponder, args.no_move, args.repetition_draw, args.max_plies)
+    else:
+        play()
+
+
 if __name__ == '__main__':
     main()
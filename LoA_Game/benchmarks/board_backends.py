@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+r'''Board backend benchmark: list vs NumPy storage for the common Board operations.
+
+For every board size, times single-cell access (peek, pop + place), whole
+board queries (count, get_positions) and move generation
+(`GameRules.get_valid_steps`) on both backends, and prints which one is
+faster. The size up to which the list backend wins is what
+`linesofaction.storage.kMaxListCells` should be.
+
+Usage:
+    python benchmarks/board_backends.py [--sizes 6 8 12 16 32 64] [--seconds 0.2]
+'''
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linesofaction.board import Board  # noqa: E402
+from linesofaction.piece import Piece  # noqa: E402
+from linesofaction.rules import GameRules  # noqa: E402
+from linesofaction.storage import kBackends, kMaxListCells  # noqa: E402
+
+
+def operations(board):
+    '''Returns {name: function} of the timed operations on the board.'''
+    rules = GameRules()
+    player = board.players[0]
+    origin = board.get_positions(player)[0]
+    squares = [(row, col) for row in range(board.rows) for col in range(board.cols)]
+
+    def peek():
+        for square in squares:
+            board.peek(square)
+
+    def pop_place():
+        board.place(origin, board.pop(origin))
+
+    return {
+        'peek (all cells)': peek,
+        'pop + place': pop_place,
+        'count': lambda: board.count(Piece.RED),
+        'get_positions': lambda: board.get_positions(Piece.RED),
+        'get_valid_steps': lambda: rules.get_valid_steps(board, origin, player),
+    }
+
+
+def measure(function, seconds):
+    '''Returns the best time of one call in microseconds.'''
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    repeat = max(3, int(seconds / max(timer.timeit(number) / number, 1e-9) / number))
+    return min(timer.repeat(repeat=min(repeat, 20), number=number)) / number * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[6, 8, 12, 16, 24, 32, 48, 64])
+    parser.add_argument('--seconds', type=float, default=0.2, help='Time per measurement.')
+    args = parser.parse_args(argv)
+
+    backends = sorted(kBackends)
+    print(f'default: list backend up to {kMaxListCells} cells')
+    print(f'{"size":>7} {"operation":<18}' + ''.join(f'{name + " us":>12}' for name in backends)
+          + '  faster')
+    for size in args.sizes:
+        results = {}
+        for backend in backends:
+            board = Board(size, size, backend=backend)
+            for name, function in operations(board).items():
+                results.setdefault(name, {})[backend] = measure(function, args.seconds)
+        for name, times in results.items():
+            fastest = min(times, key=times.get)
+            ratio = max(times.values()) / times[fastest]
+            print(f'{size:>3}x{size:<3} {name:<18}' + ''.join(f'{times[b]:12.2f}' for b in backends)
+                  + f'  {fastest} x{ratio:.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+r'''Neural evaluation benchmark: positions per second, single versus batched.
+
+Times `NeuralEvaluator` on positions taken from random games, one position per
+call and in batches of several sizes, then a fixed-depth search with the
+network evaluating its leaves one by one and batched per frontier (depth 1)
+node.
+Without a weight file, an MLP and a small CNN with random weights are used
+(the throughput does not depend on the weight values).
+
+Usage:
+    python benchmarks/neural_eval.py [--weights eval.npz] [--batches 1 16 64 128 256] [--depth 3]
+'''
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linesofaction.movegen import Position  # noqa: E402
+from linesofaction.neural import NeuralEvaluator  # noqa: E402
+from linesofaction.search import Searcher  # noqa: E402
+
+
+def sample_positions(count, rows, cols, seed=0):
+    '''Returns (cells, players) of positions from random games.'''
+    rng = random.Random(seed)
+    cells, players = [], []
+    while len(cells) < count:
+        position = Position.initial(rows, cols)
+        for _ in range(rng.randrange(60)):
+            moves = position.moves()
+            if not moves:
+                break
+            position.make(rng.choice(moves))
+        cells.append(bytes(position.cells))
+        players.append(position.player)
+    return cells, players
+
+
+def throughput(function, count, seconds):
+    '''Returns the number of positions per second of function(), which evaluates `count`.'''
+    calls, start = 0, time.perf_counter()
+    while True:
+        function()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return calls * count / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--weights', help='Weight file (default: random MLP and CNN).')
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 16, 64, 128, 256])
+    parser.add_argument('--depth', type=int, default=3, help='Depth of the search comparison.')
+    parser.add_argument('--seconds', type=float, default=0.5, help='Time per measurement.')
+    args = parser.parse_args(argv)
+
+    if args.weights:
+        nets = {os.path.basename(args.weights): NeuralEvaluator.load(args.weights)}
+    else:
+        nets = {'mlp 128x64': NeuralEvaluator.random(hidden=(128, 64)),
+                'cnn 16x16+64': NeuralEvaluator.random(channels=(16, 16), hidden=(64,))}
+
+    for name, net in nets.items():
+        cells, players = sample_positions(max(args.batches), net.rows, net.cols)
+        positions = [Position(Position.initial(net.rows, net.cols).tables, list(c), p)
+                     for c, p in zip(cells, players)]
+        print(f'{name}')
+        single = throughput(lambda: [net(position) for position in positions[:64]], 64, args.seconds)
+        print(f'  {"single":>12}: {single:10.0f} positions/s')
+        for size in args.batches:
+            batched = throughput(lambda: net.evaluate_batch(cells[:size], players[:size]), size, args.seconds)
+            print(f'  {"batch " + str(size):>12}: {batched:10.0f} positions/s  (x{batched / single:.1f})')
+
+        root = Position.initial(net.rows, net.cols)
+        for label, batch in (('search single', None), ('search batched', net.evaluate_batch)):
+            searcher = Searcher(evaluate=net, batch_evaluate=batch)
+            result = searcher.search(root, depth=args.depth)
+            print(f'  {label:>15}: depth {result.depth} in {result.elapsed:.2f}s, '
+                  f'{result.nps} nodes/s, move {result.move}, score {result.score}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
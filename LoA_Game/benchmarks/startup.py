@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+r'''Startup benchmark: time to import the package and create the first `GameEngine()`.
+
+Every run is a fresh Python process that imports the package, creates a
+`GameEngine` and reports how long that took. The median over the runs is
+compared with the target. One more run under `python -X importtime` lists the
+slowest imports, to show where the time goes.
+
+Usage:
+    python benchmarks/startup.py [--runs 20] [--target-ms 30]
+    python benchmarks/startup.py --snippet "import linesofaction.search"
+'''
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+kRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+kSnippet = 'from linesofaction import LinesOfActionGame; LinesOfActionGame()'
+
+# Runs the snippet and prints its duration (ms) and whether NumPy got imported
+kTimer = '''
+import time
+start = time.perf_counter()
+exec({snippet!r})
+elapsed = time.perf_counter() - start
+import sys
+print(elapsed * 1000, 'numpy' in sys.modules)
+'''
+
+
+def run_once(snippet, importtime=False):
+    '''Returns (milliseconds, numpy imported, importtime lines) of one fresh process.'''
+    env = dict(os.environ, PYTHONPATH=kRoot + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    # Measure with cached bytecode, like an installed package
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    options = ['-X', 'importtime'] if importtime else []
+    proc = subprocess.run(
+        [sys.executable, *options, '-c', kTimer.format(snippet=snippet)],
+        capture_output=True, text=True, env=env, check=True)
+    elapsed, numpy = proc.stdout.split()
+    return float(elapsed), numpy == 'True', proc.stderr.splitlines()
+
+
+def slowest_imports(lines, count=10):
+    '''Parses `-X importtime` output into the `count` largest (self us, cumulative us, module).'''
+    imports = []
+    for line in lines:
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        imports.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--target-ms', type=float, default=30.0)
+    parser.add_argument('--snippet', default=kSnippet, help='Code to time.')
+    args = parser.parse_args(argv)
+
+    run_once(args.snippet)  # Warm up the file system and bytecode caches
+    times = []
+    for _ in range(args.runs):
+        elapsed, numpy, _ = run_once(args.snippet)
+        times.append(elapsed)
+    _, _, lines = run_once(args.snippet, importtime=True)
+
+    median = statistics.median(times)
+    print(f'{args.snippet}')
+    print(f'  median {median:.1f} ms, min {min(times):.1f} ms, max {max(times):.1f} ms '
+          f'over {args.runs} runs (target {args.target_ms:.0f} ms)')
+    print(f'  NumPy imported: {numpy}')
+    print('  slowest imports (self / cumulative ms):')
+    for self_us, cumulative_us, module in slowest_imports(lines):
+        print(f'    {self_us / 1000:7.2f} {cumulative_us / 1000:7.2f}  {module}')
+    return 0 if median <= args.target_ms else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,32 @@
-from .engine import GameEngine as LinesOfActionGame
+r'''Lines of Action game package.
+
+Nothing is imported eagerly: `LinesOfActionGame` and the submodules are loaded
+on first access, so short-lived processes only pay for what they use.
+'''
+import importlib
+
+__all__ = ['LinesOfActionGame']
+
+# Lazily resolved attributes: name -> (module, attribute)
+_LAZY_ATTRIBUTES = {
+    'LinesOfActionGame': ('linesofaction.engine', 'GameEngine'),
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module, attribute = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(module), attribute)
+    else:
+        try:
+            value = importlib.import_module(f'{__name__}.{name}')
+        except ModuleNotFoundError as e:
+            if e.name != f'{__name__}.{name}':
+                raise
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -1,18 +1,25 @@
-# StrEnum was introduced in Python 3.11
-# We create our own if version is lower than 3.11
+# NumPy is only needed by the mask helpers; it is imported by them on first
+# use so that the move generation and search modules load without it.
 import sys
-import numpy as np
 
-if sys.version_info < (3, 11):
-    from enum import Enum
-    class StrEnum(str, Enum):
-        @staticmethod
-        def _generate_next_value_(name, start, count, last_values):
-            return name.lower()
-        def __str__(self):
-            return str(self.value)
-else:
-    from enum import StrEnum
+
+def __getattr__(name):
+    # StrEnum was introduced in Python 3.11
+    # We create our own if version is lower than 3.11
+    if name == 'StrEnum':
+        global StrEnum
+        if sys.version_info < (3, 11):
+            from enum import Enum
+            class StrEnum(str, Enum):
+                @staticmethod
+                def _generate_next_value_(name, start, count, last_values):
+                    return name.lower()
+                def __str__(self):
+                    return str(self.value)
+        else:
+            from enum import StrEnum
+        return StrEnum
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 # === Pretty Printers ===
 def to_lines(
@@ -24,7 +31,7 @@ def to_lines(
     '''Converts the board to a list of lists with each element being a string / char
     
     Args:
-        board (np.ndarray): Board to convert to lines.
+        board (np.ndarray or list): Board (array or list of rows) to convert to lines.
         with_header (bool): Whether to include the header.
         with_index (bool): Whether to include the row index.
         highlights (list): List of positions to highlight.
@@ -43,8 +50,8 @@ def to_lines(
     active_default = 'O'
 
     lines = []
-    header = [chr(c) for c in range(ord('A'), ord('A') + board.shape[1])]
-    index = list(range(1, board.shape[0]+1))
+    header = [chr(c) for c in range(ord('A'), ord('A') + len(board[0]))]
+    index = list(range(1, len(board)+1))
 
     for idx, row in enumerate(board):
         line = []
@@ -144,7 +151,7 @@ def line_of_sight_coords(shape, pivot_position,
     
     result = set([pivot_position])
     row, col = pivot_position
-    while row < shape[0] and col < shape[1]:
+    while 0 <= row < shape[0] and 0 <= col < shape[1]:
         if (row, col) in obstacle_coords:
             if include_obstacles:
                 result.add((row, col))
@@ -153,7 +160,7 @@ def line_of_sight_coords(shape, pivot_position,
         row += delta[0]
         col += delta[1]
     row, col = pivot_position
-    while row >= 0 and col >= 0:
+    while 0 <= row < shape[0] and 0 <= col < shape[1]:
         if (row, col) in obstacle_coords:
             if include_obstacles:
                 result.add((row, col))
@@ -256,6 +263,7 @@ def line_mask(shape, pivot_position, orientation):
     Returns:
         np.ndarray: Mask for the given direction and pivot position.
     '''
+    import numpy as np
     mask = np.zeros(shape, dtype=bool)
     coords = line_coords(shape, pivot_position, orientation)
     mask[tuple(zip(*coords))] = True
@@ -277,6 +285,7 @@ def line_of_sight_mask(obstacle_mask, pivot_position, orientation, include_obsta
     Returns:
         np.ndarray: Mask for the given direction and pivot position.
     '''   
+    import numpy as np
     mask = np.zeros_like(obstacle_mask, dtype=bool)
     if obstacle_mask[pivot_position]:
         if include_obstacles:
@@ -306,6 +315,7 @@ def all_lines_of_sight_mask(obstacle_mask, pivot_position, include_obstacles=Fal
     Returns:
         dict: Dictionary of masks for all directions.
     '''
+    import numpy as np
     mask = np.zeros_like(obstacle_mask, dtype=bool)
     if obstacle_mask[pivot_position]:
         if include_obstacles:
@@ -1,8 +1,69 @@
+import bisect
+import itertools
+import numbers
 from collections.abc import Iterable
-import numpy as np
+from typing import NamedTuple
 
 from linesofaction.piece import Piece
 from linesofaction import _utils
+from linesofaction.storage import NumpyStorage, make_storage
+
+_PIECES = {piece.value: piece for piece in Piece}  # Faster than calling Piece(value)
+_versions = itertools.count(1)  # Shared by all boards: a version identifies one board state
+
+
+def _as_int(value):
+    '''Returns a single integer index (int, NumPy integer, ...) as an int, None for slices and arrays.'''
+    if type(value) is int:
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    return None
+
+
+class BoardSnapshot(NamedTuple):
+    r'''Immutable, hashable copy of the pieces of a board.
+
+    The cells are stored as bytes, one per cell in row-major order, so a
+    snapshot of an 8x8 board takes 64 bytes of data. Snapshots of a
+    list-backed board that did not change in between share the same `cells`
+    bytes object (the snapshots themselves are distinct, equal tuples).
+
+    Attributes:
+        rows (int): Number of rows in the board.
+        cols (int): Number of columns in the board.
+        cells (bytes): Piece value of every cell.
+    '''
+    rows: int
+    cols: int
+    cells: bytes
+
+    @property
+    def shape(self):
+        return (self.rows, self.cols)
+
+    def peek(self, *position):
+        '''Returns the piece at the (row, col) position (negative indices allowed).'''
+        if len(position) == 1:
+            position = position[0]
+        row, col = position
+        if not (-self.rows <= row < self.rows and -self.cols <= col < self.cols):
+            raise IndexError(f'Position {(row, col)} is out of the {self.rows}x{self.cols} board')
+        return _PIECES[self.cells[(row % self.rows) * self.cols + col % self.cols]]
+
+    def count(self, piece):
+        '''Counts the number of pieces of the given type.'''
+        return self.cells.count(piece)
+
+    def get_positions(self, piece):
+        '''Returns the sorted (row, col) positions of the given piece.'''
+        cols = self.cols
+        return [divmod(idx, cols) for idx, cell in enumerate(self.cells) if cell == piece]
+
+    def tolist(self):
+        '''Returns the piece values as a list of rows.'''
+        cols, cells = self.cols, self.cells
+        return [list(cells[start:start + cols]) for start in range(0, len(cells), cols)]
 # from linesofaction._utils import make_line_mask
 
 class Board:
@@ -11,24 +72,40 @@ class Board:
     Args:
         rows (int): Number of rows in the board.
         cols (int): Number of columns in the board.
+        backend (str): Storage of the cells: 'list', 'numpy', or None to
+                       choose from the board size (see `linesofaction.storage`).
     
     Attributes:
         rows (int): Number of rows in the board.
         cols (int): Number of columns in the board.
         players (tuple): Tuple containing the two players.
                          Player 1 is always the first element.
-        board (np.ndarray): 2D numpy array representing
+        board (np.ndarray): 2D numpy array representing the board.
+                            Accessing it moves a list-backed board to
+                            the NumPy backend, so prefer `peek`, `place`,
+                            `cells` and `tolist` in hot code.
+        version (int): Changes whenever the pieces may have changed, and is
+                       never reused (not even by another board), so it can key
+                       caches of anything computed from the pieces.
     
     Notes:
         * Initially Player 1 occupies the first/last row
           and Player 2 occupies the first/last column.
+        * Single cell access (peek, place, pop with a (row, col) position)
+          never needs NumPy. Slices and index arrays use NumPy semantics.
+        * The sorted positions of each player's pieces are kept up to date by
+          `place` and `pop`, so `get_positions` and `count` of a player read
+          them instead of scanning the cells. Other writes (`set_cells`, the
+          `board` array) rebuild them on the next read.
     '''
-    def __init__(self, rows: int = 8, cols: int = 8):
+    def __init__(self, rows: int = 8, cols: int = 8, backend: str = None):
         if rows < 4 or cols < 4:
             raise ValueError('Board must have at least 4 rows and 4 columns')
         self.rows = rows
         self.cols = cols
-        self.board = np.empty(0, dtype=int)  # Initialize in build and place
+        self._backend = backend
+        self._storage = None  # Initialize in build and place
+        self._pieces = None  # Player -> sorted positions of its pieces, None to rebuild
         
         # First player is always first in the tuple
         self.players = (Piece.BLACK, Piece.RED)
@@ -39,23 +116,96 @@ class Board:
         self._init_pieces()
 
     def _init_board(self):
-        self.board = np.empty((self.rows, self.cols), dtype=int)
-        self.board.fill(Piece.EMPTY)
+        self._storage = make_storage(self.rows, self.cols, Piece.EMPTY, self._backend)
+        self._pieces = None
+        self.version = next(_versions)
         return self
     
     def _init_pieces(self):
+        storage = self._storage
         # Player 1
-        self.board[[0, -1], 1:-1] = self.players[0]  # First and last rows
+        for col in range(1, self.cols - 1):  # First and last rows
+            storage.set(0, col, self.players[0])
+            storage.set(-1, col, self.players[0])
         # Player 2
-        self.board[1:-1, [0, -1]] = self.players[1]  # First and last columns
+        for row in range(1, self.rows - 1):  # First and last columns
+            storage.set(row, 0, self.players[1])
+            storage.set(row, -1, self.players[1])
+        self._pieces = None
+        self.version = next(_versions)
+        return self
+
+    # ===== Storage =====
+    @property
+    def backend(self):
+        '''Name of the storage backend: 'list' or 'numpy'.'''
+        return self._storage.name
+
+    @property
+    def board(self):
+        if not isinstance(self._storage, NumpyStorage):
+            # The array is handed out for writing, so it has to be the storage
+            self._storage = NumpyStorage(array=self._storage.to_array())
+        # The array may be written by the caller. Writes through an array kept
+        # from an earlier access are not seen by `version` and the piece lists.
+        self._pieces = None
+        self.version = next(_versions)
+        return self._storage.array
+
+    @board.setter
+    def board(self, array):
+        self._storage = NumpyStorage(array=array)
+        self._pieces = None
+        self.version = next(_versions)
+
+    def cells(self):
+        '''Returns the piece values as a flat list in row-major order.'''
+        return self._storage.flat()
+
+    def set_cells(self, cells):
+        '''Replaces every piece from a flat row-major sequence of piece values.'''
+        self._storage.load(cells)
+        self._pieces = None
+        self.version = next(_versions)
         return self
+
+    def tolist(self):
+        '''Returns the piece values as a list of rows.'''
+        return self._storage.tolist()
+
+    def to_array(self):
+        '''Returns a new 2D NumPy array of the piece values.'''
+        return self._storage.to_array()
+
+    def snapshot(self):
+        '''Returns an immutable, hashable snapshot of the pieces.
+
+        On the list backend the snapshot is cached until the board is modified,
+        so snapshotting an unchanged board costs nothing.
+
+        Returns:
+            BoardSnapshot
+        '''
+        return BoardSnapshot(self.rows, self.cols, self._storage.freeze())
+
+    @classmethod
+    def from_snapshot(cls, snapshot, backend: str = None):
+        '''Creates a (mutable) board from a snapshot.
+
+        Args:
+            snapshot (BoardSnapshot): Snapshot to restore.
+            backend (str): Storage backend of the new board (see `__init__`).
+        '''
+        board = cls(snapshot.rows, snapshot.cols, backend=backend)
+        board.set_cells(snapshot.cells)
+        return board
     
     def __repr__(self, active=None):
         # For debugging purposes, implementing printing of the board
         char_map = {piece.value: piece.char() for piece in Piece}
         char_map['active'] = {piece.value: piece.char(offset=0x1f150) for piece in Piece}  # Unicode character for 'A' with a circle around it
         header, index, lines = _utils.to_lines(  # Converts the board to lines of characters that represent the board
-            self.board, char_map=char_map,
+            self.tolist(), char_map=char_map,
             active=active,
         )
         header = '  | ' + ' '.join(header)
@@ -65,8 +215,12 @@ class Board:
         return '\n'.join(lines)
     
     # ===== Board properties =====
-    def _piece_mask(self, piece):
-        return self.board == piece
+    def _piece_lists(self):
+        pieces = self._pieces
+        if pieces is None:
+            storage = self._storage
+            pieces = self._pieces = {player: storage.positions(player) for player in self.players}
+        return pieces
 
     def count(self, piece):
         '''Counts the number of pieces of the given type on the board.
@@ -77,7 +231,10 @@ class Board:
         Returns:
             int: Number of pieces of the given type on the board.
         '''
-        return np.sum(self._piece_mask(piece))
+        positions = self._piece_lists().get(piece)
+        if positions is None:  # Empty cells are not tracked
+            return self._storage.count(piece)
+        return len(positions)
     
 
     def get_positions(self, piece):
@@ -90,11 +247,12 @@ class Board:
             piece (Piece): Piece to get the positions of.
         
         Returns:
-            list: List of positions where the piece is located.
+            list: List of positions where the piece is located, sorted.
         '''
-        piece_locations = np.argwhere(self._piece_mask(piece))
-        pos = sorted(map(tuple, piece_locations.tolist()))
-        return pos
+        positions = self._piece_lists().get(piece)
+        if positions is None:  # Empty cells are not tracked
+            return self._storage.positions(piece)
+        return list(positions)
     
     # ===== Interacting with the board =====
     
@@ -111,7 +269,7 @@ class Board:
         Returns:
             Piece: The piece at the given position.
         '''
-        if isinstance(position, int):
+        if isinstance(position, numbers.Integral):
             position = (position, ...)
         return self.peek(*position)
 
@@ -127,8 +285,12 @@ class Board:
         if len(position) == 1:
             position = position[0]
         row, col = position
+        r, c = _as_int(row), _as_int(col)
+        if r is not None and c is not None:
+            return _PIECES[self._storage.get(r, c)]
         piece = self.board[row, col]
         if isinstance(piece, Iterable):
+            import numpy as np
             return np.array(piece, dtype=Piece)
         return Piece(piece)
 
@@ -142,9 +304,20 @@ class Board:
             Piece: The piece at the given position.
         '''
         row, col = position
-        piece = self.board[row, col]
-        self.board[row, col] = Piece.EMPTY
+        r, c = _as_int(row), _as_int(col)
+        if r is not None and c is not None:
+            storage = self._storage
+            piece = storage.get(r, c)
+            storage.set(r, c, Piece.EMPTY)
+            self.version = next(_versions)
+            if piece != Piece.EMPTY and self._pieces is not None:
+                self._untrack(piece, (r % self.rows, c % self.cols))
+            return _PIECES[piece]
+        board = self.board
+        piece = board[row, col]
+        board[row, col] = Piece.EMPTY
         if isinstance(piece, Iterable):
+            import numpy as np
             return np.array(piece, dtype=Piece)
         return Piece(piece)
 
@@ -159,15 +332,41 @@ class Board:
             ValueError: If the position is already occupied (not empty).
             ValueError: If the piece is empty
         '''
+        row, col = position
+        r, c, value = _as_int(row), _as_int(col), _as_int(piece)
+        if r is not None and c is not None and value is not None:
+            if value == Piece.EMPTY:
+                raise ValueError('Cannot place an empty piece. Use pop instead.')
+            if self._storage.get(r, c) != Piece.EMPTY:
+                raise ValueError('Position is already occupied. Use pop first.')
+            self._storage.set(r, c, value)
+            self.version = next(_versions)
+            if self._pieces is not None:
+                self._track(value, (r % self.rows, c % self.cols))
+            return self
+
+        import numpy as np
         if np.any(piece == Piece.EMPTY):
             raise ValueError('Cannot place an empty piece. Use pop instead.')
-
-        row, col = position
         if np.any(self.board[row, col] != Piece.EMPTY):
             raise ValueError('Position is already occupied. Use pop first.')
         self.board[row, col] = piece
         return self
 
+    def _track(self, piece, position):
+        positions = self._pieces.get(piece)
+        if positions is None:
+            self._pieces = None  # Not a player: rebuilt from the cells on the next read
+        else:
+            bisect.insort(positions, position)
+
+    def _untrack(self, piece, position):
+        positions = self._pieces.get(piece)
+        if positions is None:
+            self._pieces = None
+        else:
+            del positions[bisect.bisect_left(positions, position)]
+
     def replace(self, position, piece):
         '''Replaces a piece at the given position.
         
@@ -220,6 +419,6 @@ class Board:
     
     @property
     def shape(self):
-        return self.board.shape
+        return (self.rows, self.cols)
 
 
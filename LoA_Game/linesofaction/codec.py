@@ -0,0 +1,223 @@
+r'''Compact position codec and a columnar position store.
+
+A position is packed into one bitmask per player (one bit per square, so 8
+bytes each for an 8x8 board) plus one byte for the side to move, i.e. 17 bytes
+instead of the 512 bytes of the `Board.board` int64 array.
+
+`PositionStore` keeps many packed positions in a NumPy structured array, either
+in memory or in a file opened through `np.memmap`, and decodes slices of it to
+(N, rows, cols) int8 tensors in a vectorized way.
+'''
+import os
+
+import numpy as np
+
+from linesofaction.board import Board
+from linesofaction.piece import Piece
+
+
+def packed_size(rows: int, cols: int):
+    '''Number of bytes of a single player bitmask.'''
+    return (rows * cols + 7) // 8
+
+
+def position_dtype(rows: int, cols: int):
+    '''Structured dtype of a packed position.
+
+    Fields:
+        black (uint8[nbytes]): Bitmask of the black pieces (row-major).
+        red (uint8[nbytes]): Bitmask of the red pieces (row-major).
+        side (uint8): 0 if the first player (black) is to move, 1 otherwise.
+    '''
+    nbytes = packed_size(rows, cols)
+    return np.dtype([
+        ('black', np.uint8, (nbytes,)),
+        ('red', np.uint8, (nbytes,)),
+        ('side', np.uint8),
+    ])
+
+
+def encode_batch(boards, sides):
+    '''Packs a batch of positions.
+
+    Args:
+        boards (np.ndarray): (N, rows, cols) array of Piece values.
+        sides (np.ndarray): (N,) array, 0 if black is to move, 1 if red is.
+
+    Returns:
+        np.ndarray: (N,) structured array of `position_dtype(rows, cols)`.
+    '''
+    boards = np.asarray(boards)
+    num, rows, cols = boards.shape
+    flat = boards.reshape(num, rows * cols)
+    result = np.empty(num, dtype=position_dtype(rows, cols))
+    result['black'] = np.packbits(flat == Piece.BLACK, axis=-1)
+    result['red'] = np.packbits(flat == Piece.RED, axis=-1)
+    result['side'] = np.asarray(sides, dtype=np.uint8)
+    return result
+
+
+def decode_batch(packed, rows: int, cols: int):
+    '''Unpacks a batch of positions.
+
+    Args:
+        packed (np.ndarray): (N,) structured array of `position_dtype(rows, cols)`.
+
+    Returns:
+        tuple: (boards, sides) where boards is a (N, rows, cols) int8 array of
+               Piece values and sides is a (N,) uint8 array.
+    '''
+    cells = rows * cols
+    black = np.unpackbits(packed['black'], axis=-1, count=cells).astype(np.int8)
+    red = np.unpackbits(packed['red'], axis=-1, count=cells).astype(np.int8)
+    boards = black * np.int8(Piece.BLACK) + red * np.int8(Piece.RED)
+    return boards.reshape(-1, rows, cols), np.array(packed['side'], dtype=np.uint8)
+
+
+def encode(board, player=None):
+    '''Packs a board into bytes.
+
+    Args:
+        board (Board): Board to pack.
+        player (Piece): Player to move. Defaults to the first player.
+
+    Returns:
+        bytes: 2 * packed_size(rows, cols) + 1 bytes.
+    '''
+    side = 0 if player is None or player == board.players[0] else 1
+    return encode_batch(board.to_array()[None], [side]).tobytes()
+
+
+def decode(data, rows: int = 8, cols: int = 8):
+    '''Unpacks bytes created by `encode`.
+
+    Returns:
+        tuple: (board, player) with a new Board and the player to move.
+    '''
+    packed = np.frombuffer(data, dtype=position_dtype(rows, cols), count=1)
+    boards, sides = decode_batch(packed, rows, cols)
+    board = Board(rows=rows, cols=cols)
+    board.set_cells(boards[0].ravel().tolist())
+    return board, board.players[int(sides[0])]
+
+
+class PositionStore:
+    r'''Columnar store of packed positions.
+
+    Positions are kept in a structured array (see `position_dtype`). If `path`
+    is given, the positions are appended to that file and read back through a
+    read-only `np.memmap`, so the store can hold far more positions than fit
+    in memory.
+
+    Args:
+        rows (int): Number of rows of the stored positions.
+        cols (int): Number of columns of the stored positions.
+        path (str): File to back the store. If it exists, its positions are
+                    kept and new ones are appended. None for an in-memory store.
+        capacity (int): Initial capacity of an in-memory store.
+    '''
+    kMagic = b'LOAPOS01'
+    kHeaderSize = 16  # magic, rows (uint32), cols (uint32)
+
+    def __init__(self, rows: int = 8, cols: int = 8, path=None, capacity: int = 1024):
+        self.rows = rows
+        self.cols = cols
+        self.dtype = position_dtype(rows, cols)
+        self.path = path
+        self._view = None
+        if path is None:
+            self._data = np.empty(capacity, dtype=self.dtype)
+            self._size = 0
+            return
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as f:
+                header = f.read(self.kHeaderSize)
+            shape = tuple(np.frombuffer(header[8:], dtype='<u4').tolist())
+            if header[:8] != self.kMagic or shape != (rows, cols):
+                raise ValueError(f'{path} is not a position store of shape {(rows, cols)}')
+        else:
+            with open(path, 'wb') as f:
+                f.write(self.kMagic + np.array([rows, cols], dtype='<u4').tobytes())
+        self._file = open(path, 'ab')
+        self._size = (os.path.getsize(path) - self.kHeaderSize) // self.dtype.itemsize
+
+    def __len__(self):
+        return self._size
+
+    # ===== Writing =====
+    def extend(self, boards, sides):
+        '''Appends a batch of positions.
+
+        Args:
+            boards (np.ndarray): (N, rows, cols) array of Piece values.
+            sides (np.ndarray): (N,) array, 0 if black is to move, 1 if red is.
+        '''
+        self.extend_packed(encode_batch(boards, sides))
+        return self
+
+    def extend_packed(self, packed):
+        '''Appends a batch of already packed positions.'''
+        packed = np.asarray(packed, dtype=self.dtype)
+        if self.path is None:
+            needed = self._size + len(packed)
+            if needed > len(self._data):
+                grown = np.empty(max(needed, 2 * len(self._data)), dtype=self.dtype)
+                grown[:self._size] = self._data[:self._size]
+                self._data = grown
+            self._data[self._size:needed] = packed
+        else:
+            self._file.write(packed.tobytes())
+            self._view = None
+        self._size += len(packed)
+        return self
+
+    def append(self, board, player=None):
+        '''Appends a single Board.'''
+        side = 0 if player is None or player == board.players[0] else 1
+        return self.extend(board.to_array()[None], [side])
+
+    def flush(self):
+        if self.path is not None:
+            self._file.flush()
+        return self
+
+    def close(self):
+        if self.path is not None and not self._file.closed:
+            self._file.close()
+        self._view = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ===== Reading =====
+    @property
+    def packed(self):
+        '''Structured array of all stored positions (memory-mapped for files).'''
+        if self.path is None:
+            return self._data[:self._size]
+        if self._view is None or len(self._view) != self._size:
+            self.flush()
+            if self._size == 0:
+                return np.empty(0, dtype=self.dtype)
+            self._view = np.memmap(self.path, dtype=self.dtype, mode='r',
+                                   offset=self.kHeaderSize, shape=(self._size,))
+        return self._view
+
+    def decode(self, index=slice(None)):
+        '''Decodes the positions at the given index (slice, int or index array).
+
+        Returns:
+            tuple: (boards, sides), a (N, rows, cols) int8 array and a (N,) uint8 array.
+        '''
+        packed = np.atleast_1d(self.packed[index])
+        return decode_batch(packed, self.rows, self.cols)
+
+    def __getitem__(self, index):
+        '''Returns (Board, player) of a single stored position.'''
+        boards, sides = self.decode(index)
+        board = Board(rows=self.rows, cols=self.cols)
+        board.set_cells(boards[0].ravel().tolist())
+        return board, board.players[int(sides[0])]
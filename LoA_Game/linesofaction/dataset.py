@@ -0,0 +1,355 @@
+r'''Training data export: positions of recorded games as sharded NumPy arrays.
+
+Games are read from game files (the format of `linesofaction.replay`) and
+every position before a move becomes a training sample with the fields:
+
+* boards (int8, (N, rows, cols)): Piece values of the cells.
+* side (uint8, (N,)): 0 if black is to move, 1 if red is.
+* legal (bool, (N, 8, rows, cols)): Legal moves, as [direction, origin]
+  planes. A piece has at most one move per direction (the distance is the
+  number of pieces on the line), so this is an exact encoding of the moves.
+  Directions are indexed like `linesofaction.tables.DIRECTIONS`.
+* move (int32, (N,)): The move played, as the flat index of its
+  [direction, origin] plane cell.
+* outcome (int8, (N,)): Result for the side to move: 1 win, -1 loss,
+  0 tie or unfinished game.
+
+Samples are written in shards of a fixed number of positions, as
+`shard-00000.npz` files or as `shard-00000/` directories of `.npy` files, and
+a `meta.json` describes the export. Games with an illegal move, or of another
+board shape, are skipped.
+
+Symmetry augmentation transforms the samples with the symmetries of the board
+(flips, plus transposition and rotations on square boards), which preserve the
+rules. 'all' emits every symmetric copy of each position, 'random' one copy
+picked with a generator seeded by the export seed, the game's file and line,
+so the output does not depend on the number of processes.
+
+Games are processed in chunks of lines by a pool of processes. Only a bounded
+number of chunks is in flight, and results are written in input order, so
+memory stays bounded and the shards are deterministic.
+
+Example:
+    >>> export(['games.txt'], 'dataset', shard_size=65536, augment='random')
+    {'games': 1000, 'skipped': 2, 'positions': 71234, 'shards': 2}
+'''
+import collections
+import functools
+import json
+import multiprocessing
+import os
+import zlib
+
+import numpy as np
+
+from linesofaction import replay
+from linesofaction.movegen import Position
+from linesofaction.piece import Piece
+from linesofaction.tables import DIRECTIONS, get_tables
+
+kFormatVersion = 1
+kFields = ('boards', 'side', 'legal', 'move', 'outcome')
+kAugmentations = (None, 'all', 'random')
+
+_DIRECTION_INDEX = {step: idx for idx, step in enumerate(DIRECTIONS)}
+_WINNERS = {'black': Piece.BLACK, 'red': Piece.RED}  # ReplayResult.result -> winner
+
+
+# ===== Symmetries =====
+def symmetries(rows: int, cols: int):
+    '''Returns the symmetries of the board shape as (transpose, flip_rows, flip_cols).
+
+    The identity comes first. Transpositions only exist on square boards.
+    '''
+    transposes = (False, True) if rows == cols else (False,)
+    return [(transpose, flip_rows, flip_cols)
+            for transpose in transposes for flip_rows in (False, True) for flip_cols in (False, True)]
+
+
+def symmetry_permutations(rows: int, cols: int, symmetry):
+    '''Returns the index permutations of a symmetry.
+
+    Returns:
+        tuple: (squares, directions) arrays such that the transformed data is
+               `data[..., squares]` for cells and `data[directions]` for
+               direction planes.
+    '''
+    transpose, flip_rows, flip_cols = symmetry
+
+    def apply(row, col, extent=True):
+        if transpose:
+            row, col = col, row
+        if flip_rows:
+            row = rows - 1 - row if extent else -row
+        if flip_cols:
+            col = cols - 1 - col if extent else -col
+        return row, col
+
+    squares = np.empty(rows * cols, dtype=np.intp)
+    for square in range(rows * cols):
+        row, col = apply(*divmod(square, cols))
+        squares[row * cols + col] = square
+    directions = np.empty(len(DIRECTIONS), dtype=np.intp)
+    for idx, step in enumerate(DIRECTIONS):
+        directions[_DIRECTION_INDEX[apply(*step, extent=False)]] = idx
+    return squares, directions
+
+
+class _Symmetry:
+    '''Transforms batches of samples with one symmetry.'''
+    __slots__ = ('squares', 'directions', 'moves')
+
+    def __init__(self, rows, cols, symmetry):
+        self.squares, self.directions = symmetry_permutations(rows, cols, symmetry)
+        size = rows * cols
+        source = (self.directions[:, None] * size + self.squares[None, :]).ravel()
+        self.moves = np.empty(len(source), dtype=np.int32)
+        self.moves[source] = np.arange(len(source), dtype=np.int32)
+
+    def __call__(self, samples):
+        '''Transforms {field: array} with flat boards (N, size) and legal (N, 8, size).'''
+        return {
+            'boards': samples['boards'][:, self.squares],
+            'side': samples['side'],
+            'legal': samples['legal'][:, self.directions][:, :, self.squares],
+            'move': self.moves[samples['move']],
+            'outcome': samples['outcome'],
+        }
+
+
+def _concat(parts):
+    return {field: np.concatenate([part[field] for part in parts]) for field in kFields}
+
+
+# ===== Extraction =====
+def game_samples(moves, rows: int = 8, cols: int = 8):
+    '''Replays a game and extracts the samples of its positions.
+
+    Args:
+        moves (list): Moves as pairs of squares in A1 notation, e.g. ('B1', 'B3').
+        rows (int): Number of rows of the board.
+        cols (int): Number of columns of the board.
+
+    Returns:
+        dict: {field: array} with flat boards (N, rows * cols) and legal
+              (N, 8, rows * cols), or None if the game has an illegal move.
+    '''
+    tables = get_tables(rows, cols)
+    size = tables.size
+    move_index = _move_indices(tables)
+    cells, sides, legal, played = [], [], [], []
+    result = replay.ReplayResult()
+    for position, move in replay.iter_replay(moves, rows, cols, result):
+        cells.append(bytes(position.cells))
+        sides.append(0 if position.player == Piece.BLACK else 1)
+        legal.append([move_index[legal_move] for legal_move in position.moves()])
+        played.append(move_index[move])
+    if result.error is not None:
+        return None
+
+    num = len(cells)
+    samples = {
+        'boards': np.frombuffer(b''.join(cells), dtype=np.int8).reshape(num, size),
+        'side': np.array(sides, dtype=np.uint8),
+        'legal': np.zeros((num, len(DIRECTIONS) * size), dtype=bool),
+        'move': np.array(played, dtype=np.int32),
+        'outcome': np.zeros(num, dtype=np.int8),
+    }
+    for idx, indices in enumerate(legal):
+        samples['legal'][idx, indices] = True
+    samples['legal'] = samples['legal'].reshape(num, len(DIRECTIONS), size)
+    winner = _WINNERS.get(result.result)
+    if winner is not None:
+        mover_wins = samples['side'] == (0 if winner == Piece.BLACK else 1)
+        samples['outcome'] = np.where(mover_wins, 1, -1).astype(np.int8)
+    return samples
+
+
+@functools.lru_cache(maxsize=None)
+def _move_indices(tables):
+    '''Maps every (origin, target) move of the shape to its [direction, origin] index.'''
+    return {(origin, target): direction * tables.size + origin
+            for origin, rays in enumerate(tables.rays)
+            for direction, ray in enumerate(rays)
+            for target in ray}
+
+
+def _augment(samples, transforms, augment, rng):
+    if augment is None:
+        return samples
+    if augment == 'all':
+        # The copies of a position are consecutive
+        copies = [transform(samples) for transform in transforms]
+        return {field: np.stack([copy[field] for copy in copies], axis=1).reshape(
+                    (-1,) + copies[0][field].shape[1:]) for field in kFields}
+    choice = rng.integers(len(transforms), size=len(samples['side']))
+    result = {field: array.copy() for field, array in samples.items()}
+    for idx, transform in enumerate(transforms):
+        mask = choice == idx
+        if mask.any():
+            part = transform({field: array[mask] for field, array in samples.items()})
+            for field in kFields:
+                result[field][mask] = part[field]
+    return result
+
+
+def _export_chunk(task):
+    '''Extracts the samples of a chunk of lines. Runs in the worker processes.'''
+    (source, first_line, lines), rows, cols, augment, seed = task
+    transforms = [_Symmetry(rows, cols, symmetry) for symmetry in symmetries(rows, cols)]
+    parts = []
+    games = skipped = 0
+    source_id = zlib.crc32(source.encode())
+    for number, text in enumerate(lines, first_line):
+        text = text.strip()
+        if not text or text.startswith('#'):
+            continue
+        try:
+            shape, moves = replay.parse_game(text)
+        except ValueError:
+            shape, moves = None, None
+        samples = game_samples(moves, rows, cols) if shape == (rows, cols) else None
+        if samples is None:
+            skipped += 1
+            continue
+        games += 1
+        rng = np.random.default_rng([seed, source_id, number])
+        parts.append(_augment(samples, transforms, augment, rng))
+    if not parts:
+        return None, games, skipped
+    samples = _concat(parts)
+    samples['boards'] = samples['boards'].reshape(-1, rows, cols)
+    samples['legal'] = samples['legal'].reshape(-1, len(DIRECTIONS), rows, cols)
+    return samples, games, skipped
+
+
+# ===== Writing =====
+class ShardWriter:
+    r'''Writes samples to fixed-size shards as they arrive.
+
+    Args:
+        path (str): Output directory. Created if missing.
+        shard_size (int): Number of positions per shard (the last one may be smaller).
+        fmt (str): 'npz' (one compressed file per shard) or 'npy' (one
+                   directory of .npy files per shard).
+    '''
+    def __init__(self, path, shard_size: int = 65536, fmt: str = 'npz'):
+        if fmt not in ('npz', 'npy'):
+            raise ValueError(f'Unknown shard format: {fmt!r}. Use "npz" or "npy".')
+        if shard_size <= 0:
+            raise ValueError('The shard size must be positive.')
+        self.path = path
+        self.shard_size = shard_size
+        self.fmt = fmt
+        self.shards = []  # (name, number of positions)
+        self._parts = []
+        self._buffered = 0
+        os.makedirs(path, exist_ok=True)
+
+    @property
+    def positions(self):
+        return sum(count for _, count in self.shards) + self._buffered
+
+    def write(self, samples):
+        '''Buffers the samples and writes every full shard.'''
+        self._parts.append(samples)
+        self._buffered += len(samples['side'])
+        if self._buffered >= self.shard_size:
+            buffered = _concat(self._parts)
+            start = 0
+            while self._buffered - start >= self.shard_size:
+                self._write_shard({field: array[start:start + self.shard_size]
+                                   for field, array in buffered.items()})
+                start += self.shard_size
+            self._parts = [{field: array[start:] for field, array in buffered.items()}]
+            self._buffered -= start
+
+    def close(self):
+        '''Writes the last, partial shard.'''
+        if self._buffered:
+            self._write_shard(_concat(self._parts))
+        self._parts = []
+        self._buffered = 0
+
+    def _write_shard(self, samples):
+        name = f'shard-{len(self.shards):05d}'
+        if self.fmt == 'npz':
+            name += '.npz'
+            np.savez_compressed(os.path.join(self.path, name), **samples)
+        else:
+            os.makedirs(os.path.join(self.path, name), exist_ok=True)
+            for field, array in samples.items():
+                np.save(os.path.join(self.path, name, f'{field}.npy'), array)
+        self.shards.append((name, len(samples['side'])))
+
+
+def load_shard(path):
+    '''Loads a shard written by `ShardWriter` as {field: array}.'''
+    if os.path.isdir(path):
+        return {field: np.load(os.path.join(path, f'{field}.npy')) for field in kFields}
+    with np.load(path) as data:
+        return {field: data[field] for field in kFields}
+
+
+def _ordered_map(pool, function, tasks, window):
+    '''Like `pool.imap`, but with at most `window` tasks in flight.'''
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(pool.apply_async(function, (task,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def export(paths, output, rows: int = 8, cols: int = 8, shard_size: int = 65536,
+           augment: str = None, seed: int = 0, fmt: str = 'npz',
+           processes: int = None, chunk_lines: int = 256):
+    '''Exports the positions of the games of the files as sharded training data.
+
+    Args:
+        paths (list): Game files, '-' for stdin.
+        output (str): Output directory.
+        rows (int): Number of rows of the exported games; others are skipped.
+        cols (int): Number of columns of the exported games.
+        shard_size (int): Number of positions per shard.
+        augment (str): None, 'all' or 'random' (see the module docstring).
+        seed (int): Seed of the 'random' augmentation.
+        fmt (str): 'npz' or 'npy'.
+        processes (int): Number of processes (default: CPU count). 1 exports
+                         in the calling process.
+        chunk_lines (int): Number of lines per work unit.
+
+    Returns:
+        dict: Number of games, skipped games, positions and shards.
+    '''
+    if augment not in kAugmentations:
+        raise ValueError(f'Unknown augmentation: {augment!r}. Use one of {kAugmentations}.')
+    Position.initial(rows, cols)  # Validates the shape
+    writer = ShardWriter(output, shard_size, fmt)
+    tasks = ((chunk, rows, cols, augment, seed) for chunk in replay.read_chunks(paths, chunk_lines))
+    games = skipped = 0
+
+    def consume(results):
+        nonlocal games, skipped
+        for samples, chunk_games, chunk_skipped in results:
+            games += chunk_games
+            skipped += chunk_skipped
+            if samples is not None:
+                writer.write(samples)
+
+    if processes == 1:
+        consume(map(_export_chunk, tasks))
+    else:
+        processes = processes or os.cpu_count() or 1
+        with multiprocessing.Pool(processes) as pool:
+            consume(_ordered_map(pool, _export_chunk, tasks, 2 * processes))
+    writer.close()
+
+    summary = {'games': games, 'skipped': skipped, 'positions': writer.positions, 'shards': len(writer.shards)}
+    meta = dict(summary, version=kFormatVersion, rows=rows, cols=cols, augment=augment, seed=seed,
+                format=fmt, fields=list(kFields), directions=[list(step) for step in DIRECTIONS],
+                files=[{'name': name, 'positions': count} for name, count in writer.shards])
+    with open(os.path.join(output, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return summary
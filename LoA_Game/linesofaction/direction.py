@@ -1,5 +1,9 @@
 import enum
-import numpy as np
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
 
 class Direction(enum.Enum):
     r'''Direction is just a unitvector in geographic coordinates.'''
@@ -8,11 +12,11 @@ class Direction(enum.Enum):
     E = EAST = (0, 1)
     W = WEST = (0, -1)
 
-    # Add the directions, and make sure they are tuples
-    NE = NORTH_EAST = tuple(np.add(N, E).tolist())
-    NW = NORTH_WEST = tuple(np.add(N, W).tolist())
-    SE = SOUTH_EAST = tuple(np.add(S, E).tolist())
-    SW = SOUTH_WEST = tuple(np.add(S, W).tolist())
+    # Add the directions (plain tuples, nothing is computed at import time)
+    NE = NORTH_EAST = (-1, 1)
+    NW = NORTH_WEST = (-1, -1)
+    SE = SOUTH_EAST = (1, 1)
+    SW = SOUTH_WEST = (1, -1)
 
     # === The rest are just utilities ===
 
@@ -73,7 +77,7 @@ class Direction(enum.Enum):
             value = cls.str2value(value)
 
         # Convert non-unit values to unit values
-        value = tuple(np.sign(value))
+        value = tuple(_sign(v) for v in value)
 
         # Check if the value already exists
         for member in cls:
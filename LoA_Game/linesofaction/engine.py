@@ -1,9 +1,13 @@
-import numpy as np
+import functools
+import threading
+import time
+from collections import OrderedDict
 
 from linesofaction.board import Board
 from linesofaction.piece import Piece
 from linesofaction import _utils
 from linesofaction.rules import GameRules, GameEndState
+from linesofaction.tables import get_tables
 
 class GameEngine:
     r'''Lines of Action game engine class.
@@ -13,16 +17,61 @@ class GameEngine:
     * Tracking the current player and selected piece
     * Validating and executing moves
     * Checking and updating the game outcome
+    * Applying the no-move rule when the next player cannot move
+    * Keeping the history of the positions, and adjudicating draws by
+      repetition or after a maximum number of plies
+    * Suggesting computer moves within a deadline (`suggest_move`)
+
+    Args:
+        board (Board): Board to play on (default: a new 8x8 board).
+        no_move (str): What happens when the player to move has no legal move:
+                       `kPass` (default) passes the turn back, `kLose` loses the game.
+                       If neither player can move, the game is a tie.
+        repetition_draw (int): The game is a tie when a position occurs this many
+                               times (e.g. 3). None (default) never adjudicates.
+                               Suggested moves then score repetitions as draws.
+        max_plies (int): The game is a tie after this many plies. None (default) for no limit.
+
+    The valid moves of a piece are cached per board version (see `Board.version`),
+    so asking again on an unchanged board (e.g. `move` validating the move that
+    was just listed) is a dictionary lookup. The cache keeps the
+    `kMoveCacheSize` most recently used entries.
+
+    `history` holds the Zobrist key of every position of the game (see
+    `linesofaction.zobrist`), from the position before the first move, and
+    the number of occurrences of each key is counted alongside, so
+    `repetitions` is a dictionary lookup.
     '''
+    kMoveCacheSize = 1024
+    kPass = 'pass'
+    kLose = 'lose'
 
-    def __init__(self, board: Board=None):
+    def __init__(self, board: Board=None, no_move: str=kPass,
+                 repetition_draw: int=None, max_plies: int=None):
+        if no_move not in (self.kPass, self.kLose):
+            raise ValueError(f'Unknown no-move rule: {no_move!r}. Use {self.kPass!r} or {self.kLose!r}.')
+        if repetition_draw is not None and repetition_draw < 2:
+            raise ValueError('repetition_draw must be at least 2.')
+        if max_plies is not None and max_plies < 1:
+            raise ValueError('max_plies must be positive.')
         if board is None:
             board = Board(rows=8, cols=8)
         self.board = board
+        self.no_move = no_move
+        self.passed = None  # Player who had to pass after the last move
+        self.repetition_draw = repetition_draw
+        self.max_plies = max_plies
+        self.adjudicated = None  # 'repetition' or 'max plies' when the game was drawn by adjudication
+        self.history = []  # Key of every position, from the one before the first move
+        self._occurrences = {}  # Key -> number of occurrences in the history
         self.rules = GameRules()
         self.current_player = self.board.players[0]
         self._selected_position = None
         self.winner = None
+        self.last_search = None  # SearchResult of the last suggest_move
+        self._searcher = None
+        self._search_lock = threading.Lock()
+        self._moves = OrderedDict()  # (board version, position, player) -> frozenset of targets
     
     def reset(self):
         '''Resets the game to the initial state.'''
@@ -30,6 +79,10 @@ class GameEngine:
         self.current_player = self.board.players[0]
         self._selected_position = None
         self.winner = None
+        self.passed = None
+        self.adjudicated = None
+        self.history = []
+        self._occurrences = {}
         return self
     
     @property
@@ -84,12 +137,25 @@ class GameEngine:
         return self.board.get_positions(self.current_player)
 
     def get_valid_moves(self):
-        '''Returns all valid moves for the piece that is currently selected.'''
-        if self.selected['position'] is None:
+        '''Returns all valid moves for the piece that is currently selected.
+
+        Returns:
+            frozenset: The (row, col) targets of the piece.
+        '''
+        position = self._selected_position
+        if position is None:
             raise ValueError('No piece selected.')
+        key = (self.board.version, tuple(position), self.current_player)
+        moves = self._moves.get(key)
+        if moves is not None:
+            self._moves.move_to_end(key)
+            return moves
         # Use the rules to get valid steps
-        valid_moves = self.rules.get_valid_steps(self.board, self.selected['position'], self.current_player)
-        return valid_moves
+        moves = frozenset(self.rules.get_valid_steps(self.board, position, self.current_player))
+        self._moves[key] = moves
+        if len(self._moves) > self.kMoveCacheSize:
+            self._moves.popitem(last=False)  # Least recently used
+        return moves
 
     def move(self, position, force=False):
         '''Moves the currently selected piece to the new position if valid.
@@ -118,6 +184,10 @@ class GameEngine:
             if position not in valid_moves:
                 raise ValueError(f'Move to {position} is not valid.')
         
+        if not self.history:
+            # The position before the first move, as set up by the caller
+            self._record()
+
         # If forced or valid, execute the move
         # If the target square has an opponent's piece, it will be captured
         target_piece = self.board.peek(*position)
@@ -144,9 +214,61 @@ class GameEngine:
         else:
             # Game continues, switch to the next player
             self.next_turn()
+            self._apply_no_move()
 
+        self._record()
+        if self.winner is None:
+            self._adjudicate()
         return self
 
+    # ===== Position history =====
+    @property
+    def plies(self):
+        '''Number of moves played.'''
+        return max(len(self.history) - 1, 0)
+
+    def position_key(self):
+        '''Returns the Zobrist key of the board and the player to move.'''
+        return get_tables(self.board.rows, self.board.cols).zobrist.hash(self.board, self.current_player)
+
+    def repetitions(self, key=None):
+        '''Returns how many times the position (default: the current one) occurred in the game.'''
+        if key is None:
+            if not self.history:
+                return 1
+            key = self.history[-1]
+        return self._occurrences.get(key, 0)
+
+    def _record(self):
+        key = self.position_key()
+        self.history.append(key)
+        self._occurrences[key] = self._occurrences.get(key, 0) + 1
+
+    def _adjudicate(self):
+        if self.repetition_draw is not None and self.repetitions() >= self.repetition_draw:
+            self.winner, self.adjudicated = 'TIE', 'repetition'
+        elif self.max_plies is not None and self.plies >= self.max_plies:
+            self.winner, self.adjudicated = 'TIE', 'max plies'
+
+    def has_legal_move(self, player=None):
+        '''Checks if the player (default: the current player) can move any piece.'''
+        return self.rules.has_legal_move(self.board, self.current_player if player is None else player)
+
+    def _apply_no_move(self):
+        # Called after switching to the next player: the check stops at the first legal move
+        self.passed = None
+        if self.rules.has_legal_move(self.board, self.current_player):
+            return
+        p1, p2 = self.board.players
+        opponent = p2 if self.current_player == p1 else p1
+        if self.no_move == self.kLose:
+            self.winner = opponent
+        elif not self.rules.has_legal_move(self.board, opponent):
+            self.winner = 'TIE'  # Neither player can move
+        else:
+            self.passed = self.current_player
+            self.current_player = opponent
+
     def next_turn(self):
         '''Switches the current player if the game is not over.'''
         if self.winner is not None:
@@ -156,5 +278,94 @@ class GameEngine:
         p1, p2 = self.board.players
         self.current_player = p2 if self.current_player == p1 else p1
 
+    # ===== Computer moves =====
+    @property
+    def searcher(self):
+        '''The Searcher of the engine (created on first use, kept between moves).'''
+        if self._searcher is None:
+            from linesofaction.search import Searcher
+            self._searcher = Searcher()
+        return self._searcher
+
+    def suggest_move(self, deadline: float = None, node_limit: int = None,
+                     depth: int = None, budget: float = None, should_stop=None):
+        '''Searches a move for the current player (anytime).
+
+        The search deepens until a limit is hit and always returns the best
+        move found so far. Without any limit, the budget is 1 second. The full
+        SearchResult is kept in `last_search`.
+
+        Args:
+            deadline (float): `time.monotonic()` by which the move is needed.
+            node_limit (int): Maximum number of searched nodes.
+            depth (int): Maximum search depth.
+            budget (float): Search time in seconds (alternative to the deadline).
+            should_stop (callable): Polled during the search; stop when it returns True.
+
+        Returns:
+            tuple: The move as ((row, col), (row, col)), None if there is no legal move.
+
+        Raises:
+            ValueError: If the game is over.
+        '''
+        if self.winner is not None:
+            raise ValueError('The game is over.')
+        deadline = self._deadline(deadline, node_limit, depth, budget)
+        return self._suggest_move(self._position(), deadline, node_limit, depth, should_stop,
+                                  self._search_history())
+
+    async def suggest_move_async(self, deadline: float = None, node_limit: int = None,
+                                 depth: int = None, budget: float = None, executor=None):
+        '''Same as `suggest_move`, running the search in an executor.
+
+        The position is captured when called. Cancelling the awaiting task
+        stops the search.
+
+        Args:
+            executor (concurrent.futures.Executor): Executor to run the search
+                                                    in (default: the loop's).
+        '''
+        if self.winner is not None:
+            raise ValueError('The game is over.')
+        import asyncio  # Not needed by synchronous users, and slow to import
+        cancelled = threading.Event()
+        # The budget counts from now, not from when the executor gets to the search
+        deadline = self._deadline(deadline, node_limit, depth, budget)
+        search = functools.partial(self._suggest_move, self._position(), deadline, node_limit,
+                                   depth, cancelled.is_set, self._search_history())
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, search)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    def _position(self):
+        from linesofaction.movegen import Position
+        return Position.from_board(self.board, self.current_player)
+
+    def _search_history(self):
+        # Repetitions only matter when they are draws
+        return tuple(self.history) if self.repetition_draw is not None else None
+
+    @staticmethod
+    def _deadline(deadline, node_limit, depth, budget):
+        # Absolute deadline of a search: the earliest of the deadline and the budget, 1 second without limits
+        if budget is not None:
+            return min(deadline, time.monotonic() + budget) if deadline is not None \
+                else time.monotonic() + budget
+        if deadline is None and node_limit is None and depth is None:
+            return time.monotonic() + 1.0
+        return deadline
+
+    def _suggest_move(self, position, deadline, node_limit, depth, should_stop, history=None):
+        # One search at a time; a cancelled one stops within a few milliseconds
+        with self._search_lock:
+            self.searcher.no_move = self.no_move
+            result = self.searcher.search(position, depth=depth, deadline=deadline,
+                                          node_limit=node_limit, should_stop=should_stop,
+                                          history=history)
+        self.last_search = result
+        return result.move
+
     def __repr__(self):
         return self.board.__repr__(active=self.selected['position'])
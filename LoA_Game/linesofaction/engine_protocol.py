@@ -0,0 +1,240 @@
+r'''Line-based engine protocol (UCI-style) over stdin/stdout.
+
+Lets GUIs and match runners drive the engine as a long-lived subprocess. The
+searcher (and its transposition table) and the board tables are created once,
+so the latency of a move is the search time only.
+
+Commands::
+
+    uci                                 -> id name ..., id author ..., uciok
+    isready                             -> readyok
+    ucinewgame                          Clears the transposition table
+    position startpos [RxC] [moves B1D3 ...]
+    position board <board> <b|r> [moves ...]
+    setboard <board> <b|r>              Same as "position board"
+    go [depth N] [movetime MS] [nodes N] [infinite]
+                                        -> info ... lines, then bestmove B1D3
+    stop                                Stops the search, which prints its bestmove
+    d                                   Prints the board
+    quit
+
+A new "position" or "go" waits for a running limited search to finish (and
+stops an infinite one), so scripts can pipe commands without "stop".
+
+Boards are rows of piece characters joined with '/', moves are written as two
+squares (see `linesofaction.notation`). While searching, one line per completed
+depth is printed::
+
+    info depth 4 score cp 35 nodes 5231 nps 41210 time 127 pv B1D3 A2C2 ...
+
+Example:
+    >>> EngineProtocol().run(sys.stdin)
+'''
+import sys
+import threading
+import time
+
+from linesofaction import notation
+from linesofaction.movegen import Position
+from linesofaction.search import Searcher, kMaxPly, kWin
+from linesofaction.tables import get_tables
+
+
+class EngineProtocol:
+    r'''Engine protocol interpreter.
+
+    Args:
+        output (file): Where responses are written (default: stdout).
+        searcher (Searcher): Searcher to use; kept for the whole session.
+    '''
+    kName = 'LoA_Game'
+    kAuthor = 'LoA_Game contributors'
+
+    def __init__(self, output=None, searcher=None):
+        self.output = output if output is not None else sys.stdout
+        self.searcher = searcher if searcher is not None else Searcher()
+        self.position = self._start_position(8, 8)
+        self._stopped = threading.Event()
+        self._thread = None
+        self._infinite = False
+        self._output_lock = threading.Lock()
+
+    # ===== I/O =====
+    def send(self, line):
+        '''Writes a response line (thread-safe).'''
+        with self._output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run(self, lines=None):
+        '''Handles the lines until "quit" or the end of the input.'''
+        lines = lines if lines is not None else sys.stdin
+        try:
+            for line in lines:
+                if not self.handle(line):
+                    self._stop_search()
+                    break
+        finally:
+            self._wait_search()
+
+    def handle(self, line):
+        '''Handles a command line. Returns False after "quit".'''
+        tokens = line.split()
+        if not tokens:
+            return True
+        if tokens[0] == 'quit':
+            return False
+        handler = getattr(self, f'cmd_{tokens[0]}', None)
+        try:
+            if handler is None:
+                raise ValueError(f'Unknown command: {tokens[0]}')
+            handler(tokens[1:])
+        except ValueError as e:
+            self.send(f'info string error: {e}')
+        return True
+
+    # ===== Commands =====
+    def cmd_uci(self, args):
+        self.send(f'id name {self.kName}')
+        self.send(f'id author {self.kAuthor}')
+        self.send('uciok')
+
+    def cmd_isready(self, args):
+        get_tables(self.position.tables.rows, self.position.tables.cols)
+        self.send('readyok')
+
+    def cmd_ucinewgame(self, args):
+        self._stop_search()
+        self.searcher.clear()
+
+    def cmd_position(self, args):
+        if not args:
+            raise ValueError('Usage: position startpos|board ... [moves ...]')
+        moves = []
+        if 'moves' in args:
+            idx = args.index('moves')
+            args, moves = args[:idx], args[idx + 1:]
+            if not args:
+                raise ValueError('Usage: position startpos|board ... [moves ...]')
+        if args[0] == 'startpos':
+            rows = cols = 8
+            if len(args) > 1:
+                rows, cols = self._parse_shape(args[1])
+            position = self._start_position(rows, cols)
+        elif args[0] == 'board' and len(args) == 3:
+            position = self._parse_board(args[1], args[2])
+        else:
+            raise ValueError('Usage: position startpos [RxC] | board <board> <b|r> [moves ...]')
+        for move in moves:
+            self._play(position, move)
+        self._wait_search()
+        self.position = position
+
+    def cmd_setboard(self, args):
+        if len(args) != 2:
+            raise ValueError('Usage: setboard <board> <b|r>')
+        self.cmd_position(['board'] + args)
+
+    def cmd_go(self, args):
+        depth = node_limit = movetime = None
+        options = iter(args)
+        for option in options:
+            if option == 'infinite':
+                continue
+            if option not in ('depth', 'nodes', 'movetime'):
+                raise ValueError(f'Unknown go option: {option}')
+            try:
+                value = int(next(options))
+            except (StopIteration, ValueError):
+                raise ValueError(f'"{option}" needs an integer value.') from None
+            if value <= 0:
+                raise ValueError(f'"{option}" must be positive.')
+            if option == 'depth':
+                depth = value
+            elif option == 'nodes':
+                node_limit = value
+            else:
+                movetime = value
+        self._wait_search()
+        self._stopped.clear()
+        self._infinite = depth is None and node_limit is None and movetime is None
+        deadline = time.monotonic() + movetime / 1000 if movetime is not None else None
+        self._thread = threading.Thread(
+            target=self._search, args=(self.position.copy(), depth, deadline, node_limit),
+            name='search', daemon=True)
+        self._thread.start()
+
+    def cmd_stop(self, args):
+        self._stop_search()
+
+    def cmd_d(self, args):
+        board = self.position.to_board()
+        self.send(str(board).rstrip('\n'))
+        self.send(f'player {self.position.player.name.lower()}')
+        self.send(f'board {notation.board_to_str(board)} {self.position.player.char()}')
+        self.send(f'key {self.position.key:016x}')
+
+    # ===== Search =====
+    def _search(self, position, depth, deadline, node_limit):
+        result = self.searcher.search(
+            position, depth=depth, deadline=deadline, node_limit=node_limit,
+            should_stop=self._stopped.is_set, on_info=self._info)
+        move = notation.move_to_str(result.move) if result.move is not None else '(none)'
+        self.send(f'bestmove {move}')
+
+    def _info(self, result):
+        pv = ' '.join(notation.move_to_str(move) for move in result.pv)
+        self.send(f'info depth {result.depth} score {self._score(result.score)} '
+                  f'nodes {result.nodes} nps {result.nps} time {int(result.elapsed * 1000)}'
+                  + (f' pv {pv}' if pv else ''))
+
+    @staticmethod
+    def _score(score):
+        if abs(score) >= kWin - kMaxPly:
+            plies = kWin - abs(score)
+            moves = (plies + 1) // 2
+            return f'mate {moves if score > 0 else -moves}'
+        return f'cp {score}'
+
+    def _stop_search(self):
+        '''Stops a running search and waits for its bestmove.'''
+        self._stopped.set()
+        self._wait_search()
+
+    def _wait_search(self):
+        '''Waits for a running search to finish (an infinite one is stopped).'''
+        if self._thread is not None:
+            if self._infinite:
+                self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    # ===== Parsing =====
+    @staticmethod
+    def _start_position(rows, cols):
+        return Position.initial(rows, cols)
+
+    @staticmethod
+    def _parse_shape(text):
+        try:
+            rows, cols = (int(value) for value in text.lower().split('x'))
+        except ValueError:
+            raise ValueError(f'Invalid board size: {text}. Example: 8x8.') from None
+        return rows, cols
+
+    @staticmethod
+    def _parse_board(board, player):
+        rows = notation.str_to_rows(board)
+        tables = get_tables(len(rows), len(rows[0]))
+        return Position(tables, [piece for row in rows for piece in row], notation.parse_player(player))
+
+    @staticmethod
+    def _play(position, text):
+        origin, target = notation.parse_move(text)
+        tables = position.tables
+        if not all(0 <= row < tables.rows and 0 <= col < tables.cols for row, col in (origin, target)):
+            raise ValueError(f'Move out of the board: {text}')
+        origin, target = tables.square(origin), tables.square(target)
+        if position.cells[origin] != position.player or target not in position.piece_moves(origin):
+            raise ValueError(f'Illegal move: {text}')
+        position.make((origin, target))
@@ -0,0 +1,326 @@
+r'''Game database with a position index.
+
+Games are appended as JSON lines to segment files. Once a segment is sealed
+(because it is full, or explicitly), an on-disk hash index is built for it,
+mapping every position key reached in its games to (game id, ply). Lookups
+open the index files through mmap, so the database is never loaded into memory,
+and adding a segment only requires indexing that segment.
+
+Layout of a database directory::
+
+    meta.json                # Database parameters (segment size)
+    seg-000000.jsonl         # One game record per line
+    seg-000000.idx           # Hash index of a sealed segment
+    seg-000001.jsonl         # Active segment (no index yet)
+
+Game ids are `segment * segment_size + line`, so they stay stable when
+segments are sealed early.
+'''
+import json
+import mmap
+import os
+import struct
+
+from linesofaction.board import Board
+from linesofaction.zobrist import Zobrist
+
+
+class GameDatabase:
+    r'''Append-only game database with a position lookup.
+
+    Args:
+        path (str): Directory of the database. Created if missing.
+        segment_size (int): Number of games per segment. Only used when the
+                            database is created; afterwards it is read from disk.
+
+    Example:
+        >>> with GameDatabase('games') as db:
+        ...     game_id = db.append([((0, 1), (2, 1))], result='black')
+        ...     db.seal()
+        ...     db.lookup(board, player)
+        [(0, 1)]
+    '''
+    kMagic = b'LOAIDX02'
+    # magic, capacity, number of entries, number of games
+    kHeader = struct.Struct('<8sQQQ')
+    # key, game id, ply + 1 (0 marks an empty slot)
+    kEntry = struct.Struct('<QQI')
+    kPlyOffset = 16  # Offset of the ply in an entry
+    kOffset = struct.Struct('<Q')
+
+    def __init__(self, path, segment_size: int = 4096):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.segment_size = json.load(f)['segment_size']
+        else:
+            self.segment_size = segment_size
+            with open(meta_path, 'w') as f:
+                json.dump({'segment_size': segment_size}, f)
+        self._hashers = {}
+        self._indexes = {}  # segment -> (file, mmap, capacity, num entries, num games)
+        self._active = None  # segment number of the active segment
+        self._active_file = None
+        self._active_count = 0
+        # Index anything that was sealed but not indexed (e.g. interrupted build)
+        self.build_index()
+
+    # ===== Files =====
+    def _segment_path(self, segment):
+        return os.path.join(self.path, f'seg-{segment:06d}.jsonl')
+
+    def _index_path(self, segment):
+        return os.path.join(self.path, f'seg-{segment:06d}.idx')
+
+    def segments(self):
+        '''Returns the sorted segment numbers present on disk.'''
+        result = []
+        for name in os.listdir(self.path):
+            if name.startswith('seg-') and name.endswith('.jsonl'):
+                result.append(int(name[4:-6]))
+        return sorted(result)
+
+    def is_sealed(self, segment):
+        '''Checks if the segment is sealed (no more games are appended to it).'''
+        return (os.path.exists(self._index_path(segment))
+            or os.path.exists(self._segment_path(segment) + '.sealed'))
+
+    # ===== Writing =====
+    def _open_active(self):
+        if self._active_file is not None:
+            return
+        segments = self.segments()
+        if segments and not self.is_sealed(segments[-1]):
+            self._active = segments[-1]
+            with open(self._segment_path(self._active), 'rb') as f:
+                self._active_count = sum(1 for _ in f)
+        else:
+            self._active = segments[-1] + 1 if segments else 0
+            self._active_count = 0
+        self._active_file = open(self._segment_path(self._active), 'a')
+
+    def append(self, moves, rows: int = 8, cols: int = 8, result=None, **meta):
+        '''Appends a game record.
+
+        Args:
+            moves (list): Moves as ((row, col), (row, col)) pairs, starting
+                          from the initial position.
+            rows (int): Number of rows of the board the game was played on.
+            cols (int): Number of columns of the board the game was played on.
+            result (str): Game result, e.g. 'black', 'red', 'tie' or None.
+            meta: Extra JSON-serializable fields stored with the record.
+
+        Returns:
+            int: Id of the appended game.
+        '''
+        self._open_active()
+        record = dict(meta)
+        record.update({
+            'rows': rows,
+            'cols': cols,
+            'result': result,
+            'moves': [[*origin, *target] for origin, target in moves],
+        })
+        self._active_file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        game_id = self._active * self.segment_size + self._active_count
+        self._active_count += 1
+        if self._active_count >= self.segment_size:
+            self.seal()
+        return game_id
+
+    def seal(self):
+        '''Seals the active segment and builds its index.
+
+        Games appended afterwards go to a new segment.
+        '''
+        if self._active_file is None:
+            segments = self.segments()
+            if not segments or self.is_sealed(segments[-1]):
+                return self
+            self._open_active()
+        self._active_file.close()
+        self._active_file = None
+        with open(self._segment_path(self._active) + '.sealed', 'w'):
+            pass
+        self.build_index()
+        return self
+
+    def close(self):
+        '''Flushes the active segment and closes all open files.
+
+        The active segment stays unsealed and is continued on the next open.
+        '''
+        if self._active_file is not None:
+            self._active_file.close()
+            self._active_file = None
+        for handle, mm, *_ in self._indexes.values():
+            mm.close()
+            handle.close()
+        self._indexes.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ===== Indexing =====
+    def _hasher(self, rows, cols):
+        if (rows, cols) not in self._hashers:
+            self._hashers[rows, cols] = Zobrist(rows, cols)
+        return self._hashers[rows, cols]
+
+    def position_keys(self, record):
+        '''Yields (ply, key) for every position of the game record.
+
+        Ply 0 is the initial position, ply N is the position after N moves.
+        '''
+        rows, cols = record['rows'], record['cols']
+        hasher = self._hasher(rows, cols)
+        board = Board(rows=rows, cols=cols)
+        player = board.players[0]
+        key = hasher.hash(board, player)
+        yield 0, key
+        for ply, (r0, c0, r1, c1) in enumerate(record['moves'], start=1):
+            piece = board.pop((r0, c0))
+            captured = board.pop((r1, c1))
+            board.place((r1, c1), piece)
+            key ^= hasher.move_delta((r0, c0), (r1, c1), piece, captured)
+            player = ~player
+            yield ply, key
+
+    def build_index(self):
+        '''Builds the index of every sealed segment that does not have one.
+
+        Returns:
+            list: Segment numbers that were indexed.
+        '''
+        built = []
+        for segment in self.segments():
+            if segment == self._active and self._active_file is not None:
+                continue
+            if os.path.exists(self._index_path(segment)):
+                continue
+            if not self.is_sealed(segment):
+                continue
+            self._build_segment_index(segment)
+            built.append(segment)
+        return built
+
+    def _build_segment_index(self, segment):
+        entries = []
+        offsets = [0]
+        with open(self._segment_path(segment), 'rb') as f:
+            for line_no, line in enumerate(f):
+                offsets.append(offsets[-1] + len(line))
+                game_id = segment * self.segment_size + line_no
+                for ply, key in self.position_keys(json.loads(line)):
+                    entries.append((key, game_id, ply))
+
+        # Open addressing with linear probing, load factor <= 0.5
+        capacity = 1
+        while capacity < 2 * len(entries) + 1:
+            capacity *= 2
+        table = bytearray(capacity * self.kEntry.size)
+        mask = capacity - 1
+        empty = bytes(self.kEntry.size - self.kPlyOffset)
+        for key, game_id, ply in entries:
+            slot = key & mask
+            while table[slot * self.kEntry.size + self.kPlyOffset:(slot + 1) * self.kEntry.size] != empty:
+                slot = (slot + 1) & mask
+            self.kEntry.pack_into(table, slot * self.kEntry.size, key, game_id, ply + 1)
+
+        tmp_path = self._index_path(segment) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.kHeader.pack(self.kMagic, capacity, len(entries), len(offsets) - 1))
+            f.write(table)
+            f.write(b''.join(self.kOffset.pack(offset) for offset in offsets))
+        os.replace(tmp_path, self._index_path(segment))
+
+    def _open_index(self, segment):
+        if segment not in self._indexes:
+            handle = open(self._index_path(segment), 'rb')
+            mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, capacity, num_entries, num_games = self.kHeader.unpack_from(mm, 0)
+            if magic != self.kMagic:
+                mm.close()
+                handle.close()
+                raise ValueError(f'Not a game index (or one of an older version, delete it to rebuild it '
+                                 f'with build_index): {self._index_path(segment)}')
+            self._indexes[segment] = (handle, mm, capacity, num_entries, num_games)
+        return self._indexes[segment]
+
+    # ===== Reading =====
+    def lookup_key(self, key):
+        '''Finds every (game id, ply) at which the position key occurred.
+
+        Only indexed (sealed) segments are searched.
+
+        Returns:
+            list: Sorted list of (game id, ply) tuples.
+        '''
+        result = []
+        for segment in self.segments():
+            if not os.path.exists(self._index_path(segment)):
+                continue
+            _, mm, capacity, _, _ = self._open_index(segment)
+            mask = capacity - 1
+            slot = key & mask
+            base = self.kHeader.size
+            while True:
+                entry_key, game_id, ply = self.kEntry.unpack_from(mm, base + slot * self.kEntry.size)
+                if ply == 0:
+                    break
+                if entry_key == key:
+                    result.append((game_id, ply - 1))
+                slot = (slot + 1) & mask
+        return sorted(result)
+
+    def lookup(self, board, player=None):
+        '''Finds every (game id, ply) at which the position occurred.
+
+        Args:
+            board (Board): Position to look up.
+            player (Piece): Player to move. Defaults to the first player.
+        '''
+        return self.lookup_key(self._hasher(board.rows, board.cols).hash(board, player))
+
+    def get(self, game_id):
+        '''Returns the game record with the given id.
+
+        Raises:
+            KeyError: If there is no such game.
+        '''
+        segment, line_no = divmod(game_id, self.segment_size)
+        if segment == self._active and self._active_file is not None:
+            self._active_file.flush()
+        if os.path.exists(self._index_path(segment)):
+            _, mm, capacity, _, num_games = self._open_index(segment)
+            if line_no >= num_games:
+                raise KeyError(game_id)
+            base = self.kHeader.size + capacity * self.kEntry.size + line_no * self.kOffset.size
+            start, = self.kOffset.unpack_from(mm, base)
+            end, = self.kOffset.unpack_from(mm, base + self.kOffset.size)
+            with open(self._segment_path(segment), 'rb') as f:
+                f.seek(start)
+                return json.loads(f.read(end - start))
+        if os.path.exists(self._segment_path(segment)):
+            with open(self._segment_path(segment), 'rb') as f:
+                for idx, line in enumerate(f):
+                    if idx == line_no:
+                        return json.loads(line)
+        raise KeyError(game_id)
+
+    def __len__(self):
+        count = 0
+        for segment in self.segments():
+            if os.path.exists(self._index_path(segment)):
+                count += self._open_index(segment)[4]
+            elif segment == self._active and self._active_file is not None:
+                count += self._active_count
+            else:
+                with open(self._segment_path(segment), 'rb') as f:
+                    count += sum(1 for _ in f)
+        return count
@@ -0,0 +1,236 @@
+from linesofaction.piece import Piece
+from linesofaction.rules import GameEndState
+from linesofaction.tables import get_tables
+
+
+class Position:
+    r'''Mutable position with fast move generation, for search and bulk replay.
+
+    The board is a flat list of Piece values indexed by square (see
+    `BoardTables`). The number of pieces on every line, the piece sets and the
+    Zobrist key are updated incrementally by `make`/`unmake`, so generating
+    the moves of a piece only walks its rays.
+
+    Moves are (origin, target) pairs of squares. Use `tables.position(square)`
+    to convert a square back to (row, col).
+
+    Args:
+        tables (BoardTables): Tables of the board shape.
+        cells (list): Piece value of every square.
+        player (Piece): Player to move.
+
+    Note:
+        The first player is always Piece.BLACK (see `Board.players`).
+    '''
+    __slots__ = ('tables', 'cells', 'counts', 'pieces', 'player', 'key')
+
+    def __init__(self, tables, cells, player=Piece.BLACK):
+        self.tables = tables
+        self.cells = list(cells)
+        self.player = Piece(player)
+        self.counts = [sum(1 for square in line if self.cells[square]) for line in tables.lines]
+        self.pieces = {Piece.BLACK: set(), Piece.RED: set()}
+        keys = tables.zobrist.keys
+        self.key = 0 if self.player == Piece.BLACK else tables.zobrist.side
+        for square, value in enumerate(self.cells):
+            if value:
+                self.pieces[value].add(square)
+                self.key ^= keys[value][square]
+
+    @classmethod
+    def from_board(cls, board, player=None):
+        '''Creates a position from a Board (the first player moves by default).'''
+        tables = get_tables(board.rows, board.cols)
+        return cls(tables, board.cells(),
+                   board.players[0] if player is None else player)
+
+    @classmethod
+    def initial(cls, rows: int = 8, cols: int = 8):
+        '''Creates the initial position of the shape (same layout as `Board`), without NumPy.'''
+        if rows < 4 or cols < 4:
+            raise ValueError('Board must have at least 4 rows and 4 columns')
+        tables = get_tables(rows, cols)
+        cells = [Piece.EMPTY] * tables.size
+        for col in range(1, cols - 1):  # First player on the first and last rows
+            cells[col] = cells[(rows - 1) * cols + col] = Piece.BLACK
+        for row in range(1, rows - 1):  # Second player on the first and last columns
+            cells[row * cols] = cells[row * cols + cols - 1] = Piece.RED
+        return cls(tables, cells, Piece.BLACK)
+
+    def to_board(self):
+        '''Creates a Board from the position.'''
+        from linesofaction.board import Board
+        board = Board(rows=self.tables.rows, cols=self.tables.cols)
+        board.set_cells(self.cells)
+        return board
+
+    def copy(self):
+        other = object.__new__(Position)
+        other.tables = self.tables
+        other.cells = self.cells[:]
+        other.counts = self.counts[:]
+        other.pieces = {player: set(squares) for player, squares in self.pieces.items()}
+        other.player = self.player
+        other.key = self.key
+        return other
+
+    # ===== Move generation =====
+    def piece_moves(self, square, player=None):
+        '''Returns the target squares of the piece on the square.'''
+        player = self.player if player is None else player
+        enemy = player.opposite()
+        cells = self.cells
+        counts = self.counts
+        line_of = self.tables.line_of[square]
+        rays = self.tables.rays[square]
+        targets = []
+        for orientation in range(4):
+            steps = counts[line_of[orientation]]
+            for ray in (rays[2 * orientation], rays[2 * orientation + 1]):
+                if len(ray) < steps:
+                    continue
+                target = ray[steps - 1]
+                if cells[target] == player:
+                    continue
+                for idx in range(steps - 1):
+                    if cells[ray[idx]] == enemy:  # Cannot jump over enemies
+                        break
+                else:
+                    targets.append(target)
+        return targets
+
+    def moves(self, player=None):
+        '''Returns all moves of the player (default: player to move).
+
+        Moves are ordered by origin square, then by direction.
+        '''
+        player = self.player if player is None else player
+        return [(origin, target)
+                for origin in sorted(self.pieces[player])
+                for target in self.piece_moves(origin, player)]
+
+    def is_legal(self, move):
+        '''Checks if the move (origin, target) is legal for the player to move.
+
+        Cheaper than searching the target in `piece_moves`, as only the ray
+        towards the target is walked.
+        '''
+        origin, target = move
+        cells = self.cells
+        player = self.player
+        if cells[origin] != player or cells[target] == player:
+            return False
+        cols = self.tables.cols
+        d_row = target // cols - origin // cols
+        d_col = target % cols - origin % cols
+        if d_row == 0:
+            orientation = 0
+        elif d_col == 0:
+            orientation = 1
+        elif d_row == d_col:
+            orientation = 2
+        elif d_row == -d_col:
+            orientation = 3
+        else:
+            return False
+        steps = max(abs(d_row), abs(d_col))
+        if self.counts[self.tables.line_of[origin][orientation]] != steps:
+            return False
+        step = (target - origin) // steps
+        enemy = player.opposite()
+        return all(cells[square] != enemy for square in range(origin + step, target, step))
+
+    def has_move(self, player=None):
+        '''Checks if the player has any move, stopping at the first one found.'''
+        player = self.player if player is None else player
+        return any(self.piece_moves(origin, player) for origin in self.pieces[player])
+
+    # ===== Making moves =====
+    def make(self, move):
+        '''Plays the move and switches the player to move.
+
+        Returns:
+            Piece: The captured piece (Piece.EMPTY if none), needed by `unmake`.
+        '''
+        origin, target = move
+        cells = self.cells
+        counts = self.counts
+        line_of = self.tables.line_of
+        keys = self.tables.zobrist.keys
+        piece = cells[origin]
+        captured = cells[target]
+        cells[origin] = Piece.EMPTY
+        cells[target] = piece
+        for line in line_of[origin]:
+            counts[line] -= 1
+        self.pieces[piece].discard(origin)
+        self.pieces[piece].add(target)
+        if captured:
+            self.pieces[captured].discard(target)
+            self.key ^= keys[captured][target]
+        else:
+            for line in line_of[target]:
+                counts[line] += 1
+        self.key ^= keys[piece][origin] ^ keys[piece][target] ^ self.tables.zobrist.side
+        self.player = self.player.opposite()
+        return Piece(captured)
+
+    def unmake(self, move, captured):
+        '''Takes back a move played with `make`.'''
+        origin, target = move
+        cells = self.cells
+        counts = self.counts
+        line_of = self.tables.line_of
+        keys = self.tables.zobrist.keys
+        piece = cells[target]
+        cells[origin] = piece
+        cells[target] = captured
+        for line in line_of[origin]:
+            counts[line] += 1
+        self.pieces[piece].discard(target)
+        self.pieces[piece].add(origin)
+        if captured:
+            self.pieces[captured].add(target)
+            self.key ^= keys[captured][target]
+        else:
+            for line in line_of[target]:
+                counts[line] -= 1
+        self.key ^= keys[piece][origin] ^ keys[piece][target] ^ self.tables.zobrist.side
+        self.player = self.player.opposite()
+
+    def pass_turn(self):
+        '''Switches the player to move without moving (when the player has no move).
+
+        Passing again takes it back.
+        '''
+        self.key ^= self.tables.zobrist.side
+        self.player = self.player.opposite()
+
+    # ===== Game state =====
+    def is_connected(self, player):
+        '''Checks if all pieces of the player form a single (8-connected) group.'''
+        pieces = self.pieces[player]
+        if not pieces:
+            return False
+        neighbours = self.tables.neighbours
+        start = next(iter(pieces))
+        visited = {start}
+        stack = [start]
+        while stack:
+            for nbr in neighbours[stack.pop()]:
+                if nbr in pieces and nbr not in visited:
+                    visited.add(nbr)
+                    stack.append(nbr)
+        return len(visited) == len(pieces)
+
+    def game_state(self):
+        '''Returns the GameEndState of the position (same rules as GameRules.is_game_over).'''
+        connected1 = self.is_connected(Piece.BLACK)
+        connected2 = self.is_connected(Piece.RED)
+        if connected1 and connected2:
+            return GameEndState.TIE
+        elif connected1:
+            return GameEndState.WIN1
+        elif connected2:
+            return GameEndState.WIN2
+        return GameEndState.CONTINUE
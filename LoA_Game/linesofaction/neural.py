@@ -0,0 +1,170 @@
+r'''Neural network evaluation with NumPy only.
+
+`NeuralEvaluator` runs a small network on the CPU: optional 3x3 convolution
+layers ("same" padding, ReLU), then dense layers (ReLU, tanh on the single
+output). Without convolutions it is a plain MLP. The input has two planes
+seen from the player to move: their pieces and the opponent's pieces.
+
+Weight files are `.npz` archives::
+
+    rows, cols                     Board shape the network was trained for
+    conv0.weight, conv0.bias       (out, in, 3, 3), (out,)   -- optional
+    dense0.weight, dense0.bias     (in, out), (out,)
+    ...                            The last dense layer has one output
+
+Networks are much faster on batches than on single positions, so the
+searcher can hand all the leaves of a frontier node to `evaluate_batch` (see
+`Searcher(batch_evaluate=...)`). `benchmarks/neural_eval.py` reports the
+throughput of both.
+
+Example:
+    >>> net = NeuralEvaluator.load('eval.npz')
+    >>> searcher = Searcher(evaluate=net, batch_evaluate=net.evaluate_batch)
+'''
+import numpy as np
+
+from linesofaction.piece import Piece
+
+
+class NeuralEvaluator:
+    r'''Position evaluation by a small convolutional or fully connected network.
+
+    Args:
+        rows (int): Number of rows of the board.
+        cols (int): Number of columns of the board.
+        convs (list): (weight, bias) of the convolution layers, weight of shape (out, in, 3, 3).
+        dense (list): (weight, bias) of the dense layers, weight of shape (in, out).
+
+    Raises:
+        ValueError: If the layer shapes do not fit together.
+    '''
+    kPlanes = 2
+    kScale = 1000  # Score of a network output of 1, far below the win scores
+    kDtype = np.float32
+
+    def __init__(self, rows: int, cols: int, convs=(), dense=()):
+        self.rows = rows
+        self.cols = cols
+        self.convs = [(np.asarray(w, self.kDtype), np.asarray(b, self.kDtype)) for w, b in convs]
+        self.dense = [(np.asarray(w, self.kDtype), np.asarray(b, self.kDtype)) for w, b in dense]
+        channels = self.kPlanes
+        for idx, (weight, bias) in enumerate(self.convs):
+            if weight.ndim != 4 or weight.shape[1:] != (channels, 3, 3) or bias.shape != weight.shape[:1]:
+                raise ValueError(f'conv{idx}: expected a (out, {channels}, 3, 3) weight and (out,) bias')
+            channels = weight.shape[0]
+        inputs = channels * rows * cols
+        for idx, (weight, bias) in enumerate(self.dense):
+            if weight.ndim != 2 or weight.shape[0] != inputs or bias.shape != weight.shape[1:]:
+                raise ValueError(f'dense{idx}: expected a ({inputs}, out) weight and (out,) bias')
+            inputs = weight.shape[1]
+        if not self.dense or inputs != 1:
+            raise ValueError('The last dense layer must have a single output')
+
+    # ===== Weight files =====
+    @classmethod
+    def load(cls, path):
+        '''Loads a weight file.'''
+        with np.load(path) as data:
+            layers = {'conv': [], 'dense': []}
+            for kind in layers:
+                while f'{kind}{len(layers[kind])}.weight' in data:
+                    idx = len(layers[kind])
+                    layers[kind].append((data[f'{kind}{idx}.weight'], data[f'{kind}{idx}.bias']))
+            return cls(int(data['rows']), int(data['cols']), layers['conv'], layers['dense'])
+
+    def save(self, path):
+        '''Saves the weights (see the module docstring for the format).'''
+        arrays = {'rows': np.array(self.rows), 'cols': np.array(self.cols)}
+        for kind, layers in (('conv', self.convs), ('dense', self.dense)):
+            for idx, (weight, bias) in enumerate(layers):
+                arrays[f'{kind}{idx}.weight'] = weight
+                arrays[f'{kind}{idx}.bias'] = bias
+        np.savez(path, **arrays)
+
+    @classmethod
+    def random(cls, rows: int = 8, cols: int = 8, channels=(), hidden=(64,), seed: int = 0):
+        '''Creates a network with random (He-initialized) weights, for tests and benchmarks.
+
+        Args:
+            channels (tuple): Output channels of the convolution layers (empty for an MLP).
+            hidden (tuple): Sizes of the hidden dense layers.
+        '''
+        rng = np.random.default_rng(seed)
+        convs, inputs = [], cls.kPlanes
+        for out in channels:
+            convs.append((rng.normal(0, np.sqrt(2 / (9 * inputs)), (out, inputs, 3, 3)), np.zeros(out)))
+            inputs = out
+        dense, inputs = [], inputs * rows * cols
+        for out in tuple(hidden) + (1,):
+            dense.append((rng.normal(0, np.sqrt(2 / inputs), (inputs, out)), np.zeros(out)))
+            inputs = out
+        return cls(rows, cols, convs, dense)
+
+    # ===== Inference =====
+    def features(self, boards, sides):
+        '''Builds the input planes.
+
+        Args:
+            boards (np.ndarray): (N, rows, cols) or (N, rows * cols) Piece values.
+            sides (np.ndarray): (N,) 0 if black is to move, 1 if red is
+                                (the convention of `linesofaction.codec`).
+
+        Returns:
+            np.ndarray: (N, 2, rows, cols) planes of the pieces of the player to move and of the opponent.
+        '''
+        boards = np.asarray(boards).reshape(-1, self.rows, self.cols)
+        mover = np.where(np.asarray(sides) == 0, Piece.BLACK.value, Piece.RED.value)[:, None, None]
+        planes = np.empty((len(boards), self.kPlanes, self.rows, self.cols), dtype=self.kDtype)
+        planes[:, 0] = boards == mover
+        planes[:, 1] = (boards != Piece.EMPTY) & (boards != mover)
+        return planes
+
+    def forward(self, planes):
+        '''Runs the network on (N, 2, rows, cols) planes, returns (N,) values in [-1, 1].'''
+        x = planes
+        if self.convs:
+            x = x.transpose(0, 2, 3, 1)  # Channels last: the convolutions need no transposes
+            for weight, bias in self.convs:
+                x = np.maximum(_conv3x3(x, weight) + bias, 0)
+            x = x.transpose(0, 3, 1, 2)  # Back to the (C, H, W) order of the dense weights
+        x = x.reshape(len(x), -1)
+        for weight, bias in self.dense[:-1]:
+            x = np.maximum(x @ weight + bias, 0)
+        weight, bias = self.dense[-1]
+        return np.tanh(x @ weight + bias)[:, 0]
+
+    def evaluate_batch(self, cells, players):
+        '''Evaluates a batch of positions for their player to move.
+
+        Args:
+            cells (list): Cells of each position (flat row-major Piece values,
+                          e.g. `bytes(position.cells)`).
+            players (list): Player to move in each position.
+
+        Returns:
+            list: Integer scores, like `linesofaction.search.evaluate`.
+        '''
+        if not len(cells):
+            return []
+        if isinstance(cells[0], bytes):
+            boards = np.frombuffer(b''.join(cells), dtype=np.int8)
+        else:
+            boards = np.array(cells, dtype=np.int8)
+        sides = [player != Piece.BLACK for player in players]
+        values = self.forward(self.features(boards, sides))
+        return np.rint(values * self.kScale).astype(int).tolist()
+
+    def __call__(self, position):
+        '''Evaluates a single Position for the player to move.'''
+        return self.evaluate_batch([bytes(position.cells)], [position.player])[0]
+
+
+def _conv3x3(x, weight):
+    '''"Same" 3x3 convolution of (N, H, W, C) inputs with (O, C, 3, 3) weights, returns (N, H, W, O).'''
+    num, height, width, channels = x.shape
+    padded = np.pad(x, ((0, 0), (1, 1), (1, 1), (0, 0)))
+    # (N, H, W, C, 3, 3) windows -> (N * H * W, C * 9) rows, one matrix product
+    windows = np.lib.stride_tricks.sliding_window_view(padded, (3, 3), axis=(1, 2))
+    columns = windows.reshape(num * height * width, channels * 9)
+    out = columns @ weight.reshape(len(weight), -1).T
+    return out.reshape(num, height, width, -1)
@@ -0,0 +1,93 @@
+r'''Text notation of squares, moves and boards.
+
+Squares are written like "A1": the column letter(s) (A, B, ..., Z, AA, AB, ...)
+followed by the one-based row. A1 is the top-left corner of the board.
+Moves are two squares, optionally separated by a dash ("B1D3" or "B1-D3").
+Boards are rows of piece characters (see `Piece.char`) joined with '/'.
+'''
+import re
+
+from linesofaction.piece import Piece
+
+_MOVE_RE = re.compile(r'^([A-Z]+[0-9]+)-?([A-Z]+[0-9]+)$')
+_CHAR2PIECE = {piece.char(): piece for piece in Piece}
+
+
+def parse_square(text):
+    '''Parses a square like "A1" into zero-based (row, col) indices.
+
+    Raises:
+        ValueError: If the text is not a square.
+    '''
+    text = text.strip().upper()
+    if len(text) < 2:
+        raise ValueError('Position too short. Must be like A1.')
+
+    col_part = text.rstrip('0123456789')
+    row_part = text[len(col_part):]
+    if not col_part or not row_part or not col_part.isalpha() or not col_part.isascii():
+        raise ValueError('Invalid position format. Example: A1, C3.')
+
+    col = 0
+    for ch in col_part:  # A..Z, then AA, AB, ... (bijective base 26)
+        col = col * 26 + (ord(ch) - ord('A') + 1)
+    return (int(row_part) - 1, col - 1)
+
+
+def square_to_str(row, col):
+    '''Converts zero-based (row, col) to a square like "A1".'''
+    letters = []
+    base = col
+    while True:
+        letters.append(chr(base % 26 + ord('A')))
+        base = base // 26 - 1
+        if base < 0:
+            break
+    return f'{"".join(reversed(letters))}{row + 1}'
+
+
+def parse_move(text):
+    '''Parses a move like "B1D3" or "B1-D3" into ((row, col), (row, col)).
+
+    Raises:
+        ValueError: If the text is not a move.
+    '''
+    match = _MOVE_RE.match(text.strip().upper())
+    if match is None:
+        raise ValueError(f'Invalid move: {text}. Example: B1D3.')
+    return parse_square(match.group(1)), parse_square(match.group(2))
+
+
+def move_to_str(move):
+    '''Converts ((row, col), (row, col)) to a move like "B1D3".'''
+    origin, target = move
+    return square_to_str(*origin) + square_to_str(*target)
+
+
+def board_to_str(board):
+    '''Converts a Board to rows of piece characters joined with '/'.'''
+    chars = {piece.value: piece.char() for piece in Piece}
+    return '/'.join(''.join(chars[value] for value in row) for row in board.tolist())
+
+
+def str_to_rows(string):
+    '''Converts a board string back into lists of Pieces.
+
+    Raises:
+        ValueError: If a character is not a piece or the rows differ in length.
+    '''
+    try:
+        rows = [[_CHAR2PIECE[char] for char in row] for row in string.split('/')]
+    except KeyError as e:
+        raise ValueError(f'Invalid piece character: {e.args[0]!r}') from None
+    if len({len(row) for row in rows}) != 1:
+        raise ValueError('All rows of the board must have the same length.')
+    return rows
+
+
+def parse_player(text):
+    '''Parses a player name or character ("black", "b", "red", "r").'''
+    for player in (Piece.BLACK, Piece.RED):
+        if text.lower() in (player.name.lower(), player.char()):
+            return player
+    raise ValueError(f'Invalid player: {text}')
@@ -0,0 +1,124 @@
+r'''Pondering: searching on the opponent's time.
+
+After the computer moves, `Ponderer.ponder` keeps searching in a background
+thread on the position expected after the opponent's predicted reply (the
+second move of the principal variation). When the computer has to move,
+`Ponderer.think` checks whether the ponder search is on the actual position:
+
+* ponder hit: the running search is not restarted, it simply gets a deadline
+  and its result (which includes the time spent pondering) is returned;
+* ponder miss: the ponder search is stopped and a new search starts. It still
+  benefits from the transposition table filled while pondering.
+
+The searcher runs in a thread (not a process) so that the transposition table
+is shared by the ponder and the move searches. The thread mostly competes with
+a human typing their move, which blocks in `input()` without holding the GIL.
+'''
+import threading
+import time
+
+from linesofaction.movegen import Position
+from linesofaction.search import Searcher
+
+
+class Ponderer:
+    r'''Computer player that keeps searching during the opponent's turn.
+
+    Args:
+        searcher (Searcher): Searcher shared by all searches (default: a new one).
+
+    Attributes:
+        hits (int): Number of `think` calls that continued the ponder search.
+        misses (int): Number of `think` calls that had to start a new search.
+
+    Example:
+        >>> ponderer = Ponderer()
+        >>> result = ponderer.think(position, budget=2.0)
+        >>> position.make(...)  # Play result.move
+        >>> ponderer.ponder(position, result)  # Search while the opponent thinks
+        >>> ...
+        >>> result = ponderer.think(position, budget=2.0)  # After the opponent's move
+    '''
+    def __init__(self, searcher=None):
+        self.searcher = searcher if searcher is not None else Searcher()
+        self.hits = 0
+        self.misses = 0
+        self._thread = None
+        self._key = None  # Key of the position searched by the ponder thread
+        self._result = None
+        self._stopped = False
+        self._deadline = None
+
+    @property
+    def pondering(self):
+        '''True while a ponder search is running.'''
+        return self._thread is not None and self._thread.is_alive()
+
+    def ponder(self, position, previous=None):
+        '''Starts searching in the background while the opponent is to move.
+
+        Args:
+            position (Position or Board): Position with the opponent to move. It is not modified.
+            previous (SearchResult): Result of the computer's last search. Its
+                                     principal variation predicts the reply.
+                                     Without a prediction, the position
+                                     itself is searched to fill the table.
+        '''
+        self.stop()
+        if not isinstance(position, Position):
+            position = Position.from_board(position)
+        position = position.copy()
+        predicted = previous.pv[1] if previous is not None and len(previous.pv) > 1 else None
+        if predicted is not None:
+            tables = position.tables
+            move = (tables.square(predicted[0]), tables.square(predicted[1]))
+            if move in position.moves():
+                position.make(move)
+        self._key = position.key
+        self._result = None
+        self._stopped = False
+        self._deadline = None
+        self._thread = threading.Thread(target=self._run, args=(position,), name='ponder', daemon=True)
+        self._thread.start()
+
+    def think(self, position, budget: float = 1.0, deadline: float = None, **limits):
+        '''Searches the best move of the computer, reusing the ponder search if it hit.
+
+        Args:
+            position (Position or Board): Position with the computer to move.
+            budget (float): Search time in seconds, from now.
+            deadline (float): `time.monotonic()` deadline (overrides the budget).
+            limits: Other `Searcher.search` limits (depth, node_limit), for
+                    searches that start from scratch.
+
+        Returns:
+            SearchResult
+        '''
+        if not isinstance(position, Position):
+            position = Position.from_board(position)
+        if deadline is None:
+            deadline = time.monotonic() + budget
+        if self._thread is not None:
+            if self._key == position.key and not limits:
+                # Ponder hit: let the running search go on until the deadline
+                self.hits += 1
+                self._deadline = deadline
+                self._thread.join()
+                self._thread = None
+                return self._result
+            self.misses += 1
+            self.stop()
+        return self.searcher.search(position, deadline=deadline, **limits)
+
+    def stop(self):
+        '''Stops the ponder search, if any.'''
+        if self._thread is not None:
+            self._stopped = True
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, position):
+        self._result = self.searcher.search(position, should_stop=self._should_stop)
+
+    def _should_stop(self):
+        return self._stopped or (self._deadline is not None and time.monotonic() >= self._deadline)
@@ -0,0 +1,274 @@
+r'''Batch replay and validation of recorded games.
+
+Game files hold one game per line, as a list of moves in A1 notation (see
+`linesofaction.notation`). Moves may be written as "B1B3", "B1-B3" or as two
+separate squares, separated by spaces or commas. A line may start with the
+board size ("6x6"), the default is 8x8. Blank lines and lines starting with
+'#' are skipped::
+
+    # Two games
+    B1-B3 H3-E3 C1-C3
+    6x6 B1B3 F2D2
+
+Games are replayed on a `Position` without any rendering. A player left
+without a legal move passes, and the game is a tie when neither player can
+move (`GameEngine`'s default no-move rule). Replay stops at the first illegal
+move of a game (or at a move played after the game ended) and reports it. `iter_replay` exposes the positions of the replay, for the tools
+that process recorded games (e.g. `linesofaction.dataset`).
+
+Example:
+    >>> for result in replay_files(['games.txt'], processes=4):
+    ...     if result.error:
+    ...         print(result)
+'''
+import functools
+import multiprocessing
+import re
+import sys
+
+from linesofaction import notation
+from linesofaction.movegen import Position
+from linesofaction.piece import Piece
+from linesofaction.rules import GameEndState
+
+_SHAPE_RE = re.compile(r'^\s*(\d+)x(\d+)\b', re.IGNORECASE)
+_SQUARE_RE = re.compile(r'[A-Za-z]+[0-9]+')
+
+_RESULTS = {
+    GameEndState.WIN1: Piece.BLACK.name.lower(),
+    GameEndState.WIN2: Piece.RED.name.lower(),
+    GameEndState.TIE: 'tie',
+}
+
+
+class ReplayResult:
+    r'''Outcome of replaying one game.
+
+    Attributes:
+        source (str): Name of the file the game comes from.
+        line (int): Line number of the game in the file (1-based).
+        plies (int): Number of legal moves replayed.
+        result (str): 'black', 'red', 'tie', or None if the game is unfinished.
+        error (str): Why the replay stopped, None if every move is legal.
+        move (str): The first illegal move as written in the file, if any.
+    '''
+    __slots__ = ('source', 'line', 'plies', 'result', 'error', 'move')
+
+    def __init__(self, source=None, line=None, plies=0, result=None, error=None, move=None):
+        self.source = source
+        self.line = line
+        self.plies = plies
+        self.result = result
+        self.error = error
+        self.move = move
+
+    def __reduce__(self):
+        return ReplayResult, (self.source, self.line, self.plies, self.result, self.error, self.move)
+
+    def __str__(self):
+        where = f'{self.source}:{self.line}'
+        if self.error is None:
+            return f'{where}: {self.plies} plies, result {self.result or "unfinished"}'
+        if self.move is None:
+            return f'{where}: {self.error}'
+        return f'{where}: ply {self.plies + 1}: {self.move}: {self.error}'
+
+    def __repr__(self):
+        return (f'ReplayResult(source={self.source!r}, line={self.line}, plies={self.plies}, '
+                f'result={self.result!r}, error={self.error!r}, move={self.move!r})')
+
+
+def parse_game(text):
+    '''Parses a game line into ((rows, cols), [(origin, target), ...]).
+
+    The squares of the moves are returned as written (e.g. ('B1', 'B3')); they
+    are converted while replaying, so that the first bad one can be reported.
+
+    Raises:
+        ValueError: If the squares do not pair up into moves.
+    '''
+    rows = cols = 8
+    match = _SHAPE_RE.match(text)
+    if match:
+        rows, cols = int(match.group(1)), int(match.group(2))
+        text = text[match.end():]
+    squares = _SQUARE_RE.findall(text)
+    if len(squares) % 2:
+        raise ValueError(f'Incomplete move: {squares[-1]}')
+    return (rows, cols), list(zip(squares[::2], squares[1::2]))
+
+
+def replay(moves, rows: int = 8, cols: int = 8, result=None):
+    '''Replays the moves from the initial position.
+
+    Args:
+        moves (list): Moves as pairs of squares in A1 notation, e.g. ('B1', 'B3').
+        rows (int): Number of rows of the board.
+        cols (int): Number of columns of the board.
+        result (ReplayResult): Result to fill in (a new one by default).
+
+    Returns:
+        ReplayResult
+    '''
+    result = result if result is not None else ReplayResult()
+    for _ in iter_replay(moves, rows, cols, result):
+        pass
+    return result
+
+
+def iter_replay(moves, rows: int = 8, cols: int = 8, result=None):
+    '''Replays the moves from the initial position, one step at a time.
+
+    This is the replay loop shared by everything that reads recorded games,
+    so they all accept and reject the same games.
+
+    Args:
+        moves (list): Moves as pairs of squares in A1 notation, e.g. ('B1', 'B3').
+        rows (int): Number of rows of the board.
+        cols (int): Number of columns of the board.
+        result (ReplayResult): Filled in as the replay goes: when the
+                               iteration ends, it holds the outcome (or the
+                               first illegal move in `error`).
+
+    Yields:
+        tuple: (position, (origin, target)) before every legal move, with the
+               move as squares of the position. The position is the replay's
+               own and is changed in place: copy what must outlive the step.
+               After the last step it holds the final position.
+    '''
+    result = result if result is not None else ReplayResult()
+    try:
+        position = _initial_position(rows, cols)
+    except ValueError as e:
+        result.error = str(e)
+        return
+    squares = _square_index(position.tables)
+    cells = position.cells
+    state = GameEndState.CONTINUE
+    for move in moves:
+        if state != GameEndState.CONTINUE:
+            result.move, result.error = '-'.join(move), 'The game is already over.'
+            break
+        origin = squares.get(move[0].upper())
+        target = squares.get(move[1].upper())
+        if origin is None or target is None:
+            result.move, result.error = '-'.join(move), 'The move is out of the board.'
+            break
+        if cells[origin] != position.player:
+            result.move = '-'.join(move)
+            result.error = f'No {position.player.name.lower()} piece on the origin.'
+            break
+        if not position.is_legal((origin, target)):
+            result.move, result.error = '-'.join(move), 'The move is not valid.'
+            break
+        yield position, (origin, target)
+        captured = position.make((origin, target))
+        result.plies += 1
+        # Only the mover can become connected, unless a capture connected the opponent
+        if position.is_connected(cells[target]) or (captured and position.is_connected(captured)):
+            state = position.game_state()
+        if state == GameEndState.CONTINUE and not position.has_move():
+            # Like GameEngine's default 'pass' rule: a player without a move passes
+            position.pass_turn()
+            if not position.has_move():
+                position.pass_turn()
+                state = GameEndState.TIE  # Neither player can move
+    result.result = _RESULTS.get(state)
+
+
+@functools.lru_cache(maxsize=None)
+def _square_index(tables):
+    '''Maps the A1 notation of every square of the shape to the square.'''
+    return {notation.square_to_str(*tables.position(square)): square
+            for square in range(tables.size)}
+
+
+@functools.lru_cache(maxsize=None)
+def _start_position(rows, cols):
+    return Position.initial(rows, cols)
+
+
+def _initial_position(rows, cols):
+    '''Returns a copy of the (cached) initial position of the shape.'''
+    return _start_position(rows, cols).copy()
+
+
+def replay_lines(lines, source='<stdin>', first_line=1):
+    '''Replays every game of the lines.
+
+    Args:
+        lines (iterable): Lines of a game file.
+        source (str): Name of the file, for the results.
+        first_line (int): Line number of the first line.
+
+    Yields:
+        ReplayResult: One per game, in order.
+    '''
+    for number, text in enumerate(lines, first_line):
+        text = text.strip()
+        if not text or text.startswith('#'):
+            continue
+        result = ReplayResult(source, number)
+        try:
+            (rows, cols), moves = parse_game(text)
+        except ValueError as e:
+            result.error = str(e)
+            yield result
+            continue
+        yield replay(moves, rows, cols, result)
+
+
+def _replay_chunk(chunk):
+    source, first_line, lines = chunk
+    return list(replay_lines(lines, source, first_line))
+
+
+def read_chunks(paths, chunk_lines: int = 2000):
+    '''Reads the files in chunks of lines.
+
+    Yields:
+        tuple: (source, first line number, lines) with at most `chunk_lines` lines.
+    '''
+    for path in paths:
+        if path == '-':
+            yield from _split(sys.stdin, '<stdin>', chunk_lines)
+        else:
+            with open(path) as stream:
+                yield from _split(stream, path, chunk_lines)
+
+
+def _split(stream, source, chunk_lines):
+    lines = []
+    first_line = 1
+    for number, line in enumerate(stream, 1):
+        lines.append(line)
+        if len(lines) >= chunk_lines:
+            yield source, first_line, lines
+            lines, first_line = [], number + 1
+    if lines:
+        yield source, first_line, lines
+
+
+def replay_files(paths, processes: int = None, chunk_lines: int = 2000):
+    '''Replays the games of the files in parallel.
+
+    The files are split into chunks of lines that are replayed by a pool of
+    processes; results are yielded in file and line order.
+
+    Args:
+        paths (list): Game files, '-' for stdin.
+        processes (int): Number of processes (default: CPU count). 1 replays
+                         in the calling process.
+        chunk_lines (int): Number of lines per work unit.
+
+    Yields:
+        ReplayResult: One per game.
+    '''
+    chunks = read_chunks(paths, chunk_lines)
+    if processes == 1:
+        for chunk in chunks:
+            yield from _replay_chunk(chunk)
+        return
+    with multiprocessing.Pool(processes) as pool:
+        for results in pool.imap(_replay_chunk, chunks):
+            yield from results
@@ -1,8 +1,8 @@
 from enum import Enum
-import numpy as np
 
 from linesofaction.piece import Piece
 from linesofaction import _utils
+from linesofaction.tables import get_tables
 
 
 class GameEndState(Enum):
@@ -70,8 +70,10 @@ class GameRules:
         # Checks that initial pieces are placed as per standard Lines of Action rules:
         # Player[0] on first and last rows (except corners),
         # Player[1] on first and last columns (except corners).
-        return ((board.board[[0, -1], 1:-1] == board.players[0]).all()
-            and (board.board[1:-1, [0, -1]] == board.players[1]).all()
+        return (all(board.peek(row, col) == board.players[0]
+                    for row in (0, -1) for col in range(1, board.cols - 1))
+            and all(board.peek(row, col) == board.players[1]
+                    for row in range(1, board.rows - 1) for col in (0, -1))
             and board.count(board.players[0]) == 2 * (board.cols - 2)
             and board.count(board.players[1]) == 2 * (board.rows - 2))
 
@@ -91,15 +93,14 @@ class GameRules:
         # For each orientation, count how many pieces are on that line
         # line_coords returns all coords along that line (including the position itself)
         for orient in 'hvda':
-            line = list(_utils.line_coords(board.board.shape, position, orient))
-            pieces = board.board[tuple(zip(*line))]
-            line_count = int((pieces != Piece.EMPTY).sum())
+            line = _utils.line_coords(board.shape, position, orient)
+            line_count = sum(board.peek(row, col) != Piece.EMPTY for row, col in line)
 
             # Assign the line_count to the appropriate directions:
             # h: east/west
             # v: north/south
-            # d: northeast/southwest (main diagonal)
-            # a: northwest/southeast (anti-diagonal)
+            # d: northwest/southeast (main diagonal, see _utils.line_coords)
+            # a: northeast/southwest (anti-diagonal)
             if orient == 'h':
                 num_pieces['e'] = line_count
                 num_pieces['w'] = line_count
@@ -107,17 +108,17 @@ class GameRules:
                 num_pieces['n'] = line_count
                 num_pieces['s'] = line_count
             elif orient == 'd':
-                num_pieces['ne'] = line_count
-                num_pieces['sw'] = line_count
-            elif orient == 'a':
                 num_pieces['nw'] = line_count
                 num_pieces['se'] = line_count
+            elif orient == 'a':
+                num_pieces['ne'] = line_count
+                num_pieces['sw'] = line_count
 
         # Now get all lines of sight including obstacles.
         # We include obstacles to ensure no jumping over enemy pieces.
         obstacle_positions = board.get_positions(~current_player)
         lines_of_sight = _utils.all_line_of_sight_coords(
-            board.board.shape,
+            board.shape,
             position,
             obstacle_positions,
             include_obstacles=True
@@ -144,6 +145,31 @@ class GameRules:
         # You can land on empty squares or opponent squares. Opponent squares represent captures.
         return valid_steps
 
+    def has_legal_move(self, board, player):
+        '''Checks if the player can move any piece, stopping at the first legal move found.
+
+        The rays of one piece are walked at a time (as in `Position.piece_moves`)
+        and the pieces on a line are only counted when a ray needs them, so
+        when the first piece can move this costs about one piece's moves.
+        '''
+        tables = get_tables(board.rows, board.cols)
+        cells = board.cells()
+        enemy = Piece(player).opposite()
+        counts = {}  # Line index -> number of pieces on it
+        for row, col in board.get_positions(player):
+            square = row * board.cols + col
+            rays = tables.rays[square]
+            for orientation, line in enumerate(tables.line_of[square]):
+                steps = counts.get(line)
+                if steps is None:
+                    steps = counts[line] = sum(1 for idx in tables.lines[line] if cells[idx])
+                for ray in (rays[2 * orientation], rays[2 * orientation + 1]):
+                    if len(ray) < steps or cells[ray[steps - 1]] == player:
+                        continue
+                    if all(cells[ray[idx]] != enemy for idx in range(steps - 1)):
+                        return True
+        return False
+
     # === Game Checks ===
     def is_game_over(self, board):
         '''Checks if the game is over and returns the game state.'''
@@ -0,0 +1,412 @@
+import time
+
+from linesofaction.movegen import Position
+from linesofaction.piece import Piece
+from linesofaction.rules import GameEndState
+
+# Scores are from the point of view of the player to move.
+kWin = 1_000_000
+kMaxPly = 1_000
+kInfinity = kWin + kMaxPly
+
+# Transposition table flags
+kExact, kLower, kUpper = 0, 1, 2
+
+# What happens to a player without a legal move (same values as `GameEngine.no_move`)
+kPass = 'pass'
+kLose = 'lose'
+
+
+class SearchStopped(Exception):
+    '''Raised inside the search when a limit is hit.'''
+
+
+def evaluate(position):
+    '''Static evaluation from the point of view of the player to move.
+
+    Lines of Action is won by concentrating the pieces, so the evaluation is
+    the difference of the average (Chebyshev) distance of the pieces to their
+    centre of mass, in hundredths of a square.
+    '''
+    me = position.player
+    return int(100 * (_spread(position, me.opposite()) - _spread(position, me)))
+
+
+def _spread(position, player):
+    squares = position.pieces[player]
+    if not squares:
+        return 0.0
+    cols = position.tables.cols
+    coords = [divmod(square, cols) for square in squares]
+    mean_row = sum(row for row, _ in coords) / len(coords)
+    mean_col = sum(col for _, col in coords) / len(coords)
+    return sum(max(abs(row - mean_row), abs(col - mean_col)) for row, col in coords) / len(coords)
+
+
+class SearchResult:
+    r'''Result of a search.
+
+    Attributes:
+        move (tuple): Best move as ((row, col), (row, col)), None if there is no legal move.
+        score (int): Score of the move for the player to move.
+        depth (int): Last completed depth.
+        nodes (int): Number of searched nodes.
+        elapsed (float): Search time in seconds.
+        pv (list): Principal variation, as moves in the same format as `move`.
+    '''
+    def __init__(self, move=None, score=0, depth=0, nodes=0, elapsed=0.0, pv=None):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.pv = pv if pv is not None else []
+
+    @property
+    def nps(self):
+        '''Nodes per second.'''
+        return int(self.nodes / self.elapsed) if self.elapsed > 0 else 0
+
+    def __repr__(self):
+        return (f'SearchResult(move={self.move}, score={self.score}, depth={self.depth}, '
+                f'nodes={self.nodes}, elapsed={self.elapsed:.3f})')
+
+
+class Searcher:
+    r'''Iterative deepening alpha-beta (negamax) search.
+
+    The searcher keeps its transposition table between searches, so a
+    long-lived searcher gets faster on related positions.
+
+    Args:
+        tt_size (int): Maximum number of transposition table entries. The
+                       table is cleared when it is full.
+        evaluate (callable): Static evaluation `evaluate(position) -> int`.
+        batch_evaluate (callable): Optional batched evaluation
+                                   `batch_evaluate(cells, players) -> [int, ...]`
+                                   (e.g. `NeuralEvaluator.evaluate_batch`). When
+                                   given, the leaves of every depth 1 node are
+                                   evaluated together, `batch_size` at a time.
+                                   A batch never spans several nodes, so it
+                                   holds at most one node's moves (about 30
+                                   to 40 on 8x8 boards).
+        batch_size (int): Maximum number of leaves per batch, only reached on large boards.
+        no_move (str): What happens to a player without a legal move inside the
+                       search: `kPass` (default) lets the opponent move again, and
+                       a position where neither player can move is a draw;
+                       `kLose` scores it as a loss. `GameEngine` sets its own rule.
+
+    Example:
+        >>> searcher = Searcher()
+        >>> result = searcher.search(Position.from_board(Board()), deadline=time.monotonic() + 1)
+        >>> result.move
+        ((0, 1), (2, 3))
+    '''
+    kCheckEvery = 256  # Nodes between two limit checks (a few milliseconds)
+
+    def __init__(self, tt_size: int = 1 << 20, evaluate=evaluate, batch_evaluate=None,
+                 batch_size: int = 128, no_move: str = kPass):
+        if no_move not in (kPass, kLose):
+            raise ValueError(f'Unknown no-move rule: {no_move!r}. Use {kPass!r} or {kLose!r}.')
+        self.no_move = no_move
+        self.tt_size = tt_size
+        self.evaluate = evaluate
+        self.batch_evaluate = batch_evaluate
+        self.batch_size = batch_size
+        self.tt = {}
+        self.nodes = 0
+        self._stop = False
+        self._deadline = None
+        self._node_limit = None
+        self._should_stop = None
+        self._next_check = 0
+        self._history = None  # Keys of the game's earlier positions, None to ignore repetitions
+        self._path = set()  # Keys of the positions on the searched line
+
+    def stop(self):
+        '''Asks a running search to stop as soon as possible (thread-safe).'''
+        self._stop = True
+
+    def clear(self):
+        '''Clears the transposition table.'''
+        self.tt.clear()
+
+    def search(self, position, depth: int = None, deadline: float = None,
+               node_limit: int = None, should_stop=None, on_info=None, history=None):
+        '''Searches the best move of the player to move.
+
+        The search always completes depth 1 (unless stopped), then deepens
+        until a limit is hit, and returns the best move of the deepest
+        (possibly partial) iteration.
+
+        Args:
+            position (Position or Board): Position to search. It is not modified.
+            depth (int): Maximum depth. None for no limit.
+            deadline (float): `time.monotonic()` by which the search must return.
+            node_limit (int): Maximum number of nodes.
+            should_stop (callable): Polled during the search; stop when it returns True.
+            on_info (callable): Called with a SearchResult after every completed depth.
+            history (iterable): Keys of the positions played so far in the game
+                                (e.g. `GameEngine.history`). When given, a move
+                                that repeats one of them, or a position of the
+                                searched line, scores as a draw (0). A set
+                                lookup per node, whatever the length of the game.
+
+        Returns:
+            SearchResult
+        '''
+        if not isinstance(position, Position):
+            position = Position.from_board(position)
+        position = position.copy()
+        self.nodes = 0
+        self._stop = False
+        self._deadline = deadline
+        self._node_limit = node_limit
+        self._should_stop = should_stop
+        self._next_check = self._check_interval()
+        self._history = frozenset(history) if history is not None else None
+        self._path = {position.key}
+        start = time.monotonic()
+
+        root_moves = position.moves()
+        result = SearchResult()
+        if not root_moves:
+            result.elapsed = time.monotonic() - start
+            return result
+        # Fall back to the first legal move if even depth 1 cannot complete
+        best_move, best_score, depth_done = root_moves[0], 0, 0
+        max_depth = depth if depth is not None else kMaxPly
+        for current_depth in range(1, max_depth + 1):
+            try:
+                best_move, best_score = self._search_root(position, root_moves, current_depth, best_move)
+            except SearchStopped as e:
+                if e.args:  # The partial iteration completed some root moves
+                    best_move, best_score = e.args
+                break
+            depth_done = current_depth
+            if on_info is not None:
+                on_info(self._result(position, best_move, best_score, depth_done, start))
+            if abs(best_score) >= kWin - kMaxPly:  # Forced win or loss found
+                break
+        return self._result(position, best_move, best_score, depth_done, start)
+
+    def _result(self, position, move, score, depth, start):
+        tables = position.tables
+        pv = self._principal_variation(position, move, depth)
+        return SearchResult(
+            move=(tables.position(move[0]), tables.position(move[1])),
+            score=score,
+            depth=depth,
+            nodes=self.nodes,
+            elapsed=time.monotonic() - start,
+            pv=[(tables.position(origin), tables.position(target)) for origin, target in pv],
+        )
+
+    def _principal_variation(self, position, move, depth):
+        pv = [move]
+        position = position.copy()
+        seen = {position.key}
+        position.make(move)
+        while len(pv) < depth:
+            entry = self.tt.get(position.key)
+            if entry is None or entry[3] is None or position.key in seen:
+                break
+            if entry[3] not in position.moves():
+                break
+            seen.add(position.key)
+            pv.append(entry[3])
+            position.make(entry[3])
+        return pv
+
+    def _check_interval(self):
+        next_check = self.nodes + self.kCheckEvery
+        if self._node_limit is not None:
+            next_check = min(next_check, self._node_limit)
+        return next_check
+
+    def _check_limits(self):
+        self._next_check = self._check_interval()
+        if self._stop:
+            return True
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            return True
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return True
+        if self._should_stop is not None and self._should_stop():
+            return True
+        return False
+
+    def _order(self, position, moves, first):
+        cells = position.cells
+        # Hash move first, then captures
+        moves.sort(key=lambda move: (move != first, not cells[move[1]]))
+        return moves
+
+    def _search_root(self, position, moves, depth, previous_best):
+        alpha, beta = -kInfinity, kInfinity
+        best_move, best_score = None, -kInfinity
+        for move in self._order(position, moves, previous_best):
+            try:
+                score = self._child_score(position, move, depth, -beta, -alpha, ply=0)
+            except SearchStopped:
+                raise SearchStopped(best_move, best_score) if best_move is not None else SearchStopped()
+            if score > best_score:
+                best_move, best_score = move, score
+            alpha = max(alpha, score)
+        self._store(position.key, depth, kExact, best_score, best_move, ply=0)
+        return best_move, best_score
+
+    def _is_repetition(self, key):
+        return self._history is not None and (key in self._history or key in self._path)
+
+    def _child_score(self, position, move, depth, alpha, beta, ply):
+        '''Plays the move and returns its score for the player who played it.'''
+        mover = position.player
+        captured = position.make(move)
+        try:
+            state = position.game_state()
+            if state == GameEndState.CONTINUE:
+                key = position.key
+                if self._history is None:
+                    return -self._negamax(position, depth - 1, alpha, beta, ply + 1)
+                if key in self._history or key in self._path:
+                    return 0  # Repetition: a draw
+                self._path.add(key)
+                try:
+                    return -self._negamax(position, depth - 1, alpha, beta, ply + 1)
+                finally:
+                    self._path.discard(key)
+            if state == GameEndState.TIE:
+                return 0
+            winner = Piece.BLACK if state == GameEndState.WIN1 else Piece.RED
+            return kWin - (ply + 1) if winner == mover else -(kWin - (ply + 1))
+        finally:
+            position.unmake(move, captured)
+
+    def _negamax(self, position, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes >= self._next_check and self._check_limits():
+            raise SearchStopped()
+        if depth <= 0:
+            return self.evaluate(position)
+
+        alpha_orig = alpha
+        entry = self.tt.get(position.key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, score, tt_move = entry
+            if entry_depth >= depth:
+                score = self._from_tt(score, ply)
+                if flag == kExact:
+                    return score
+                if flag == kLower:
+                    alpha = max(alpha, score)
+                elif flag == kUpper:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        moves = position.moves()
+        if not moves:
+            if self.no_move == kLose:
+                return -(kWin - ply)  # No legal move loses
+            return self._pass_score(position, depth, alpha, beta, ply)
+        best_move, best_score = None, -kInfinity
+        moves = self._order(position, moves, tt_move)
+        if depth == 1 and self.batch_evaluate is not None:
+            best_move, best_score = self._search_frontier(position, moves, alpha, beta, ply)
+        else:
+            for move in moves:
+                score = self._child_score(position, move, depth, -beta, -alpha, ply)
+                if score > best_score:
+                    best_move, best_score = move, score
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    break
+
+        if best_score <= alpha_orig:
+            flag = kUpper
+        elif best_score >= beta:
+            flag = kLower
+        else:
+            flag = kExact
+        self._store(position.key, depth, flag, best_score, best_move, ply)
+        return best_score
+
+    def _pass_score(self, position, depth, alpha, beta, ply):
+        '''Score of a node without moves when the player passes: the opponent moves again.'''
+        position.pass_turn()
+        try:
+            if not position.has_move():
+                return 0  # Neither player can move: a draw
+            return -self._negamax(position, depth - 1, -beta, -alpha, ply + 1)
+        finally:
+            position.pass_turn()
+
+    def _search_frontier(self, position, moves, alpha, beta, ply):
+        '''Scores the moves of a depth 1 node with batched leaf evaluations.
+
+        Same result as searching the children one by one: the moves are
+        scanned in the same order, a batch only evaluates some leaves that a
+        cutoff would have skipped. Batches are not gathered across sibling
+        nodes: most depth 1 nodes are cut off after a few leaves, so batching
+        the leaves of all the children of a depth 2 node evaluates several
+        times more leaves than the search needs, which costs more than the
+        larger batches save (measured with `benchmarks/neural_eval.py`).
+        '''
+        best_move, best_score = None, -kInfinity
+        for start in range(0, len(moves), self.batch_size):
+            batch = moves[start:start + self.batch_size]
+            scores = [0] * len(batch)
+            leaves, cells, players = [], [], []
+            mover = position.player
+            for idx, move in enumerate(batch):
+                captured = position.make(move)
+                try:
+                    state = position.game_state()
+                    if state == GameEndState.CONTINUE and self._is_repetition(position.key):
+                        pass  # A draw: the score stays 0
+                    elif state == GameEndState.CONTINUE:
+                        leaves.append(idx)
+                        cells.append(bytes(position.cells))
+                        players.append(position.player)
+                    elif state != GameEndState.TIE:
+                        winner = Piece.BLACK if state == GameEndState.WIN1 else Piece.RED
+                        scores[idx] = kWin - (ply + 1) if winner == mover else -(kWin - (ply + 1))
+                finally:
+                    position.unmake(move, captured)
+            self.nodes += len(leaves)
+            if self.nodes >= self._next_check and self._check_limits():
+                raise SearchStopped()
+            if leaves:
+                for idx, score in zip(leaves, self.batch_evaluate(cells, players)):
+                    scores[idx] = -score
+            for move, score in zip(batch, scores):
+                if score > best_score:
+                    best_move, best_score = move, score
+                alpha = max(alpha, score)
+                if alpha >= beta:
+                    return best_move, best_score
+        return best_move, best_score
+
+    def _store(self, key, depth, flag, score, move, ply):
+        if len(self.tt) >= self.tt_size:
+            self.tt.clear()
+        self.tt[key] = (depth, flag, self._to_tt(score, ply), move)
+
+    @staticmethod
+    def _to_tt(score, ply):
+        # Store mate scores relative to the node, not the root
+        if score >= kWin - kMaxPly:
+            return score + ply
+        if score <= -(kWin - kMaxPly):
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_tt(score, ply):
+        if score >= kWin - kMaxPly:
+            return score - ply
+        if score <= -(kWin - kMaxPly):
+            return score + ply
+        return score
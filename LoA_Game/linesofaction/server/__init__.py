@@ -0,0 +1,2 @@
+from .server import GameServer
+from .client import GameClient
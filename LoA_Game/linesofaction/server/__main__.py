@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+import logging
+
+from linesofaction.server.server import GameServer
+from linesofaction.server.workers import AIWorkerPool
+
+
+async def _serve(args):
+    pool = None
+    if args.ai_workers:
+        pool = await AIWorkerPool(num_workers=args.ai_workers).start()
+    server = GameServer(host=args.host, port=args.port, max_games=args.max_games, ai_pool=pool)
+    try:
+        await server.serve_forever()
+    finally:
+        if pool is not None:
+            await pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Lines of Action game server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--max-games', type=int, default=100_000)
+    parser.add_argument('--ai-workers', type=int, default=0,
+                        help='Number of search processes for the "ai" command (0 disables it).')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
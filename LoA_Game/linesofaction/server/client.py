@@ -0,0 +1,78 @@
+import asyncio
+import itertools
+
+from linesofaction.server import protocol
+
+
+class GameClient:
+    r'''Asyncio client of the game server.
+
+    Requests can be issued concurrently from many tasks over a single
+    connection; responses are matched to requests by their `id`. Messages
+    pushed by the server without an `id` are put on the `events` queue.
+
+    Example:
+        >>> client = await GameClient.connect('127.0.0.1', 5000)
+        >>> game = (await client.request('new'))['game']
+        >>> await client.request('move', game=game, **{'from': [0, 1], 'to': [2, 1]})
+        {'ok': True, 'player': 'red', 'winner': None, 'id': 2}
+        >>> await client.close()
+    '''
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self.events = asyncio.Queue()
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 5000):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _read_loop(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = protocol.decode_response(line)
+                future = self._pending.pop(message.get('id'), None)
+                if future is None:
+                    self.events.put_nowait(message)
+                elif not future.done():
+                    future.set_result(message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Connection closed.'))
+            self._pending.clear()
+
+    async def request(self, cmd, **kwargs):
+        '''Sends a request and waits for its response.
+
+        Returns:
+            dict: The response. `response['ok']` tells if the request succeeded.
+
+        Raises:
+            ConnectionError: If the connection is closed before the response arrives.
+        '''
+        if self._reader_task.done():
+            raise ConnectionError('Connection closed.')
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(protocol.encode({'id': request_id, 'cmd': cmd, **kwargs}))
+        await self._writer.drain()
+        return await future
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._reader_task
@@ -0,0 +1,174 @@
+r'''Load generator for the game server.
+
+Opens `--idle` games that are never touched again and plays `--active` games
+concurrently with random legal moves, spread over `--connections`
+connections. Every active game waits `--think` seconds (on average) between
+moves, like a human player would. Reports the request rate and the latency
+percentiles per command.
+
+Usage::
+
+    # Against a running server
+    python -m linesofaction.server.loadgen --port 5000
+    # Spawn a server subprocess on a free port
+    python -m linesofaction.server.loadgen --idle 10000 --active 1000 --duration 30
+'''
+import argparse
+import asyncio
+import collections
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from linesofaction.server.client import GameClient
+
+
+def percentile(sorted_values, q):
+    '''Returns the q-th percentile (0-100) of already sorted values.'''
+    if not sorted_values:
+        return float('nan')
+    idx = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class LoadGenerator:
+    r'''Plays random games against the server and records request latencies.
+
+    Args:
+        clients (list): Connected `GameClient`s to spread the games over.
+        think (float): Mean delay between two moves of an active game (seconds).
+        seed (int): Seed for the move choices.
+    '''
+    def __init__(self, clients, think: float = 1.0, seed: int = None):
+        self.clients = clients
+        self.think = think
+        self.rng = random.Random(seed)
+        self.latencies = collections.defaultdict(list)
+        self.errors = collections.Counter()
+        self.games_finished = 0
+
+    async def request(self, client, cmd, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(cmd, **kwargs)
+        self.latencies[cmd].append(time.perf_counter() - start)
+        if not response.get('ok'):
+            self.errors[cmd] += 1
+        return response
+
+    async def open_idle(self, num_games):
+        '''Opens games that are left idle.'''
+        batch = []
+        for idx in range(num_games):
+            client = self.clients[idx % len(self.clients)]
+            batch.append(client.request('new'))
+            if len(batch) >= 1000:
+                await asyncio.gather(*batch)
+                batch = []
+        await asyncio.gather(*batch)
+
+    async def play(self, client, stop_time):
+        '''Plays random games on one client until `stop_time`.'''
+        game = (await self.request(client, 'new'))['game']
+        # Spread the start of the games over one think period
+        await asyncio.sleep(self.rng.uniform(0, self.think))
+        while time.monotonic() < stop_time:
+            pieces = (await self.request(client, 'pieces', game=game))['pieces']
+            self.rng.shuffle(pieces)
+            for piece in pieces:
+                moves = (await self.request(client, 'select', game=game, pos=piece)).get('moves')
+                if moves:
+                    break
+            else:
+                break  # No legal move, give up on this game
+            response = await self.request(client, 'move', game=game, to=self.rng.choice(moves))
+            if response.get('winner') is not None:
+                self.games_finished += 1
+                await self.request(client, 'close', game=game)
+                game = (await self.request(client, 'new'))['game']
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think)
+        await self.request(client, 'close', game=game)
+
+    async def run(self, idle: int, active: int, duration: float):
+        await self.open_idle(idle)
+        stop_time = time.monotonic() + duration
+        await asyncio.gather(*[
+            self.play(self.clients[idx % len(self.clients)], stop_time)
+            for idx in range(active)
+        ])
+
+    def report(self, elapsed):
+        lines = [f'{"command":>8} {"count":>8} {"rate/s":>8} {"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"max ms":>8} {"errors":>7}']
+        for cmd, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            lines.append(
+                f'{cmd:>8} {len(values):>8} {len(values) / elapsed:>8.0f}'
+                + ''.join(f' {percentile(values, q) * 1e3:>8.2f}' for q in (50, 90, 99))
+                + f' {values[-1] * 1e3:>8.2f} {self.errors[cmd]:>7}')
+        lines.append(f'games finished: {self.games_finished}')
+        return '\n'.join(lines)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def _connect(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await GameClient.connect(host, port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def _main(args):
+    clients = [await _connect(args.host, args.port) for _ in range(args.connections)]
+    generator = LoadGenerator(clients, think=args.think, seed=args.seed)
+    start = time.perf_counter()
+    await generator.run(args.idle, args.active, args.duration)
+    elapsed = time.perf_counter() - start
+    ping = await clients[0].request('ping')
+    for client in clients:
+        await client.close()
+    print(generator.report(elapsed))
+    print(f'open games on server: {ping["games"]}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load generator for the Lines of Action server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None,
+                        help='Server port. If omitted, a server subprocess is spawned.')
+    parser.add_argument('--idle', type=int, default=10_000, help='Number of idle games.')
+    parser.add_argument('--active', type=int, default=1_000, help='Number of active games.')
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--think', type=float, default=1.0,
+                        help='Mean delay between two moves of an active game (seconds).')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to play.')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.port is None:
+        args.port = _free_port()
+        process = subprocess.Popen([
+            sys.executable, '-m', 'linesofaction.server',
+            '--host', args.host, '--port', str(args.port),
+            '--max-games', str(2 * (args.idle + args.active)),
+        ])
+    try:
+        asyncio.run(_main(args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+r'''Wire protocol of the game server.
+
+Every message is a single line of compact JSON. Requests carry a `cmd` and an
+optional `id` that is echoed back in the response::
+
+    -> {"id": 1, "cmd": "new", "rows": 8, "cols": 8}
+    <- {"id": 1, "ok": true, "game": 0, "player": "black", "board": ".bbbbbb./r......r/..."}
+    -> {"id": 2, "cmd": "move", "game": 0, "from": [0, 1], "to": [2, 1]}
+    <- {"id": 2, "ok": true, "player": "red", "winner": null}
+    -> {"id": 3, "cmd": "move", "game": 0, "from": [0, 2], "to": [5, 5]}
+    <- {"id": 3, "ok": false, "error": "The position is not your piece."}
+
+Positions are [row, col] pairs, zero-based. Boards are rows of piece
+characters (see `Piece.char`) joined with '/'.
+'''
+import json
+
+from linesofaction.notation import board_to_str, str_to_rows  # noqa: F401 (re-exported)
+from linesofaction.piece import Piece
+
+
+class ProtocolError(ValueError):
+    '''Raised when a request cannot be parsed or is missing arguments.'''
+
+
+def encode(message):
+    '''Encodes a message as a JSON line (bytes).'''
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+def decode(line):
+    '''Decodes a JSON line into a request dict.
+
+    Raises:
+        ProtocolError: If the line is not a JSON object with a `cmd`.
+    '''
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        raise ProtocolError(f'Malformed message: {e}') from None
+    if not isinstance(message, dict) or not isinstance(message.get('cmd'), str):
+        raise ProtocolError('Message must be an object with a "cmd".')
+    return message
+
+
+def decode_response(line):
+    '''Decodes a JSON line sent by the server.'''
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ProtocolError('Message must be an object.')
+    return message
+
+
+def position(message, key, shape):
+    '''Extracts a (row, col) position within the board shape from the message.'''
+    value = message.get(key)
+    if (not isinstance(value, (list, tuple)) or len(value) != 2
+            or not all(isinstance(v, int) for v in value)):
+        raise ProtocolError(f'"{key}" must be a [row, col] pair.')
+    if not (0 <= value[0] < shape[0] and 0 <= value[1] < shape[1]):
+        raise ProtocolError(f'"{key}" is out of the board.')
+    return tuple(value)
+
+
+def player_name(player):
+    '''Converts a Piece (or the "TIE" marker / None) to its wire name.'''
+    if player is None:
+        return None
+    if isinstance(player, Piece):
+        return player.name.lower()
+    return str(player).lower()
@@ -0,0 +1,334 @@
+import asyncio
+import contextvars
+import logging
+
+from linesofaction.board import Board
+from linesofaction.engine import GameEngine
+from linesofaction.server import protocol
+from linesofaction.server.spectators import GameChannel
+
+logger = logging.getLogger(__name__)
+
+# (writer, subscriptions) of the connection whose request is being handled
+_connection = contextvars.ContextVar('connection', default=None)
+
+
+class GameServer:
+    r'''Asyncio TCP server hosting many concurrent games.
+
+    Every game is a `GameEngine`. Clients talk the line-based JSON protocol
+    described in `linesofaction.server.protocol`; a client may play any number
+    of games, and games outlive the connection that created them (until they
+    are closed or the server stops).
+
+    All game commands are executed inline on the event loop: a move costs a
+    single piece's move generation plus the win check, which is well below a
+    millisecond on 8x8 boards, so no request holds the loop for long.
+
+    Connections may also "watch" games: see `linesofaction.server.spectators`.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 to pick a free one.
+        max_games (int): Maximum number of open games.
+        max_board_size (int): Maximum number of rows/cols of a new game.
+        ai_pool (AIWorkerPool): Started worker pool serving the "ai" command.
+                                Without one, the "ai" command is disabled.
+        max_ai_budget (float): Maximum search time of an "ai" request (seconds).
+        max_pending (int): Number of updates queued for a slow spectator before
+                           they are replaced by a snapshot.
+
+    Example:
+        >>> server = GameServer(port=0)
+        >>> await server.start()
+        >>> server.port
+        54321
+    '''
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 max_games: int = 100_000, max_board_size: int = 26,
+                 ai_pool=None, max_ai_budget: float = 10.0, max_pending: int = 64):
+        self.host = host
+        self.port = port
+        self.max_games = max_games
+        self.max_board_size = max_board_size
+        self.ai_pool = ai_pool
+        self.max_ai_budget = max_ai_budget
+        self.max_pending = max_pending
+        self.games = {}
+        self.plies = {}  # Number of moves played per game
+        self.channels = {}  # Spectated games
+        self._thinking = set()  # Games with a running "ai" request
+        self._next_game_id = 0
+        self._server = None
+        self._writers = set()
+
+    # ===== Lifecycle =====
+    async def start(self):
+        '''Starts listening. Sets `self.port` to the bound port.'''
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info('Listening on %s:%d', self.host, self.port)
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # ===== Connections =====
+    async def _handle_client(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        logger.debug('Client connected: %s', peer)
+        self._writers.add(writer)
+        pending = set()  # Long-running requests (e.g. AI moves) of this client
+        subscriptions = {}  # Watched games of this client
+        _connection.set((writer, subscriptions))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request_id, response = self._begin(line)
+                if asyncio.iscoroutine(response):
+                    # Keep reading while it runs, so a disconnect cancels it
+                    task = asyncio.create_task(self._reply(writer, line, request_id, response))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                    continue
+                writer.write(protocol.encode(self._response(request_id, response)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            logger.debug('Client disconnected: %s', peer)
+            for task in pending:
+                task.cancel()
+            for subscriber in subscriptions.values():
+                subscriber.close()
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _reply(self, writer, line, request_id, response):
+        response = await self._finish(line, response)
+        if not writer.is_closing():
+            writer.write(protocol.encode(self._response(request_id, response)))
+            await writer.drain()
+
+    async def handle_line(self, line):
+        '''Decodes and dispatches a single request line, returning the response dict.'''
+        request_id, response = self._begin(line)
+        if asyncio.iscoroutine(response):
+            response = await self._finish(line, response)
+        return self._response(request_id, response)
+
+    def _begin(self, line):
+        '''Starts a request. Returns (request id, response dict or coroutine).'''
+        request_id = None
+        try:
+            request = protocol.decode(line)
+            request_id = request.get('id')
+            return request_id, self.dispatch(request)
+        except Exception as e:
+            return request_id, self._error(e, line)
+
+    async def _finish(self, line, response):
+        try:
+            return await response
+        except Exception as e:
+            return self._error(e, line)
+
+    @staticmethod
+    def _error(error, line):
+        if isinstance(error, ValueError):  # Includes ProtocolError
+            return {'ok': False, 'error': str(error)}
+        if isinstance(error, asyncio.TimeoutError):
+            return {'ok': False, 'error': 'Timed out.'}
+        logger.error('Request failed: %r', line, exc_info=error)
+        return {'ok': False, 'error': 'Internal error.'}
+
+    @staticmethod
+    def _response(request_id, response):
+        response.setdefault('ok', True)
+        if request_id is not None:
+            response['id'] = request_id
+        return response
+
+    def dispatch(self, request):
+        '''Runs the command of the request.
+
+        Returns:
+            dict or coroutine: The response (or a coroutine producing it).
+
+        Raises:
+            ProtocolError: If the command is unknown.
+        '''
+        handler = getattr(self, f'cmd_{request["cmd"]}', None)
+        if handler is None:
+            raise protocol.ProtocolError(f'Unknown command: {request["cmd"]}')
+        return handler(request)
+
+    def _game(self, request):
+        game_id = request.get('game')
+        if not isinstance(game_id, int) or game_id not in self.games:
+            raise ValueError(f'Unknown game: {game_id}')
+        return self.games[game_id]
+
+    def _play(self, game_id, engine, origin, target):
+        '''Moves the selected piece of the engine and notifies the spectators.'''
+        piece = engine.board.peek(*origin)
+        captured = engine.board.peek(*target)
+        engine.move(target)
+        self.plies[game_id] += 1
+        channel = self.channels.get(game_id)
+        if channel is not None:
+            channel.publish_move(origin, target, piece, captured)
+
+    # ===== Commands =====
+    def cmd_new(self, request):
+        '''Creates a new game. Optional "rows" and "cols" (default 8).'''
+        rows = request.get('rows', 8)
+        cols = request.get('cols', 8)
+        if not (isinstance(rows, int) and isinstance(cols, int)
+                and rows <= self.max_board_size and cols <= self.max_board_size):
+            raise protocol.ProtocolError(f'Board size must be at most {self.max_board_size}.')
+        if len(self.games) >= self.max_games:
+            raise ValueError('Too many open games.')
+        game_id = self._next_game_id
+        self._next_game_id += 1
+        self.games[game_id] = GameEngine(board=Board(rows=rows, cols=cols))
+        self.plies[game_id] = 0
+        response = self.cmd_state({'game': game_id})
+        response['game'] = game_id
+        return response
+
+    def cmd_state(self, request):
+        '''Returns the board, the player to move and the winner.'''
+        engine = self._game(request)
+        return {
+            'board': protocol.board_to_str(engine.board),
+            'player': protocol.player_name(engine.current_player),
+            'winner': protocol.player_name(engine.winner),
+        }
+
+    def cmd_pieces(self, request):
+        '''Returns the positions of the pieces of the player to move.'''
+        engine = self._game(request)
+        return {'pieces': [list(position) for position in engine.get_positions()]}
+
+    def cmd_select(self, request):
+        '''Selects a piece of the player to move and returns its valid moves.'''
+        engine = self._game(request)
+        engine.select(protocol.position(request, 'pos', engine.board.shape), player=True, reset=False)
+        return {'moves': sorted(list(move) for move in engine.get_valid_moves())}
+
+    def cmd_move(self, request):
+        '''Moves a piece. "from" selects the piece, else the selected piece is moved.'''
+        engine = self._game(request)
+        if engine.winner is not None:
+            raise ValueError('The game is over.')
+        if request['game'] in self._thinking:
+            raise ValueError('The computer is thinking.')
+        if 'from' in request:
+            engine.select(protocol.position(request, 'from', engine.board.shape), player=True, reset=False)
+        target = protocol.position(request, 'to', engine.board.shape)
+        origin = engine.selected['position']
+        if origin is None:
+            raise ValueError('No piece selected.')
+        self._play(request['game'], engine, origin, target)
+        return {
+            'player': protocol.player_name(engine.current_player),
+            'winner': protocol.player_name(engine.winner),
+        }
+
+    async def cmd_ai(self, request):
+        '''Lets the computer search a move for the player to move.
+
+        Optional "budget" (search seconds, default 1) and "play" (default true:
+        play the move, else only return it). The search runs in the worker
+        pool; it is cancelled if the client disconnects.
+        '''
+        if self.ai_pool is None:
+            raise ValueError('The computer player is not available.')
+        engine = self._game(request)
+        game_id = request['game']
+        if engine.winner is not None:
+            raise ValueError('The game is over.')
+        if game_id in self._thinking:
+            raise ValueError('The computer is already thinking.')
+        budget = request.get('budget', 1.0)
+        if not isinstance(budget, (int, float)) or not 0 < budget <= self.max_ai_budget:
+            raise protocol.ProtocolError(f'"budget" must be in (0, {self.max_ai_budget}].')
+        play = request.get('play', True)
+
+        self._thinking.add(game_id)
+        try:
+            result = await self.ai_pool.suggest(engine.board, engine.current_player, budget=budget)
+        finally:
+            self._thinking.discard(game_id)
+        if result.move is None:
+            raise ValueError('No legal move.')
+        response = {
+            'move': [list(result.move[0]), list(result.move[1])],
+            'score': result.score,
+            'depth': result.depth,
+            'nodes': result.nodes,
+        }
+        if play and self.games.get(game_id) is engine:
+            engine.select(result.move[0], player=True, reset=False)
+            self._play(game_id, engine, result.move[0], result.move[1])
+            response['player'] = protocol.player_name(engine.current_player)
+            response['winner'] = protocol.player_name(engine.winner)
+        return response
+
+    def cmd_watch(self, request):
+        '''Subscribes the connection to the updates of a game.
+
+        The response is followed by a "snapshot" event, then one "move" event
+        per move played in the game.
+        '''
+        engine = self._game(request)
+        game_id = request['game']
+        connection = _connection.get()
+        if connection is None:
+            raise ValueError('Watching needs a connection.')
+        writer, subscriptions = connection
+        if game_id not in subscriptions:
+            channel = self.channels.get(game_id)
+            if channel is None:
+                channel = GameChannel(game_id, engine, ply=self.plies[game_id],
+                                      max_pending=self.max_pending)
+                self.channels[game_id] = channel
+            subscriptions[game_id] = channel.subscribe(writer)
+        return {'spectators': len(self.channels[game_id].subscribers)}
+
+    def cmd_unwatch(self, request):
+        '''Unsubscribes the connection from the updates of a game.'''
+        connection = _connection.get()
+        subscriber = connection[1].pop(request.get('game'), None) if connection else None
+        if subscriber is None:
+            raise ValueError(f'Not watching game: {request.get("game")}')
+        subscriber.close()
+        return {}
+
+    def cmd_close(self, request):
+        '''Closes a game.'''
+        self._game(request)
+        game_id = request['game']
+        del self.games[game_id]
+        del self.plies[game_id]
+        channel = self.channels.pop(game_id, None)
+        if channel is not None:
+            channel.close()
+        return {}
+
+    def cmd_ping(self, request):
+        return {'games': len(self.games)}
@@ -0,0 +1,162 @@
+r'''Spectator fan-out of game updates.
+
+Spectators of a game receive a snapshot when they join, then one small delta
+event per move::
+
+    {"event": "snapshot", "game": 0, "ply": 12, "board": "...", "player": "red", "winner": null, "hash": "..."}
+    {"event": "move", "game": 0, "ply": 13, "from": [0, 1], "to": [2, 1], "capture": false,
+     "hash": "...", "player": "black", "passed": null, "winner": null}
+
+"passed" names the player who had no legal move and had to pass after the
+move; "player" is then the mover again.
+
+A move is encoded once and the same bytes are queued to every spectator.
+Every spectator has a bounded queue drained by its own writer task; when a slow
+spectator's queue overflows, its queued deltas are dropped and it is sent a
+fresh snapshot instead once it catches up.
+'''
+import asyncio
+import collections
+
+from linesofaction.piece import Piece
+from linesofaction.server import protocol
+from linesofaction.zobrist import Zobrist
+
+
+class Subscriber:
+    r'''A spectator of a game channel.
+
+    Attributes:
+        pending (deque): Encoded events waiting to be written.
+        resync (bool): If True, a snapshot is written before any further delta.
+        dropped (int): Number of times the queue overflowed.
+    '''
+    __slots__ = ('channel', 'writer', 'pending', 'max_pending', 'resync', 'dropped',
+                 '_wakeup', '_task')
+
+    def __init__(self, channel, writer, max_pending):
+        self.channel = channel
+        self.writer = writer
+        self.pending = collections.deque()
+        self.max_pending = max_pending
+        self.resync = True  # Late joiners start with a snapshot
+        self.dropped = 0
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    def push(self, data):
+        '''Queues an encoded event (never blocks).'''
+        if not self.resync:
+            if len(self.pending) >= self.max_pending:
+                # Too slow: drop the backlog, catch up with a snapshot instead
+                self.pending.clear()
+                self.resync = True
+                self.dropped += 1
+            else:
+                self.pending.append(data)
+        self._wakeup.set()
+
+    async def _run(self):
+        writer = self.writer
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                if self.resync:
+                    self.resync = False
+                    writer.write(self.channel.snapshot())
+                while self.pending:
+                    writer.write(self.pending.popleft())
+                if writer.is_closing():
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.channel.subscribers.discard(self)
+
+    def close(self):
+        self._task.cancel()
+        self.channel.subscribers.discard(self)
+
+
+class GameChannel:
+    r'''Fan-out of the updates of one game to its spectators.
+
+    Args:
+        game_id (int): Id of the game.
+        engine (GameEngine): The game.
+        ply (int): Number of moves played so far.
+        max_pending (int): Queue length of a spectator before it is resynced.
+    '''
+    def __init__(self, game_id, engine, ply: int = 0, max_pending: int = 64):
+        self.game_id = game_id
+        self.engine = engine
+        self.ply = ply
+        self.max_pending = max_pending
+        self.subscribers = set()
+        self._zobrist = Zobrist(engine.board.rows, engine.board.cols)
+        self.key = self._zobrist.hash(engine.board, engine.current_player)
+        self._snapshot = None
+
+    def subscribe(self, writer):
+        '''Adds a spectator writing to the StreamWriter. It starts with a snapshot.'''
+        subscriber = Subscriber(self, writer, self.max_pending)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def snapshot(self):
+        '''Returns the encoded snapshot of the current position (cached per ply).'''
+        if self._snapshot is None:
+            engine = self.engine
+            self._snapshot = protocol.encode({
+                'event': 'snapshot',
+                'game': self.game_id,
+                'ply': self.ply,
+                'board': protocol.board_to_str(engine.board),
+                'player': protocol.player_name(engine.current_player),
+                'winner': protocol.player_name(engine.winner),
+                'hash': f'{self.key:016x}',
+            })
+        return self._snapshot
+
+    def publish_move(self, origin, target, piece, captured=Piece.EMPTY):
+        '''Broadcasts a move that was just played on the engine.
+
+        Args:
+            origin (tuple): Position the piece moved from.
+            target (tuple): Position the piece moved to.
+            piece (Piece): The moved piece.
+            captured (Piece): The captured piece, Piece.EMPTY if none.
+        '''
+        engine = self.engine
+        self.ply += 1
+        self.key ^= self._zobrist.move_delta(origin, target, piece, captured)
+        if engine.current_player == piece:
+            # The turn did not change hands (the opponent passed or the game is over)
+            self.key ^= self._zobrist.side
+        self._snapshot = None
+        data = protocol.encode({
+            'event': 'move',
+            'game': self.game_id,
+            'ply': self.ply,
+            'from': list(origin),
+            'to': list(target),
+            'capture': captured != Piece.EMPTY,
+            'hash': f'{self.key:016x}',
+            'player': protocol.player_name(engine.current_player),
+            'passed': protocol.player_name(engine.passed),
+            'winner': protocol.player_name(engine.winner),
+        })
+        for subscriber in self.subscribers:
+            subscriber.push(data)
+        return data
+
+    def close(self):
+        '''Notifies the spectators that the game is closed and unsubscribes them.'''
+        data = protocol.encode({'event': 'closed', 'game': self.game_id})
+        for subscriber in list(self.subscribers):
+            if not subscriber.writer.is_closing():
+                subscriber.writer.write(data)
+            subscriber.close()
@@ -0,0 +1,277 @@
+r'''Pool of search worker processes for the game server.
+
+Searches are CPU-bound, so the server never runs them on the event loop.
+`AIWorkerPool` keeps persistent worker processes that load the board tables
+of the configured shapes at start-up (and keep their transposition tables
+between requests), and schedules requests on them earliest-deadline-first.
+'''
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import multiprocessing
+import time
+
+from linesofaction import codec
+from linesofaction.movegen import Position
+from linesofaction.search import SearchResult
+
+
+def _worker_main(conn, cancelled, shapes):
+    '''Entry point of a worker process.
+
+    Requests are (request id, rows, cols, packed position, budget, deadline);
+    the deadline is a `time.time()` timestamp since workers do not share the
+    server's monotonic clock. `cancelled` holds the id of a cancelled request.
+    '''
+    from linesofaction.search import Searcher
+    from linesofaction.tables import get_tables
+
+    for rows, cols in shapes:
+        get_tables(rows, cols)
+    searchers = {}
+    conn.send('ready')
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        request_id, rows, cols, packed, budget, deadline = message
+        board, player = codec.decode(packed, rows, cols)
+        searcher = searchers.setdefault((rows, cols), Searcher())
+        # Convert the wall-clock deadline to this process' monotonic clock
+        now = time.time()
+        limit = min(now + budget, deadline) if deadline is not None else now + budget
+        result = searcher.search(
+            Position.from_board(board, player),
+            deadline=time.monotonic() + max(0.0, limit - now),
+            should_stop=lambda: cancelled.value == request_id,
+        )
+        conn.send((request_id, result.move, result.score, result.depth,
+                   result.nodes, result.elapsed, result.pv))
+
+
+class _Request:
+    __slots__ = ('request_id', 'deadline', 'message', 'future', 'cancelled', 'dispatched')
+
+    def __init__(self, request_id, deadline, message, future):
+        self.request_id = request_id
+        self.deadline = deadline
+        self.message = message
+        self.future = future
+        self.cancelled = False
+        self.dispatched = False
+
+    def __lt__(self, other):
+        return (self.deadline, self.request_id) < (other.deadline, other.request_id)
+
+
+class _Worker:
+    __slots__ = ('process', 'conn', 'cancelled', 'request')
+
+    def __init__(self, process, conn, cancelled):
+        self.process = process
+        self.conn = conn
+        self.cancelled = cancelled
+        self.request = None
+
+
+class AIWorkerPool:
+    r'''Pool of pre-warmed search processes with deadline-aware queuing.
+
+    Requests wait in a queue ordered by deadline and are handed to the next
+    idle worker. A request whose deadline passes while it is still queued fails
+    with `asyncio.TimeoutError`. Cancelling the awaiting task removes a queued
+    request, or stops the search of a running one. A worker that dies is
+    dropped from the pool; once none is left, requests fail with ConnectionError.
+
+    Args:
+        num_workers (int): Number of worker processes (default: CPU count).
+        shapes (tuple): Board shapes whose tables are loaded at start-up.
+        start_method (str): multiprocessing start method.
+
+    Example:
+        >>> pool = await AIWorkerPool(num_workers=2).start()
+        >>> result = await pool.suggest(board, Piece.BLACK, budget=0.5)
+        >>> result.move
+        ((0, 2), (2, 2))
+        >>> await pool.close()
+    '''
+    def __init__(self, num_workers: int = None, shapes=((8, 8),), start_method: str = 'spawn'):
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.shapes = tuple(shapes)
+        self._context = multiprocessing.get_context(start_method)
+        self._workers = []
+        self._idle = []
+        self._queue = []
+        self._ids = itertools.count(1)
+        # One thread per worker waits for its results, off the event loop
+        self._executor = None
+        self._reader_tasks = []
+
+    async def start(self):
+        '''Starts the workers and waits until they have loaded their tables.'''
+        from linesofaction.tables import get_tables
+        loop = asyncio.get_running_loop()
+        for rows, cols in self.shapes:
+            get_tables(rows, cols)  # Fills the tables cache, so workers only load them
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.num_workers, thread_name_prefix='ai-pool')
+        for _ in range(self.num_workers):
+            parent_conn, child_conn = self._context.Pipe()
+            cancelled = self._context.Value('q', 0, lock=False)
+            process = self._context.Process(
+                target=_worker_main, args=(child_conn, cancelled, self.shapes), daemon=True)
+            process.start()
+            child_conn.close()
+            self._workers.append(_Worker(process, parent_conn, cancelled))
+        for worker in self._workers:
+            ready = await loop.run_in_executor(self._executor, worker.conn.recv)
+            assert ready == 'ready', ready
+            self._idle.append(worker)
+            self._reader_tasks.append(loop.create_task(self._read_results(worker)))
+        return self
+
+    async def close(self):
+        '''Stops the workers. Pending requests fail with ConnectionError.'''
+        for request in self._queue:
+            if not request.future.done():
+                request.future.set_exception(ConnectionError('Worker pool closed.'))
+        self._queue.clear()
+        for worker in self._workers:
+            if worker.request is not None:
+                worker.cancelled.value = worker.request.request_id
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for task in self._reader_tasks:
+            task.cancel()
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._workers.clear()
+        self._idle.clear()
+        self._reader_tasks.clear()
+
+    @property
+    def queued(self):
+        '''Number of requests waiting for a worker.'''
+        return sum(1 for request in self._queue if not request.cancelled)
+
+    @property
+    def busy(self):
+        '''Number of workers running a search.'''
+        return len(self._workers) - len(self._idle)
+
+    async def suggest(self, board, player, budget: float = 1.0, deadline: float = None):
+        '''Searches a move for the player on a worker.
+
+        Args:
+            board (Board): Position to search.
+            player (Piece): Player to move.
+            budget (float): Search time in seconds, once a worker picks the request up.
+            deadline (float): `time.monotonic()` by which the result is needed,
+                              including the time spent queuing. Defaults to
+                              now + budget + 1 second.
+
+        Returns:
+            SearchResult
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes before a worker is free.
+        '''
+        if not self._workers:
+            raise RuntimeError('The worker pool is not started.')
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = time.monotonic() + budget + 1.0
+        request_id = next(self._ids)
+        message = [request_id, board.rows, board.cols, codec.encode(board, player), budget, None]
+        request = _Request(request_id, deadline, message, loop.create_future())
+        heapq.heappush(self._queue, request)
+        expire = loop.call_later(max(0.0, deadline - time.monotonic()), self._expire, request)
+        self._dispatch()
+        try:
+            return await request.future
+        except asyncio.CancelledError:
+            self._cancel(request)
+            raise
+        finally:
+            expire.cancel()
+
+    def _expire(self, request):
+        # Running requests are stopped by the worker itself at the deadline
+        if not request.dispatched and not request.future.done():
+            request.cancelled = True
+            request.future.set_exception(asyncio.TimeoutError('Deadline passed while queued.'))
+
+    def _cancel(self, request):
+        request.cancelled = True
+        for worker in self._workers:
+            if worker.request is request:
+                worker.cancelled.value = request.request_id
+
+    def _dispatch(self):
+        now = time.monotonic()
+        while self._idle and self._queue:
+            request = heapq.heappop(self._queue)
+            if request.cancelled or request.future.done():
+                continue
+            if request.deadline <= now:
+                request.future.set_exception(asyncio.TimeoutError('Deadline passed while queued.'))
+                continue
+            worker = self._idle.pop()
+            worker.request = request
+            request.dispatched = True
+            # Translate the monotonic deadline to wall-clock time for the worker
+            request.message[5] = time.time() + (request.deadline - now)
+            try:
+                worker.conn.send(tuple(request.message))
+            except OSError:
+                # The worker died while idle: hand the request to the next one
+                worker.request = None
+                request.dispatched = False
+                heapq.heappush(self._queue, request)
+                self._drop(worker)
+
+    async def _read_results(self, worker):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                message = await loop.run_in_executor(self._executor, worker.conn.recv)
+            except (EOFError, OSError):
+                request = worker.request
+                if request is not None and not request.future.done():
+                    request.future.set_exception(ConnectionError('Worker died.'))
+                self._drop(worker)
+                return
+            request_id, move, score, depth, nodes, elapsed, pv = message
+            request, worker.request = worker.request, None
+            self._idle.append(worker)
+            if request is not None and request.request_id == request_id and not request.future.done():
+                request.future.set_result(SearchResult(move, score, depth, nodes, elapsed, pv))
+            self._dispatch()
+
+    def _drop(self, worker):
+        '''Removes a dead worker. Queued requests fail once no worker is left.'''
+        if worker in self._idle:
+            self._idle.remove(worker)
+        if worker not in self._workers:
+            return
+        self._workers.remove(worker)
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join(timeout=1)
+        worker.conn.close()
+        if not self._workers:
+            for request in self._queue:
+                if not request.future.done():
+                    request.future.set_exception(ConnectionError('All workers died.'))
+            self._queue.clear()
@@ -0,0 +1,191 @@
+r'''Storage backends of the cells of a `Board`.
+
+A board stores one integer (a `Piece` value) per cell. Two backends exist:
+
+* `ListStorage`: a flat Python list in row-major order. Reading or writing a
+  single cell is a list index, with none of the per-call overhead of NumPy,
+  and it does not need NumPy at all. This is the fast choice for the board
+  sizes that are actually played.
+* `NumpyStorage`: a 2D NumPy array. Slower per cell, but whole-board and
+  batched operations (masks, slicing, encoding many boards) are vectorized.
+
+`make_storage` picks the backend from the number of cells of the board.
+The threshold comes from `benchmarks/board_backends.py`.
+'''
+
+# Boards with at most this many cells use the list backend by default
+kMaxListCells = 256
+
+
+class ListStorage:
+    r'''Cells of a board in a flat, row-major Python list.
+
+    Args:
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+        fill (int): Initial value of every cell.
+    '''
+    __slots__ = ('rows', 'cols', 'cells', '_frozen')
+    name = 'list'
+
+    def __init__(self, rows: int, cols: int, fill: int = 0):
+        self.rows = rows
+        self.cols = cols
+        self.cells = [int(fill)] * (rows * cols)
+        self._frozen = None  # Bytes of the cells, until the next write
+
+    def _index(self, row, col):
+        # Same indexing rules as a 2D array: negative indices count from the end
+        rows, cols = self.rows, self.cols
+        if row < 0:
+            row += rows
+        if col < 0:
+            col += cols
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise IndexError(f'Position {(row, col)} is out of the {rows}x{cols} board')
+        return row * cols + col
+
+    def get(self, row, col):
+        '''Returns the value of the cell.'''
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.cells[row * self.cols + col]
+        return self.cells[self._index(row, col)]
+
+    def set(self, row, col, value):
+        '''Sets the value of the cell.'''
+        self._frozen = None
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            self.cells[row * self.cols + col] = int(value)
+        else:
+            self.cells[self._index(row, col)] = int(value)
+
+    def count(self, value):
+        '''Returns the number of cells holding the value.'''
+        return self.cells.count(value)
+
+    def positions(self, value):
+        '''Returns the sorted (row, col) positions of the cells holding the value.'''
+        cols = self.cols
+        return [divmod(idx, cols) for idx, cell in enumerate(self.cells) if cell == value]
+
+    def fill(self, value):
+        '''Sets every cell to the value.'''
+        self._frozen = None
+        self.cells = [int(value)] * (self.rows * self.cols)
+
+    def flat(self):
+        '''Returns a copy of the cells as a flat row-major list.'''
+        return list(self.cells)
+
+    def load(self, cells):
+        '''Replaces every cell from a flat row-major sequence.'''
+        frozen = cells if isinstance(cells, bytes) else None
+        cells = list(cells) if frozen is not None else [int(value) for value in cells]
+        if len(cells) != self.rows * self.cols:
+            raise ValueError(f'Expected {self.rows * self.cols} cells, got {len(cells)}')
+        self._frozen = frozen  # Loading a snapshot keeps sharing its bytes
+        self.cells = cells
+
+    def freeze(self):
+        '''Returns the cells as bytes (one per cell), shared until the next write.'''
+        if self._frozen is None:
+            self._frozen = bytes(self.cells)
+        return self._frozen
+
+    def tolist(self):
+        '''Returns the cells as a list of rows.'''
+        cols, cells = self.cols, self.cells
+        return [cells[start:start + cols] for start in range(0, len(cells), cols)]
+
+    def to_array(self):
+        '''Returns a new 2D NumPy array of the cells.'''
+        import numpy as np
+        return np.array(self.cells, dtype=int).reshape(self.rows, self.cols)
+
+
+class NumpyStorage:
+    r'''Cells of a board in a 2D NumPy array.
+
+    Args:
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+        fill (int): Initial value of every cell.
+        array (np.ndarray): Existing array to wrap (rows, cols and fill are ignored).
+    '''
+    __slots__ = ('array',)
+    name = 'numpy'
+
+    def __init__(self, rows: int = 0, cols: int = 0, fill: int = 0, array=None):
+        import numpy as np
+        if array is None:
+            array = np.full((rows, cols), fill, dtype=int)
+        self.array = array
+
+    @property
+    def rows(self):
+        return self.array.shape[0]
+
+    @property
+    def cols(self):
+        return self.array.shape[1]
+
+    def get(self, row, col):
+        return int(self.array[row, col])
+
+    def set(self, row, col, value):
+        self.array[row, col] = value
+
+    def count(self, value):
+        return int((self.array == value).sum())
+
+    def positions(self, value):
+        import numpy as np
+        return sorted(map(tuple, np.argwhere(self.array == value).tolist()))
+
+    def fill(self, value):
+        self.array.fill(value)
+
+    def flat(self):
+        return self.array.ravel().tolist()
+
+    def load(self, cells):
+        import numpy as np
+        if isinstance(cells, bytes):
+            cells = np.frombuffer(cells, dtype=np.uint8)
+        self.array[...] = np.reshape(cells, self.array.shape)
+
+    def freeze(self):
+        # The array may be written through `Board.board`, so nothing is cached
+        import numpy as np
+        return self.array.astype(np.uint8).tobytes()
+
+    def tolist(self):
+        return self.array.tolist()
+
+    def to_array(self):
+        return self.array.copy()
+
+
+kBackends = {
+    ListStorage.name: ListStorage,
+    NumpyStorage.name: NumpyStorage,
+}
+
+
+def make_storage(rows: int, cols: int, fill: int = 0, backend: str = None):
+    '''Creates the storage of a board.
+
+    Args:
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+        fill (int): Initial value of every cell.
+        backend (str): 'list', 'numpy', or None to choose from the board size.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    '''
+    if backend is None:
+        backend = ListStorage.name if rows * cols <= kMaxListCells else NumpyStorage.name
+    if backend not in kBackends:
+        raise ValueError(f'Unknown board backend: {backend!r}. Use one of {sorted(kBackends)}.')
+    return kBackends[backend](rows, cols, fill)
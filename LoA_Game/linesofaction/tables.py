@@ -0,0 +1,220 @@
+r'''Precomputed tables of a board shape, and their on-disk cache.
+
+The tables only depend on (rows, cols). `get_tables` builds them once per
+process, or loads them from a cache file written by an earlier run: worker
+processes then start without building anything. Cache files live in
+`cache_dir()`, one per shape, under a directory named after the file format
+version (bump `kTablesVersion` whenever the tables change)::
+
+    ~/.cache/linesofaction/tables-v1/8x8.bin
+
+A file holds a header, the Zobrist keys (uint64), then the lines and the
+line index of every square (int32). The rays and neighbours are slices of the
+lines and are derived on load. Unreadable or mismatching files are rebuilt.
+'''
+import array
+import functools
+import mmap
+import os
+import struct
+import sys
+
+from linesofaction.zobrist import Zobrist
+
+# Orientations and their two directions, as (row, col) unit steps.
+# Direction index `2 * orientation + k` is used by the ray tables.
+ORIENTATIONS = 'hvda'
+DIRECTIONS = (
+    (0, 1), (0, -1),    # h: E, W
+    (1, 0), (-1, 0),    # v: S, N
+    (1, 1), (-1, -1),   # d: SE, NW
+    (1, -1), (-1, 1),   # a: SW, NE
+)
+
+kTablesVersion = 1
+
+
+class BoardTables:
+    r'''Precomputed tables for a board shape.
+
+    Squares are numbered `row * cols + col`. All tables only depend on the
+    board shape, use `get_tables` to share them.
+
+    Args:
+        rows (int): Number of rows in the board.
+        cols (int): Number of columns in the board.
+
+    Attributes:
+        rays (list): rays[square][direction] is the tuple of squares walked from
+                     the square (excluded) to the edge in DIRECTIONS[direction].
+        lines (list): All lines (ranks, files, diagonals, antidiagonals) as tuples of squares.
+        line_of (list): line_of[square][orientation] is the index in `lines`
+                        of the square's line in ORIENTATIONS[orientation].
+        neighbours (list): neighbours[square] is the tuple of adjacent squares (8-connectivity).
+        zobrist (Zobrist): Position keys of the shape.
+    '''
+    kMagic = b'LOATBL%02d' % kTablesVersion
+    # magic, rows, cols, number of lines
+    kHeader = struct.Struct('<8sIIQ')
+
+    def __init__(self, rows: int = 8, cols: int = 8, _tables=None):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        if _tables is None:
+            _tables = self._build_lines() + (Zobrist(rows, cols),)
+        self.lines, self.line_of, self.zobrist = _tables
+        self._derive_rays()
+
+    def _build_lines(self):
+        lines = []
+        line_of = [[None] * len(ORIENTATIONS) for _ in range(self.size)]
+        for orientation in range(len(ORIENTATIONS)):
+            forward, backward = DIRECTIONS[2 * orientation], DIRECTIONS[2 * orientation + 1]
+            for square in range(self.size):
+                if line_of[square][orientation] is not None:
+                    continue
+                # Walk to the start of the line, then collect it
+                start = self._ray(square, backward)
+                start = start[-1] if start else square
+                line = (start,) + self._ray(start, forward)
+                for member in line:
+                    line_of[member][orientation] = len(lines)
+                lines.append(line)
+        return lines, line_of
+
+    def _derive_rays(self):
+        # A line runs in the forward direction of its orientation, so the two
+        # rays of a square are the parts of its line after and before it
+        orientation_of = [None] * len(self.lines)
+        for indices in self.line_of:
+            for orientation, index in enumerate(indices):
+                orientation_of[index] = orientation
+        rays = [[None] * len(DIRECTIONS) for _ in range(self.size)]
+        for index, line in enumerate(self.lines):
+            forward = 2 * orientation_of[index]
+            for pos, square in enumerate(line):
+                square_rays = rays[square]
+                square_rays[forward] = line[pos + 1:]
+                square_rays[forward + 1] = line[pos - 1::-1] if pos else ()
+        self.rays = [tuple(square_rays) for square_rays in rays]
+        self.neighbours = [tuple(ray[0] for ray in square_rays if ray) for square_rays in self.rays]
+
+    def _ray(self, square, step):
+        row, col = divmod(square, self.cols)
+        ray = []
+        row, col = row + step[0], col + step[1]
+        while 0 <= row < self.rows and 0 <= col < self.cols:
+            ray.append(row * self.cols + col)
+            row, col = row + step[0], col + step[1]
+        return tuple(ray)
+
+    def square(self, position):
+        '''Converts a (row, col) position to a square.'''
+        return position[0] * self.cols + position[1]
+
+    def position(self, square):
+        '''Converts a square to a (row, col) position.'''
+        return divmod(square, self.cols)
+
+    # ===== Persistence =====
+    def save(self, path):
+        '''Writes the tables to a cache file (atomically).'''
+        keys = array.array('Q', self.zobrist.keys[1] + self.zobrist.keys[2] + [self.zobrist.side])
+        offsets = array.array('i', [0])
+        for line in self.lines:
+            offsets.append(offsets[-1] + len(line))
+        cells = array.array('i', [square for line in self.lines for square in line])
+        line_of = array.array('i', [index for indices in self.line_of for index in indices])
+        if sys.byteorder != 'little':
+            for values in (keys, offsets, cells, line_of):
+                values.byteswap()
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.kHeader.pack(self.kMagic, self.rows, self.cols, len(self.lines)))
+            for values in (keys, offsets, cells, line_of):
+                values.tofile(f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, rows: int, cols: int):
+        '''Reads the tables of the shape from a cache file (through mmap).
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a cache file of this version and shape.
+        '''
+        size = rows * cols
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < cls.kHeader.size:
+                raise ValueError(f'Truncated tables file: {path}')
+            magic, file_rows, file_cols, num_lines = cls.kHeader.unpack_from(mm, 0)
+            if magic != cls.kMagic or (file_rows, file_cols) != (rows, cols):
+                raise ValueError(f'Not a {rows}x{cols} tables file of version {kTablesVersion}: {path}')
+            sections = (('Q', 2 * size + 1), ('i', num_lines + 1), ('i', 4 * size), ('i', 4 * size))
+            expected = cls.kHeader.size + sum(array.array(code).itemsize * count for code, count in sections)
+            if len(mm) != expected:
+                raise ValueError(f'Truncated tables file: {path}')
+            values = []
+            offset = cls.kHeader.size
+            for code, count in sections:
+                section = array.array(code)
+                section.frombytes(mm[offset:offset + section.itemsize * count])
+                if sys.byteorder != 'little':
+                    section.byteswap()
+                values.append(section.tolist())
+                offset += section.itemsize * count
+        keys, offsets, cells, line_of = values
+        lines = [tuple(cells[start:end]) for start, end in zip(offsets, offsets[1:])]
+        line_of = [line_of[idx:idx + len(ORIENTATIONS)] for idx in range(0, len(line_of), len(ORIENTATIONS))]
+        zobrist = Zobrist.from_keys(rows, cols, keys[:size], keys[size:2 * size], keys[-1])
+        return cls(rows, cols, _tables=(lines, line_of, zobrist))
+
+
+def cache_dir():
+    '''Returns the directory of the cache files (without creating it).
+
+    The LOA_CACHE_DIR environment variable overrides the platform's user cache
+    directory; setting it to an empty string disables the cache.
+    '''
+    path = os.environ.get('LOA_CACHE_DIR')
+    if path is not None:
+        return path or None
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'linesofaction')
+
+
+def tables_path(rows: int, cols: int):
+    '''Returns the cache file of the shape, None if the cache is disabled.'''
+    root = cache_dir()
+    if root is None:
+        return None
+    return os.path.join(root, f'tables-v{kTablesVersion}', f'{rows}x{cols}.bin')
+
+
+@functools.lru_cache(maxsize=None)
+def get_tables(rows: int = 8, cols: int = 8):
+    '''Returns the (shared) BoardTables of the shape.
+
+    The tables are loaded from the cache file of the shape, or built and saved
+    there. A cache that cannot be read or written only costs the build.
+    '''
+    path = tables_path(rows, cols)
+    if path is not None:
+        try:
+            return BoardTables.load(path, rows, cols)
+        except (OSError, ValueError):
+            pass
+    tables = BoardTables(rows, cols)
+    if path is not None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tables.save(path)
+        except OSError:
+            pass
+    return tables
@@ -0,0 +1,90 @@
+import random
+
+from linesofaction.piece import Piece
+
+
+class Zobrist:
+    r'''Zobrist keys for hashing positions of a given board shape.
+
+    Every (square, piece) pair gets a random 64-bit key, and the position key is
+    the XOR of the keys of all occupied squares (plus a side-to-move key when
+    the second player is to move). Keys are generated from a fixed seed, so the
+    same shape always produces the same keys -- this makes the position keys
+    safe to store on disk.
+
+    Args:
+        rows (int): Number of rows in the board.
+        cols (int): Number of columns in the board.
+        seed (int): Seed for the key generator.
+
+    Attributes:
+        keys (list): keys[piece][square] where square is `row * cols + col`.
+                     keys[Piece.EMPTY] are all zeros.
+        side (int): Key XOR-ed in when the second player is to move.
+    '''
+    kSeed = 0x10A
+
+    def __init__(self, rows: int = 8, cols: int = 8, seed: int = None):
+        self.rows = rows
+        self.cols = cols
+        rng = random.Random(self.kSeed if seed is None else seed)
+        rng.seed(f'{rng.getrandbits(64)}:{rows}x{cols}')  # Different shapes, different keys
+        self.keys = [[0] * (rows * cols) for _ in Piece]
+        for piece in (Piece.RED, Piece.BLACK):
+            self.keys[piece] = [rng.getrandbits(64) for _ in range(rows * cols)]
+        self.side = rng.getrandbits(64)
+
+    @classmethod
+    def from_keys(cls, rows, cols, red, black, side):
+        '''Creates the keys of a shape from saved key lists (see `linesofaction.tables`).'''
+        zobrist = cls.__new__(cls)
+        zobrist.rows = rows
+        zobrist.cols = cols
+        zobrist.keys = [[0] * (rows * cols) for _ in Piece]
+        zobrist.keys[Piece.RED] = list(red)
+        zobrist.keys[Piece.BLACK] = list(black)
+        zobrist.side = side
+        return zobrist
+
+    def square(self, position):
+        '''Converts a (row, col) position to the square index.'''
+        row, col = position
+        return (row % self.rows) * self.cols + (col % self.cols)
+
+    def piece_key(self, position, piece):
+        '''Returns the key of the piece standing on the given position.'''
+        return self.keys[piece][self.square(position)]
+
+    def hash(self, board, player=None):
+        '''Computes the key of the board from scratch.
+
+        Args:
+            board (Board): Board to hash.
+            player (Piece): Player to move. Defaults to the first player.
+
+        Returns:
+            int: 64-bit position key.
+        '''
+        key = 0
+        for piece in board.players:
+            for position in board.get_positions(piece):
+                key ^= self.piece_key(position, piece)
+        if player is not None and player != board.players[0]:
+            key ^= self.side
+        return key
+
+    def move_delta(self, origin, target, piece, captured=Piece.EMPTY):
+        '''Returns the XOR delta a move applies to the position key.
+
+        The delta includes the side-to-move flip.
+
+        Args:
+            origin (tuple): Position the piece moves from.
+            target (tuple): Position the piece moves to.
+            piece (Piece): The moving piece.
+            captured (Piece): Piece that was standing on the target (if any).
+        '''
+        return (self.piece_key(origin, piece)
+            ^ self.piece_key(target, piece)
+            ^ self.piece_key(target, captured)
+            ^ self.side)
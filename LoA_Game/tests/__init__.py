@@ -0,0 +1,10 @@
+# The board tables are cached on disk (see linesofaction.tables.cache_dir).
+# The suite uses its own temporary cache, not the user's.
+import atexit
+import os
+import shutil
+import tempfile
+
+_cache_dir = tempfile.mkdtemp(prefix='loa-tests-')
+os.environ['LOA_CACHE_DIR'] = _cache_dir
+atexit.register(shutil.rmtree, _cache_dir, ignore_errors=True)
@@ -149,3 +149,98 @@ class TestBoardPieceManipulation(TestCase):
                     self.assertEqual(board.board[row, col], board.players[1])
                 else:
                     self.assertEqual(board.board[row, col], Piece.EMPTY)
+
+
+class TestBoardPieceLists(TestCase):
+    def assertTracked(self, board):
+        for piece in (*board.players, Piece.EMPTY):
+            self.assertEqual(board.get_positions(piece), board._storage.positions(piece))
+            self.assertEqual(board.count(piece), board._storage.count(piece))
+
+    def test_follow_place_and_pop(self):
+        import random
+        rng = random.Random(0)
+        for backend in ('list', 'numpy'):
+            with self.subTest(backend=backend):
+                board = Board(backend=backend)
+                for _ in range(300):
+                    position = (rng.randrange(-8, 8), rng.randrange(-8, 8))
+                    if board.is_empty(position):
+                        board.place(position, rng.choice(board.players))
+                    else:
+                        board.pop(position)
+                    self.assertTracked(board)
+
+    def test_other_writes(self):
+        board = Board()
+        board.get_positions(Piece.BLACK)
+        board.set_cells([Piece.RED] * 64)
+        self.assertTracked(board)
+        board.board[0, 0] = Piece.BLACK
+        self.assertTracked(board)
+        board.pop((0, 0))
+        board.board[:, 0] = Piece.EMPTY
+        self.assertTracked(board)
+        board._init_board()._init_pieces()
+        self.assertTracked(board)
+
+    def test_positions_are_copies(self):
+        board = Board()
+        board.get_positions(Piece.BLACK).clear()
+        self.assertEqual(board.count(Piece.BLACK), 12)
+
+
+class TestBoardVersion(TestCase):
+    def test_version_changes_on_writes(self):
+        board = Board()
+        versions = [board.version]
+        board.peek(0, 1)
+        board.get_positions(Piece.BLACK)
+        self.assertEqual(board.version, versions[-1])  # Reads keep the version
+        for write in (lambda: board.pop((0, 1)), lambda: board.place((0, 1), Piece.BLACK),
+                      lambda: board.set_cells(board.cells()), lambda: board.board,
+                      lambda: board._init_board(), lambda: board._init_pieces()):
+            write()
+            self.assertNotIn(board.version, versions)
+            versions.append(board.version)
+        self.assertNotEqual(Board().version, board.version)  # Never shared between boards
+
+
+class TestBoardSnapshot(TestCase):
+    def test_snapshot_is_immutable_and_hashable(self):
+        board = Board(rows=6, cols=6)
+        snapshot = board.snapshot()
+        self.assertEqual(snapshot.shape, (6, 6))
+        self.assertEqual(len(snapshot.cells), 36)
+        self.assertEqual(snapshot.tolist(), board.tolist())
+        self.assertEqual({snapshot: 1}[board.snapshot()], 1)
+        with self.assertRaises(AttributeError):
+            snapshot.cells = b''
+        with self.assertRaises(IndexError):
+            snapshot.peek(6, 0)
+
+    def test_snapshot_shared_until_modified(self):
+        board = Board(rows=8, cols=8)
+        snapshot = board.snapshot()
+        self.assertIs(board.snapshot().cells, snapshot.cells)
+        board.place((3, 3), board.pop((0, 1)))
+        moved = board.snapshot()
+        self.assertNotEqual(moved, snapshot)
+        self.assertEqual(snapshot.peek(0, 1), Piece.BLACK)
+        self.assertEqual(moved.peek(0, 1), Piece.EMPTY)
+        self.assertEqual(moved.peek(-5, -5), Piece.BLACK)
+        self.assertEqual(moved.get_positions(Piece.BLACK), board.get_positions(Piece.BLACK))
+        self.assertEqual(moved.count(Piece.RED), board.count(Piece.RED))
+
+    def test_from_snapshot(self):
+        for backend in ('list', 'numpy'):
+            with self.subTest(backend=backend):
+                board = Board(rows=5, cols=7, backend=backend)
+                board.place((2, 3), board.pop((0, 1)))
+                snapshot = board.snapshot()
+                restored = Board.from_snapshot(snapshot, backend=backend)
+                self.assertEqual(restored.backend, backend)
+                self.assertEqual(restored.snapshot(), snapshot)
+                restored.pop((2, 3))  # Restored boards are independent
+                self.assertEqual(board.peek(2, 3), Piece.BLACK)
+                self.assertEqual(snapshot.peek(2, 3), Piece.BLACK)
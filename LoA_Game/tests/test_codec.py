@@ -0,0 +1,67 @@
+from unittest import TestCase
+import os
+import tempfile
+
+import numpy as np
+
+from linesofaction import codec
+from linesofaction.board import Board
+from linesofaction.piece import Piece
+
+
+class TestCodec(TestCase):
+    def test_size(self):
+        board = Board()
+        self.assertEqual(len(codec.encode(board)), 17)
+        self.assertEqual(len(codec.encode(Board(rows=9, cols=10))), 2 * 12 + 1)
+
+    def test_roundtrip(self):
+        for rows, cols in [(8, 8), (5, 7), (10, 10)]:
+            with self.subTest(rows=rows, cols=cols):
+                board = Board(rows=rows, cols=cols)
+                board.replace((0, 1), Piece.RED)
+                board.pop((1, 0))
+                data = codec.encode(board, Piece.RED)
+                decoded, player = codec.decode(data, rows, cols)
+                self.assertTrue((decoded.board == board.board).all())
+                self.assertEqual(player, Piece.RED)
+
+    def test_batch(self):
+        rng = np.random.default_rng(0)
+        boards = rng.integers(0, 3, size=(50, 8, 8))
+        sides = rng.integers(0, 2, size=50)
+        decoded, decoded_sides = codec.decode_batch(codec.encode_batch(boards, sides), 8, 8)
+        self.assertEqual(decoded.dtype, np.int8)
+        self.assertTrue((decoded == boards).all())
+        self.assertTrue((decoded_sides == sides).all())
+
+
+class TestPositionStore(TestCase):
+    def test_in_memory(self):
+        store = codec.PositionStore(capacity=1)
+        board = Board()
+        for _ in range(3):
+            store.append(board)
+        store.append(board, Piece.RED)
+        self.assertEqual(len(store), 4)
+        boards, sides = store.decode()
+        self.assertEqual(boards.shape, (4, 8, 8))
+        self.assertEqual(sides.tolist(), [0, 0, 0, 1])
+        self.assertTrue((store[3][0].board == board.board).all())
+
+    def test_file_backed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'positions.bin')
+            rng = np.random.default_rng(1)
+            boards = rng.integers(0, 3, size=(10, 6, 6))
+            with codec.PositionStore(6, 6, path=path) as store:
+                store.extend(boards[:4], np.zeros(4))
+                self.assertEqual(len(store.decode()[0]), 4)
+                store.extend(boards[4:], np.ones(6))
+            with codec.PositionStore(6, 6, path=path) as store:
+                self.assertEqual(len(store), 10)
+                decoded, sides = store.decode(slice(2, 8))
+                self.assertTrue((decoded == boards[2:8]).all())
+                self.assertEqual(sides.tolist(), [0, 0, 1, 1, 1, 1])
+            with self.assertRaises(ValueError):
+                codec.PositionStore(8, 8, path=path)
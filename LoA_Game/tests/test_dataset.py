@@ -0,0 +1,124 @@
+from unittest import TestCase
+import json
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from linesofaction.dataset import (
+    export, game_samples, load_shard, symmetries, symmetry_permutations, kFields)
+from linesofaction.movegen import Position
+from linesofaction.rules import GameEndState
+from linesofaction.tables import DIRECTIONS, get_tables
+
+from tests.test_replay import random_game
+
+
+def legal_planes(boards, side):
+    '''Legal move planes of a (rows, cols) board, computed with movegen.'''
+    rows, cols = boards.shape
+    tables = get_tables(rows, cols)
+    player = Position.initial(rows, cols).player
+    position = Position(tables, boards.ravel().tolist(), player if side == 0 else player.opposite())
+    planes = np.zeros((len(DIRECTIONS), rows * cols), dtype=bool)
+    for origin, target in position.moves():
+        (r0, c0), (r1, c1) = tables.position(origin), tables.position(target)
+        step = ((r1 > r0) - (r1 < r0), (c1 > c0) - (c1 < c0))
+        planes[DIRECTIONS.index(step), origin] = True
+    return planes.reshape(len(DIRECTIONS), rows, cols)
+
+
+class TestGameSamples(TestCase):
+    def test_samples_of_a_game(self):
+        rng = random.Random(3)
+        moves, state = random_game(rng, 6, 6)
+        samples = game_samples(moves, 6, 6)
+        self.assertEqual(len(samples['side']), len(moves))
+        self.assertEqual(samples['side'].tolist(), [ply % 2 for ply in range(len(moves))])
+        self.assertEqual(samples['boards'][0].tolist(), Position.initial(6, 6).cells)
+        for idx in range(len(moves)):
+            legal = samples['legal'][idx]
+            self.assertTrue(legal.reshape(-1)[samples['move'][idx]])
+            np.testing.assert_array_equal(
+                legal.reshape(-1, 6, 6), legal_planes(samples['boards'][idx].reshape(6, 6), samples['side'][idx]))
+        expected = {GameEndState.WIN1: 1, GameEndState.WIN2: -1}.get(state, 0)  # For black
+        self.assertEqual(samples['outcome'].tolist(),
+                         [expected if side == 0 else -expected for side in samples['side']])
+
+    def test_illegal_game(self):
+        self.assertIsNone(game_samples([('B1', 'B2')]))
+        self.assertIsNone(game_samples([('Z1', 'B3')]))
+
+
+class TestSymmetries(TestCase):
+    def test_counts(self):
+        self.assertEqual(len(symmetries(8, 8)), 8)
+        self.assertEqual(len(symmetries(6, 9)), 4)
+        self.assertEqual(symmetries(8, 8)[0], (False, False, False))
+
+    def test_symmetries_preserve_legal_moves(self):
+        rng = random.Random(4)
+        moves, _ = random_game(rng, 7, 7, max_plies=20)
+        samples = game_samples(moves, 7, 7)
+        for symmetry in symmetries(7, 7):
+            squares, directions = symmetry_permutations(7, 7, symmetry)
+            for idx in range(0, len(moves), 5):
+                boards = samples['boards'][idx][squares].reshape(7, 7)
+                legal = samples['legal'][idx][directions][:, squares].reshape(-1, 7, 7)
+                np.testing.assert_array_equal(legal, legal_planes(boards, samples['side'][idx]))
+
+
+class TestExport(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        rng = random.Random(5)
+        lines = [' '.join(''.join(move) for move in random_game(rng, max_plies=30)[0]) for _ in range(12)]
+        lines[3] = 'B1B2 C1C3'  # Illegal
+        lines[7] = '6x6 B1B3'  # Other shape
+        self.games = os.path.join(self.tmp.name, 'games.txt')
+        with open(self.games, 'w') as f:
+            f.write('# Test games\n' + '\n'.join(lines) + '\n')
+
+    def export(self, name, **kwargs):
+        output = os.path.join(self.tmp.name, name)
+        summary = export([self.games], output, **kwargs)
+        with open(os.path.join(output, 'meta.json')) as f:
+            meta = json.load(f)
+        shards = [load_shard(os.path.join(output, entry['name'])) for entry in meta['files']]
+        return summary, shards
+
+    def test_shards(self):
+        summary, shards = self.export('plain', shard_size=100, processes=1, chunk_lines=3)
+        self.assertEqual((summary['games'], summary['skipped']), (10, 2))
+        self.assertEqual([len(shard['side']) for shard in shards][:-1], [100] * (len(shards) - 1))
+        self.assertEqual(sum(len(shard['side']) for shard in shards), summary['positions'])
+        self.assertEqual(set(shards[0]), set(kFields))
+        self.assertEqual(shards[0]['boards'].shape[1:], (8, 8))
+        self.assertEqual(shards[0]['legal'].shape[1:], (8, 8, 8))
+
+        _, npy = self.export('npy', shard_size=100, processes=1, fmt='npy')
+        for field in kFields:
+            np.testing.assert_array_equal(np.concatenate([s[field] for s in npy]),
+                                          np.concatenate([s[field] for s in shards]))
+
+    def test_augmentation_is_deterministic(self):
+        summary, plain = self.export('plain', shard_size=64, processes=1)
+        all_summary, augmented = self.export('all', shard_size=64, processes=1, augment='all')
+        self.assertEqual(all_summary['positions'], 8 * summary['positions'])
+        boards = np.concatenate([shard['boards'] for shard in augmented])
+        np.testing.assert_array_equal(boards[::8], np.concatenate([shard['boards'] for shard in plain]))
+
+        _, serial = self.export('serial', shard_size=64, processes=1, augment='random', chunk_lines=2)
+        _, parallel = self.export('parallel', shard_size=64, processes=2, augment='random', chunk_lines=5)
+        self.assertEqual(len(serial), len(parallel))
+        for a, b in zip(serial, parallel):
+            for field in kFields:
+                np.testing.assert_array_equal(a[field], b[field])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            export([self.games], self.tmp.name, augment='mirror')
+        with self.assertRaises(ValueError):
+            export([self.games], self.tmp.name, fmt='csv', processes=1)
@@ -0,0 +1,62 @@
+from unittest import TestCase
+import io
+import time
+
+from linesofaction.engine_protocol import EngineProtocol
+from linesofaction.notation import parse_move
+
+
+class TestEngineProtocol(TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.engine = EngineProtocol(output=self.output)
+
+    def lines(self):
+        return self.output.getvalue().splitlines()
+
+    def test_handshake(self):
+        self.engine.run(['uci\n', 'isready\n', 'quit\n', 'isready\n'])
+        lines = self.lines()
+        self.assertEqual(lines[-2:], ['uciok', 'readyok'])
+        self.assertTrue(lines[0].startswith('id name'))
+
+    def test_go_depth(self):
+        self.engine.run(['position startpos moves B1B3\n', 'go depth 2\n'])
+        lines = self.lines()
+        self.assertTrue(lines[-1].startswith('bestmove '))
+        infos = [line.split() for line in lines if line.startswith('info depth')]
+        self.assertEqual([int(info[2]) for info in infos], [1, 2])
+        for info in infos:
+            for key in ('nodes', 'nps', 'time', 'pv'):
+                self.assertIn(key, info)
+        # Red moves after B1B3
+        origin, _ = parse_move(lines[-1].split()[1])
+        self.assertEqual(self.engine.position.cells[self.engine.position.tables.square(origin)], 1)
+
+    def test_setboard_mate(self):
+        self.engine.run(['setboard .bb.../....../...b../....../....../r...rr b\n', 'go depth 3\n'])
+        self.assertIn('score mate 1', self.lines()[0])
+        self.assertEqual(self.lines()[-1], 'bestmove C1C2')
+
+    def test_stop(self):
+        self.engine.handle('go infinite')
+        time.sleep(0.2)
+        start = time.monotonic()
+        self.engine.handle('stop')
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertTrue(self.lines()[-1].startswith('bestmove '))
+
+    def test_searcher_is_reused(self):
+        searcher = self.engine.searcher
+        self.engine.run(['go depth 2\n', 'position startpos 6x6\n', 'go nodes 100\n'])
+        self.assertIs(self.engine.searcher, searcher)
+        self.assertTrue(searcher.tt)
+        self.assertEqual(sum(line.startswith('bestmove') for line in self.lines()), 2)
+
+    def test_errors(self):
+        self.engine.run(['nope\n', 'position startpos moves B1B4\n', 'go depth x\n', 'setboard b..\n',
+                         'position moves B1D3\n'])
+        lines = self.lines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(line.startswith('info string error') for line in lines))
+        self.assertIn('Illegal move', lines[1])
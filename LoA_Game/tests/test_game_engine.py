@@ -1,4 +1,6 @@
-from unittest import TestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
+import asyncio
+import time
 
 from linesofaction.engine import GameEngine
 from linesofaction.piece import Piece
@@ -169,4 +171,183 @@ class TestGameEngineGamePlay(TestCase):
 
 
 
-    # def test_lines_of_sight(self):
\ No newline at end of file
+    # def test_lines_of_sight(self):
+
+
+class TestGameEngineNoMove(TestCase):
+    # Black to move B2-D5 (1, 4) -> (3, 4) leaves red without a legal move
+    kCells = [0, 0, 2, 0, 0,
+              0, 1, 0, 1, 2,
+              0, 0, 2, 2, 2,
+              0, 2, 0, 1, 0,
+              0, 2, 0, 0, 0]
+
+    def make_engine(self, **kwargs):
+        engine = GameEngine(board=Board(rows=5, cols=5).set_cells(self.kCells), **kwargs)
+        self.assertTrue(engine.has_legal_move(Piece.RED))
+        engine.select((1, 4)).move((3, 4))
+        self.assertFalse(engine.has_legal_move(Piece.RED))
+        return engine
+
+    def test_pass(self):
+        engine = self.make_engine()
+        self.assertIsNone(engine.winner)
+        self.assertEqual(engine.passed, Piece.RED)
+        self.assertEqual(engine.current_player, Piece.BLACK)
+        engine.reset()
+        self.assertIsNone(engine.passed)
+
+    def test_lose(self):
+        engine = self.make_engine(no_move=GameEngine.kLose)
+        self.assertEqual(engine.winner, Piece.BLACK)
+        self.assertIsNone(engine.passed)
+
+    def test_unknown_rule(self):
+        with self.assertRaises(ValueError):
+            GameEngine(no_move='draw')
+
+    def test_search_uses_the_rule(self):
+        for rule in (GameEngine.kPass, GameEngine.kLose):
+            engine = GameEngine(board=Board(rows=5, cols=5).set_cells(self.kCells), no_move=rule)
+            engine.suggest_move(depth=1)
+            self.assertEqual(engine.searcher.no_move, rule)
+
+
+class TestGameEngineHistory(TestCase):
+    # Both players move a piece two squares and back: the initial position again after 4 plies
+    kShuffle = [((0, 1), (2, 1)), ((1, 0), (1, 2)), ((2, 1), (0, 1)), ((1, 2), (1, 0))]
+
+    def play(self, engine, plies):
+        for origin, target in (self.kShuffle * plies)[:plies]:
+            engine.select(origin).move(target)
+
+    def test_history(self):
+        engine = GameEngine()
+        self.assertEqual((engine.plies, engine.repetitions()), (0, 1))
+        self.play(engine, 8)
+        self.assertEqual(engine.plies, 8)
+        self.assertEqual(len(engine.history), 9)
+        self.assertEqual(engine.history[0], engine.history[4])
+        self.assertEqual(engine.history[-1], engine.position_key())
+        self.assertEqual(engine.repetitions(), 3)
+        self.assertEqual(engine.repetitions(engine.history[1]), 2)
+        self.assertIsNone(engine.winner)  # Repetitions are not adjudicated by default
+        engine.reset()
+        self.assertEqual((engine.plies, engine.history), (0, []))
+
+    def test_draw_by_repetition(self):
+        engine = GameEngine(repetition_draw=3)
+        self.play(engine, 7)
+        self.assertIsNone(engine.winner)
+        engine.select((1, 2)).move((1, 0))  # The initial position, a third time
+        self.assertEqual((engine.winner, engine.adjudicated), ('TIE', 'repetition'))
+
+    def test_max_plies(self):
+        engine = GameEngine(max_plies=5)
+        self.play(engine, 4)
+        self.assertIsNone(engine.winner)
+        engine.select((0, 1)).move((2, 1))
+        self.assertEqual((engine.winner, engine.adjudicated), ('TIE', 'max plies'))
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            GameEngine(repetition_draw=1)
+        with self.assertRaises(ValueError):
+            GameEngine(max_plies=0)
+
+    def test_suggest_move_scores_repetitions(self):
+        histories = []
+        search = GameEngine().searcher.search
+
+        def record(position, history=None, **limits):
+            histories.append(history)
+            return search(position, history=history, **limits)
+
+        for repetition_draw in (None, 3):
+            engine = GameEngine(repetition_draw=repetition_draw)
+            engine.searcher.search = record
+            self.play(engine, 3)
+            engine.suggest_move(depth=1)
+        # The history is only searched when repetitions are draws
+        self.assertEqual(histories, [None, tuple(engine.history)])
+
+
+class TestGameEngineMoveCache(TestCase):
+    def test_cached_until_the_board_changes(self):
+        engine = GameEngine()
+        calls = []
+        get_valid_steps = engine.rules.get_valid_steps
+        engine.rules.get_valid_steps = lambda *args: calls.append(args) or get_valid_steps(*args)
+
+        moves = engine.select((0, 1)).get_valid_moves()
+        self.assertEqual(moves, {(0, 7), (2, 1), (2, 3)})
+        self.assertIs(engine.get_valid_moves(), moves)
+        engine.move((2, 1))  # Validating the listed move hits the cache
+        self.assertEqual(len(calls), 1)
+
+        # The board changed: computed again, for the other player
+        engine.select((1, 0)).get_valid_moves()
+        self.assertEqual(len(calls), 2)
+        engine.board.pop((1, 7))
+        engine.get_valid_moves()
+        self.assertEqual(len(calls), 3)
+
+    def test_lru_bound(self):
+        engine = GameEngine()
+        engine.kMoveCacheSize = 4
+        for col in range(1, 7):
+            engine.select((0, col)).get_valid_moves()
+        self.assertEqual(len(engine._moves), 4)
+        self.assertEqual([key[1] for key in engine._moves], [(0, 3), (0, 4), (0, 5), (0, 6)])
+
+
+class TestGameEngineSuggestMove(TestCase):
+    def test_deadline(self):
+        engine = GameEngine()
+        start = time.monotonic()
+        move = engine.suggest_move(deadline=start + 0.2)
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertIn(move[1], engine.select(move[0]).get_valid_moves())
+        self.assertEqual(engine.last_search.move, move)
+
+    def test_limits(self):
+        engine = GameEngine()
+        engine.suggest_move(node_limit=100)
+        self.assertLessEqual(engine.last_search.nodes, 100)
+        engine.suggest_move(depth=1)
+        self.assertEqual(engine.last_search.depth, 1)
+
+    def test_game_over(self):
+        engine = GameEngine()
+        engine.winner = Piece.BLACK
+        with self.assertRaises(ValueError):
+            engine.suggest_move(depth=1)
+
+
+class TestGameEngineSuggestMoveAsync(IsolatedAsyncioTestCase):
+    async def test_suggest(self):
+        engine = GameEngine()
+        move = await engine.suggest_move_async(budget=0.1)
+        self.assertEqual(engine.board.peek(*move[0]), engine.current_player)
+
+    async def test_cancel(self):
+        engine = GameEngine()
+        task = asyncio.ensure_future(engine.suggest_move_async(budget=10.0))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        # The cancelled search stops, so the next one starts right away
+        start = time.monotonic()
+        await engine.suggest_move_async(budget=0.1)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    async def test_budget_counts_from_the_call(self):
+        from concurrent.futures import ThreadPoolExecutor
+        engine = GameEngine()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(time.sleep, 0.3)  # The search waits for the busy executor
+            start = time.monotonic()
+            move = await engine.suggest_move_async(budget=0.2, executor=executor)
+            self.assertLess(time.monotonic() - start, 0.45)
+        self.assertIsNotNone(move)
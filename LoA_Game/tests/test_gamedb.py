@@ -0,0 +1,72 @@
+from unittest import TestCase
+import tempfile
+
+from linesofaction.board import Board
+from linesofaction.gamedb import GameDatabase
+
+
+class TestGameDatabase(TestCase):
+    # Black B1-B3, Red A2-C2 (capture), Black G1-G3
+    kGame = [((0, 1), (2, 1)), ((1, 0), (1, 2)), ((0, 6), (2, 6))]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _position(self, num_moves):
+        board = Board()
+        for origin, target in self.kGame[:num_moves]:
+            piece = board.pop(origin)
+            board.pop(target)
+            board.place(target, piece)
+        player = board.players[num_moves % 2]
+        return board, player
+
+    def test_append_and_get(self):
+        with GameDatabase(self.tmpdir.name, segment_size=2) as db:
+            ids = [db.append(self.kGame, result=None, event=f'game {i}') for i in range(3)]
+            self.assertEqual(ids, [0, 1, 2])
+            self.assertEqual(len(db), 3)
+            self.assertEqual(db.get(2)['event'], 'game 2')  # Active (unindexed) segment
+            self.assertEqual(db.get(1)['moves'][1], [1, 0, 1, 2])  # Indexed segment
+            with self.assertRaises(KeyError):
+                db.get(3)
+
+    def test_lookup(self):
+        with GameDatabase(self.tmpdir.name, segment_size=2) as db:
+            db.append(self.kGame)
+            db.append(self.kGame[:1])
+            db.append(self.kGame[:2])
+            # Third game is in the active segment, so it is not indexed yet
+            board, player = self._position(1)
+            self.assertEqual(db.lookup(board, player), [(0, 1), (1, 1)])
+            db.seal()
+            self.assertEqual(db.lookup(board, player), [(0, 1), (1, 1), (2, 1)])
+            board, player = self._position(3)
+            self.assertEqual(db.lookup(board, player), [(0, 3)])
+            # Same squares, wrong side to move
+            self.assertEqual(db.lookup(board, ~player), [])
+
+    def test_incremental_reopen(self):
+        with GameDatabase(self.tmpdir.name, segment_size=2) as db:
+            db.append(self.kGame)
+            db.seal()
+        with GameDatabase(self.tmpdir.name, segment_size=100) as db:
+            self.assertEqual(db.segment_size, 2)  # Read from disk
+            game_id = db.append(self.kGame)
+            self.assertEqual(game_id, 2)  # Sealed segments are not reopened
+            db.seal()
+            board, player = self._position(2)
+            self.assertEqual(db.lookup(board, player), [(0, 2), (2, 2)])
+
+    def test_large_game_ids(self):
+        # Ids of later segments go beyond 32 bits when the segments are large
+        with GameDatabase(self.tmpdir.name, segment_size=1 << 32) as db:
+            db.append(self.kGame)
+            db.seal()
+            game_id = db.append(self.kGame[:1])
+            db.seal()
+            self.assertEqual(game_id, 1 << 32)
+            board, player = self._position(1)
+            self.assertEqual(db.lookup(board, player), [(0, 1), (1 << 32, 1)])
+            self.assertEqual(db.get(game_id)['moves'], [[0, 1, 2, 1]])
@@ -0,0 +1,43 @@
+from unittest import TestCase
+import os
+import subprocess
+import sys
+
+import linesofaction
+
+kRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(code):
+    '''Runs the code in a fresh interpreter and returns the names of the imported modules.'''
+    proc = subprocess.run(
+        [sys.executable, '-c', code + '\nimport sys; print(" ".join(sys.modules))'],
+        capture_output=True, text=True, check=True, cwd=kRoot)
+    return set(proc.stdout.split())
+
+
+class TestLazyImports(TestCase):
+    def test_package_import_is_lazy(self):
+        modules = imported_modules('import linesofaction')
+        self.assertNotIn('numpy', modules)
+        self.assertNotIn('linesofaction.engine', modules)
+
+    def test_numpy_free_modules(self):
+        modules = imported_modules(
+            'import linesofaction.direction, linesofaction.piece, linesofaction.rules, '
+            'linesofaction.notation, linesofaction.search, linesofaction.ponder, '
+            'linesofaction.engine_protocol, linesofaction.replay')
+        self.assertNotIn('numpy', modules)
+        self.assertNotIn('asyncio', modules)
+
+    def test_game_engine_without_numpy(self):
+        modules = imported_modules('from linesofaction import LinesOfActionGame; LinesOfActionGame()')
+        self.assertNotIn('numpy', modules)
+
+    def test_lazy_attributes(self):
+        from linesofaction.engine import GameEngine
+        self.assertIs(linesofaction.LinesOfActionGame, GameEngine)
+        self.assertIs(linesofaction.notation, sys.modules['linesofaction.notation'])
+        self.assertIn('LinesOfActionGame', dir(linesofaction))
+        with self.assertRaises(AttributeError):
+            linesofaction.does_not_exist
@@ -0,0 +1,81 @@
+from unittest import TestCase
+import random
+
+from linesofaction.board import Board
+from linesofaction.movegen import Position
+from linesofaction.piece import Piece
+from linesofaction.rules import GameRules
+
+
+def random_board(rng, rows, cols, num_pieces):
+    board = Board(rows=rows, cols=cols)
+    board._init_board()
+    squares = rng.sample([(r, c) for r in range(rows) for c in range(cols)], 2 * num_pieces)
+    for idx, position in enumerate(squares):
+        board.place(position, board.players[idx % 2])
+    return board
+
+
+class TestPositionMoves(TestCase):
+    def test_matches_rules(self):
+        rng = random.Random(0)
+        rules = GameRules()
+        for trial in range(40):
+            rows, cols = rng.choice([(8, 8), (6, 9), (5, 5)])
+            board = random_board(rng, rows, cols, rng.randint(2, 10))
+            for player in board.players:
+                position = Position.from_board(board, player)
+                tables = position.tables
+                for origin in board.get_positions(player):
+                    with self.subTest(trial=trial, player=player, origin=origin):
+                        expected = rules.get_valid_steps(board, origin, player)
+                        targets = position.piece_moves(tables.square(origin))
+                        self.assertEqual({tables.position(t) for t in targets}, expected, f'\n{board}')
+
+    def test_is_legal(self):
+        rng = random.Random(3)
+        for trial in range(40):
+            rows, cols = rng.choice([(8, 8), (6, 9), (5, 5)])
+            board = random_board(rng, rows, cols, rng.randint(2, 10))
+            for player in board.players:
+                position = Position.from_board(board, player)
+                legal = set(position.moves())
+                for origin in range(position.tables.size):
+                    for target in range(position.tables.size):
+                        if origin != target:
+                            self.assertEqual(position.is_legal((origin, target)),
+                                             (origin, target) in legal, (trial, origin, target))
+
+    def test_make_unmake(self):
+        rng = random.Random(1)
+        position = Position.from_board(Board())
+        initial = position.copy()
+        history = []
+        for _ in range(30):
+            moves = position.moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            history.append((move, position.make(move)))
+            # Incremental state matches a position built from scratch
+            fresh = Position(position.tables, position.cells, position.player)
+            self.assertEqual(position.key, fresh.key)
+            self.assertEqual(position.counts, fresh.counts)
+            self.assertEqual(position.pieces, fresh.pieces)
+        for move, captured in reversed(history):
+            position.unmake(move, captured)
+        self.assertEqual(position.cells, initial.cells)
+        self.assertEqual(position.key, initial.key)
+        self.assertEqual(position.player, Piece.BLACK)
+
+    def test_board_roundtrip(self):
+        board = Board(rows=6, cols=7)
+        board.replace((0, 1), Piece.RED)
+        self.assertTrue((Position.from_board(board).to_board().board == board.board).all())
+
+    def test_game_state(self):
+        rules = GameRules()
+        rng = random.Random(2)
+        for _ in range(30):
+            board = random_board(rng, 6, 6, rng.randint(1, 4))
+            self.assertEqual(Position.from_board(board).game_state(), rules.is_game_over(board))
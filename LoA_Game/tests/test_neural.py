@@ -0,0 +1,88 @@
+from unittest import TestCase
+import os
+import tempfile
+
+import numpy as np
+
+from linesofaction.movegen import Position
+from linesofaction.neural import NeuralEvaluator, _conv3x3
+from linesofaction.piece import Piece
+from linesofaction.rules import GameEndState
+from linesofaction.search import Searcher
+
+
+def positions(count, rows=8, cols=8):
+    rng = np.random.default_rng(0)
+    result = []
+    position = Position.initial(rows, cols)
+    while len(result) < count:
+        moves = position.moves()
+        if not moves or position.game_state() != GameEndState.CONTINUE:
+            position = Position.initial(rows, cols)
+            continue
+        position.make(moves[rng.integers(len(moves))])
+        result.append(position.copy())
+    return result
+
+
+class TestNeuralEvaluator(TestCase):
+    def test_batch_matches_single(self):
+        for net in (NeuralEvaluator.random(hidden=(32, 16)), NeuralEvaluator.random(channels=(4, 3), hidden=(8,))):
+            sample = positions(20)
+            batch = net.evaluate_batch([bytes(p.cells) for p in sample], [p.player for p in sample])
+            self.assertEqual(len(batch), 20)
+            for score, position in zip(batch, sample):
+                self.assertAlmostEqual(score, net(position), delta=1)
+                self.assertLessEqual(abs(score), NeuralEvaluator.kScale)
+            self.assertEqual(net.evaluate_batch([], []), [])
+            lists = net.evaluate_batch([list(p.cells) for p in sample], [p.player for p in sample])
+            self.assertEqual(lists, batch)
+
+    def test_features_are_from_the_mover(self):
+        net = NeuralEvaluator.random(6, 7)
+        board = np.array(Position.initial(6, 7).cells, dtype=np.int8)
+        swapped = np.where(board == Piece.BLACK, Piece.RED, np.where(board == Piece.RED, Piece.BLACK, 0))
+        np.testing.assert_array_equal(net.features([board], [0]), net.features([swapped], [1]))
+        planes = net.features([board], [0])
+        self.assertEqual(planes.shape, (1, 2, 6, 7))
+        self.assertEqual(planes[0, 0].sum(), 2 * 5)  # Black pieces
+        self.assertEqual(planes[0, 1].sum(), 2 * 4)  # Red pieces
+
+    def test_save_load(self):
+        net = NeuralEvaluator.random(channels=(3,), hidden=(5,), seed=4)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'eval.npz')
+            net.save(path)
+            loaded = NeuralEvaluator.load(path)
+        sample = positions(5)
+        cells, players = [bytes(p.cells) for p in sample], [p.player for p in sample]
+        self.assertEqual(loaded.evaluate_batch(cells, players), net.evaluate_batch(cells, players))
+
+    def test_invalid_layers(self):
+        with self.assertRaises(ValueError):
+            NeuralEvaluator(8, 8, dense=[(np.zeros((10, 1)), np.zeros(1))])
+        with self.assertRaises(ValueError):
+            NeuralEvaluator(8, 8, dense=[(np.zeros((128, 4)), np.zeros(4))])
+        with self.assertRaises(ValueError):
+            NeuralEvaluator(8, 8, convs=[(np.zeros((4, 3, 3, 3)), np.zeros(4))],
+                            dense=[(np.zeros((256, 1)), np.zeros(1))])
+
+    def test_conv3x3(self):
+        rng = np.random.default_rng(1)
+        x = rng.normal(size=(2, 4, 5, 3))
+        weight = rng.normal(size=(6, 3, 3, 3))
+        padded = np.pad(x, ((0, 0), (1, 1), (1, 1), (0, 0)))
+        expected = np.zeros((2, 4, 5, 6))
+        for row in range(4):
+            for col in range(5):
+                window = padded[:, row:row + 3, col:col + 3, :]  # (N, 3, 3, C)
+                expected[:, row, col] = np.einsum('nijc,ocij->no', window, weight)
+        np.testing.assert_allclose(_conv3x3(x, weight), expected, rtol=1e-6, atol=1e-9)
+
+    def test_search_with_batches(self):
+        net = NeuralEvaluator.random(hidden=(16,), seed=2)
+        position = Position.initial()
+        plain = Searcher(evaluate=net).search(position, depth=2)
+        batched = Searcher(evaluate=net, batch_evaluate=net.evaluate_batch).search(position, depth=2)
+        self.assertEqual(batched.move, plain.move)
+        self.assertAlmostEqual(batched.score, plain.score, delta=1)
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from linesofaction.board import Board
+from linesofaction.notation import (board_to_str, move_to_str, parse_move, parse_player,
+                                    parse_square, square_to_str, str_to_rows)
+from linesofaction.piece import Piece
+
+
+class TestNotation(TestCase):
+    def test_squares(self):
+        self.assertEqual(parse_square('A1'), (0, 0))
+        self.assertEqual(parse_square(' c3 '), (2, 2))
+        for row, col in [(0, 0), (7, 7), (9, 25), (3, 26), (0, 701), (0, 702)]:
+            with self.subTest(row=row, col=col):
+                self.assertEqual(parse_square(square_to_str(row, col)), (row, col))
+        self.assertEqual(square_to_str(0, 26), 'AA1')
+        for text in ['A', '1A', 'A1B', '']:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_square(text)
+
+    def test_moves(self):
+        self.assertEqual(parse_move('B1D3'), ((0, 1), (2, 3)))
+        self.assertEqual(parse_move('b1-d3'), ((0, 1), (2, 3)))
+        self.assertEqual(move_to_str(((0, 1), (2, 3))), 'B1D3')
+        with self.assertRaises(ValueError):
+            parse_move('B1')
+
+    def test_boards(self):
+        board = Board(rows=6, cols=6)
+        rows = str_to_rows(board_to_str(board))
+        self.assertEqual(rows, [[Piece(value) for value in row] for row in board.board.tolist()])
+        with self.assertRaises(ValueError):
+            str_to_rows('b.x/...')
+        with self.assertRaises(ValueError):
+            str_to_rows('b../..')
+        self.assertEqual(parse_player('b'), Piece.BLACK)
+        self.assertEqual(parse_player('Red'), Piece.RED)
@@ -0,0 +1,56 @@
+from unittest import TestCase
+import time
+
+from linesofaction.board import Board
+from linesofaction.movegen import Position
+from linesofaction.ponder import Ponderer
+
+
+def play(position, move):
+    tables = position.tables
+    position.make((tables.square(move[0]), tables.square(move[1])))
+
+
+class TestPonderer(TestCase):
+    def setUp(self):
+        self.ponderer = Ponderer()
+        self.position = Position.from_board(Board(rows=6, cols=6))
+        self.result = self.ponderer.think(self.position, depth=2)
+        play(self.position, self.result.move)
+
+    def tearDown(self):
+        self.ponderer.stop()
+
+    def test_ponder_hit(self):
+        self.ponderer.ponder(self.position, self.result)
+        self.assertTrue(self.ponderer.pondering)
+        time.sleep(0.3)
+        play(self.position, self.result.pv[1])
+        start = time.monotonic()
+        result = self.ponderer.think(self.position, budget=0.1)
+        # The ponder search went on: its time counts, and it was not restarted
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertGreaterEqual(result.elapsed, 0.3)
+        self.assertEqual((self.ponderer.hits, self.ponderer.misses), (1, 0))
+        self.assertFalse(self.ponderer.pondering)
+        origin, _ = result.move
+        self.assertEqual(self.position.cells[self.position.tables.square(origin)], self.position.player)
+
+    def test_ponder_miss(self):
+        self.ponderer.ponder(self.position, self.result)
+        time.sleep(0.1)
+        other = next(move for move in self.position.moves()
+                     if tuple(map(self.position.tables.position, move)) != self.result.pv[1])
+        self.position.make(other)
+        result = self.ponderer.think(self.position, budget=0.1)
+        self.assertLess(result.elapsed, 0.3)
+        self.assertEqual((self.ponderer.hits, self.ponderer.misses), (0, 1))
+        self.assertGreater(len(self.ponderer.searcher.tt), 0)
+
+    def test_stop(self):
+        self.ponderer.ponder(self.position)
+        time.sleep(0.1)
+        start = time.monotonic()
+        self.ponderer.stop()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(self.ponderer.pondering)
@@ -0,0 +1,128 @@
+from unittest import TestCase
+import os
+import random
+import tempfile
+
+from linesofaction.movegen import Position
+from linesofaction.board import Board
+from linesofaction.notation import square_to_str
+from linesofaction.piece import Piece
+from linesofaction.replay import ReplayResult, iter_replay, parse_game, replay, replay_files, replay_lines
+from linesofaction.rules import GameEndState
+
+
+def random_game(rng, rows=8, cols=8, max_plies=300):
+    position = Position.from_board(Board(rows=rows, cols=cols))
+    tables = position.tables
+    moves = []
+    while len(moves) < max_plies and position.game_state() == GameEndState.CONTINUE:
+        legal = position.moves()
+        if not legal:
+            break
+        move = rng.choice(legal)
+        position.make(move)
+        moves.append(tuple(square_to_str(*tables.position(square)) for square in move))
+    return moves, position.game_state()
+
+
+class TestReplay(TestCase):
+    def test_parse_game(self):
+        self.assertEqual(parse_game('B1-B3, h3e3 C1 C3'),
+                         ((8, 8), [('B1', 'B3'), ('h3', 'e3'), ('C1', 'C3')]))
+        self.assertEqual(parse_game('6x6 B1B3'), ((6, 6), [('B1', 'B3')]))
+        with self.assertRaises(ValueError):
+            parse_game('B1B3 C1')
+
+    def test_random_games(self):
+        rng = random.Random(0)
+        results = {GameEndState.WIN1: 'black', GameEndState.WIN2: 'red', GameEndState.TIE: 'tie'}
+        for _ in range(30):
+            moves, state = random_game(rng)
+            result = replay(moves)
+            self.assertIsNone(result.error, result)
+            self.assertEqual(result.plies, len(moves))
+            self.assertEqual(result.result, results.get(state))
+
+    def test_first_illegal_move(self):
+        cases = [
+            ([('B1', 'B3'), ('A2', 'A5')], 1, 'not valid'),
+            ([('B1', 'B3'), ('B3', 'B5')], 1, 'No red piece'),
+            ([('B1', 'B9')], 0, 'out of the board'),
+            ([('B1', 'B3'), ('A2', 'C2'), ('X1', 'X2')], 2, 'out of the board'),
+        ]
+        for moves, plies, error in cases:
+            with self.subTest(moves=moves):
+                result = replay(moves)
+                self.assertEqual(result.plies, plies)
+                self.assertIn(error, result.error)
+                self.assertEqual(result.move, '-'.join(moves[plies]))
+
+    def test_moves_after_the_end(self):
+        rng = random.Random(1)
+        moves, state = random_game(rng, 5, 5)
+        while state == GameEndState.CONTINUE:
+            moves, state = random_game(rng, 5, 5)
+        result = replay(moves + [moves[-1]], 5, 5)
+        self.assertEqual(result.plies, len(moves))
+        self.assertIn('already over', result.error)
+
+    def test_iter_replay(self):
+        moves, _ = random_game(random.Random(2), 6, 6, max_plies=20)
+        expected = Position.from_board(Board(rows=6, cols=6))
+        result = ReplayResult()
+        steps = 0
+        for position, move in iter_replay(moves, 6, 6, result):
+            self.assertEqual(position.cells, expected.cells)
+            self.assertEqual([square_to_str(*position.tables.position(square)) for square in move],
+                             list(moves[steps]))
+            expected.make(move)
+            steps += 1
+        self.assertEqual(steps, len(moves))
+        self.assertEqual(position.cells, expected.cells)  # The final position
+        self.assertEqual(repr(result), repr(replay(moves, 6, 6)))
+
+        result = ReplayResult()
+        self.assertEqual(len(list(iter_replay([('B1', 'B3'), ('B3', 'B5')], result=result))), 1)
+        self.assertIn('No red piece', result.error)
+
+    def test_pass(self):
+        # Red has no move after B1-B3 and passes: black plays A2-B1 next
+        (rows, cols), moves = parse_game('4x4 B1-B3 D2-B2 C4-A4 B2-D2 A4-C4 A3-A1 B4-D2 A2-C2 C4-B4 '
+                                         'A1-A2 C1-B1 A2-A1 B3-A2 C2-C1 B4-B2 D3-C3 B1-B3 A2-B1')
+        players = [position.player for position, _ in iter_replay(moves, rows, cols)]
+        self.assertEqual(players[-3:], [Piece.RED, Piece.BLACK, Piece.BLACK])
+        result = replay(moves, rows, cols)
+        self.assertIsNone(result.error)
+        self.assertEqual(result.plies, len(moves))
+        self.assertIsNone(result.result)
+        # Once passed, red's move is rejected
+        result = replay(moves[:-1] + [('A1', 'B2')], rows, cols)
+        self.assertEqual(result.plies, len(moves) - 1)
+        self.assertIn('No black piece', result.error)
+
+    def test_replay_lines(self):
+        lines = ['# comment\n', '\n', 'B1B3 A2A5\n', '6x6 B1B3\n', 'B1\n']
+        results = list(replay_lines(lines, 'games.txt'))
+        self.assertEqual([result.line for result in results], [3, 4, 5])
+        self.assertEqual(str(results[0]), 'games.txt:3: ply 2: A2-A5: The move is not valid.')
+        self.assertIsNone(results[1].error)
+        self.assertEqual(str(results[2]), 'games.txt:5: Incomplete move: B1')
+
+    def test_replay_files(self):
+        rng = random.Random(2)
+        games = [' '.join(''.join(move) for move in random_game(rng, max_plies=40)[0])
+                 for _ in range(50)]
+        games[17] = 'B1B3 B3B5'
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for idx in range(2):
+                paths.append(os.path.join(tmp, f'games{idx}.txt'))
+                with open(paths[-1], 'w') as f:
+                    f.write('\n'.join(games) + '\n')
+            serial = [repr(result) for result in replay_files(paths, processes=1, chunk_lines=7)]
+            parallel = [repr(result) for result in replay_files(paths, processes=2, chunk_lines=7)]
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(serial), 100)
+        errors = [result for result in serial if 'error=None' not in result]
+        self.assertEqual(len(errors), 2)
+        self.assertIn('line=18', errors[0])
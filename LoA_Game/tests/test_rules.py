@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from linesofaction.board import Board
+from linesofaction.piece import Piece
+from linesofaction.rules import GameRules
+
+
+class TestGameRulesValidSteps(TestCase):
+    def test_diagonal_counts(self):
+        board = Board(rows=8, cols=8)
+        board._init_board()
+        board.place((3, 3), Piece.BLACK)
+        board.place((2, 4), Piece.RED)    # On the antidiagonal
+        board.place((0, 6), Piece.BLACK)  # On the antidiagonal, behind the red piece
+        steps = GameRules().get_valid_steps(board, (3, 3), Piece.BLACK)
+        # 1 piece on the rank, file and main diagonal, 3 on the antidiagonal
+        # (north-east is blocked by the red piece)
+        self.assertEqual(steps, {(3, 2), (3, 4), (2, 3), (4, 3), (2, 2), (4, 4), (6, 0)})
+
+    def test_capture(self):
+        board = Board(rows=8, cols=8)
+        board._init_board()
+        board.place((3, 3), Piece.BLACK)
+        board.place((3, 5), Piece.RED)
+        steps = GameRules().get_valid_steps(board, (3, 3), Piece.BLACK)
+        self.assertIn((3, 5), steps)  # 2 steps east, captures
+        self.assertIn((3, 1), steps)
+        board.place((3, 4), Piece.RED)
+        steps = GameRules().get_valid_steps(board, (3, 3), Piece.BLACK)
+        self.assertNotIn((3, 6), steps)  # Would jump over a red piece
+        self.assertIn((3, 0), steps)
+
+
+class TestGameRulesHasLegalMove(TestCase):
+    def test_matches_move_generation(self):
+        import random
+        rules = GameRules()
+        rng = random.Random(0)
+        blocked = 0
+        for _ in range(500):
+            board = Board(rows=4, cols=4)
+            board._init_board()
+            for _ in range(rng.randrange(1, 24)):
+                position = (rng.randrange(4), rng.randrange(4))
+                if board.is_empty(position):
+                    board.place(position, rng.choice(board.players))
+            for player in board.players:
+                expected = any(rules.get_valid_steps(board, position, player)
+                               for position in board.get_positions(player))
+                self.assertEqual(rules.has_legal_move(board, player), expected, f'\n{board}')
+                blocked += not expected and board.count(player) > 0
+        self.assertGreater(blocked, 0)  # Some boards leave pieces without moves
+
+    def test_blocked(self):
+        board = Board(rows=4, cols=4)
+        board.set_cells([0, 2, 2, 2,
+                         2, 2, 0, 0,
+                         2, 0, 2, 0,
+                         0, 1, 2, 0])
+        self.assertFalse(GameRules().has_legal_move(board, Piece.RED))
+        self.assertTrue(GameRules().has_legal_move(board, Piece.BLACK))
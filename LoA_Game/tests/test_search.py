@@ -0,0 +1,117 @@
+from unittest import TestCase
+import threading
+import time
+
+from linesofaction.board import Board
+from linesofaction.movegen import Position
+from linesofaction.piece import Piece
+from linesofaction.search import Searcher, evaluate, kInfinity, kMaxPly, kWin
+
+
+def make_board(rows, cols, black, red):
+    board = Board(rows=rows, cols=cols)
+    board._init_board()
+    for position in black:
+        board.place(position, Piece.BLACK)
+    for position in red:
+        board.place(position, Piece.RED)
+    return board
+
+
+class TestSearcher(TestCase):
+    def test_finds_win(self):
+        # E.g. D2 -> C2 connects all black pieces
+        board = make_board(6, 6, black=[(0, 0), (0, 1), (1, 3)], red=[(5, 5), (5, 3), (3, 5)])
+        position = Position.from_board(board, Piece.BLACK)
+        result = Searcher().search(position, depth=3)
+        self.assertEqual(result.score, kWin - 1)
+        self.assertEqual(result.depth, 1)  # Stops deepening after a forced win
+        tables = position.tables
+        position.make((tables.square(result.move[0]), tables.square(result.move[1])))
+        self.assertTrue(position.is_connected(Piece.BLACK))
+
+    def test_depth_limit(self):
+        searcher = Searcher()
+        infos = []
+        result = searcher.search(Board(), depth=2, on_info=infos.append)
+        self.assertEqual(result.depth, 2)
+        self.assertEqual([info.depth for info in infos], [1, 2])
+        self.assertEqual(len(result.pv), 2)
+        self.assertIsNotNone(result.move)
+
+    def test_node_limit(self):
+        result = Searcher().search(Board(), node_limit=300)
+        self.assertLessEqual(result.nodes, 300)
+        self.assertIsNotNone(result.move)
+
+    def test_deadline(self):
+        start = time.monotonic()
+        result = Searcher().search(Board(), deadline=start + 0.2)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertIsNotNone(result.move)
+
+    def test_stop(self):
+        searcher = Searcher()
+        threading.Timer(0.1, searcher.stop).start()
+        start = time.monotonic()
+        result = searcher.search(Board())
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertIsNotNone(result.move)
+
+    def test_no_moves(self):
+        # A lone piece blocked in a corner by enemies cannot move
+        board = make_board(4, 4, black=[(0, 0)], red=[(0, 1), (1, 0), (1, 1)])
+        result = Searcher().search(Position.from_board(board, Piece.BLACK), depth=1)
+        self.assertIsNone(result.move)
+
+    def test_no_move_rule(self):
+        # Black B2-D5 leaves red without a legal move (see test_game_engine.TestGameEngineNoMove)
+        board = Board(rows=5, cols=5).set_cells([0, 0, 2, 0, 0,
+                                                 0, 1, 0, 1, 2,
+                                                 0, 0, 2, 2, 2,
+                                                 0, 2, 0, 1, 0,
+                                                 0, 2, 0, 0, 0])
+        position = Position.from_board(board, Piece.BLACK)
+        position.make((position.tables.square((1, 4)), position.tables.square((3, 4))))
+        self.assertFalse(position.has_move())
+        before = (position.player, position.key, position.cells[:])
+        scores = {}
+        for rule in ('pass', 'lose'):
+            searcher = Searcher(no_move=rule)
+            scores[rule] = searcher._negamax(position, 1, -kInfinity, kInfinity, ply=1)
+            self.assertEqual((position.player, position.key, position.cells), before)  # Pass taken back
+        # Passing: black moves again, scored by the evaluation
+        self.assertLess(abs(scores['pass']), kWin - kMaxPly)
+        self.assertEqual(scores['lose'], -(kWin - 1))
+        with self.assertRaises(ValueError):
+            Searcher(no_move='draw')
+
+    def test_repetitions_are_draws(self):
+        position = Position.from_board(Board())
+        children = []
+        for move in position.moves():
+            captured = position.make(move)
+            children.append(position.key)
+            position.unmake(move, captured)
+        self.assertNotEqual(Searcher().search(position, depth=1).score, 0)
+        for batch_evaluate in (None, lambda cells, players: [100] * len(cells)):
+            with self.subTest(batched=batch_evaluate is not None):
+                searcher = Searcher(batch_evaluate=batch_evaluate)
+                # Every move repeats an earlier position of the game
+                self.assertEqual(searcher.search(position, depth=2, history=children).score, 0)
+
+    def test_batched_frontier(self):
+        def batch_evaluate(cells, players):
+            calls.append(len(cells))
+            positions = [Position(tables, list(c), player) for c, player in zip(cells, players)]
+            return [evaluate(position) for position in positions]
+
+        tables = Position.from_board(Board()).tables
+        for depth in (1, 2, 3):
+            with self.subTest(depth=depth):
+                calls = []
+                plain = Searcher().search(Board(), depth=depth)
+                batched = Searcher(batch_evaluate=batch_evaluate, batch_size=8).search(Board(), depth=depth)
+                self.assertEqual((batched.move, batched.score, batched.pv), (plain.move, plain.score, plain.pv))
+                self.assertEqual(bool(calls), depth > 1)
+                self.assertLessEqual(max(calls, default=0), 8)
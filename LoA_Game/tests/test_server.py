@@ -0,0 +1,65 @@
+from unittest import IsolatedAsyncioTestCase
+
+from linesofaction.server import GameClient, GameServer
+from linesofaction.server import protocol
+from linesofaction.server.loadgen import LoadGenerator
+
+
+class TestGameServer(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = await GameServer(port=0).start()
+        self.client = await GameClient.connect('127.0.0.1', self.server.port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_new_game(self):
+        response = await self.client.request('new', rows=6, cols=6)
+        self.assertTrue(response['ok'])
+        self.assertEqual(response['player'], 'black')
+        self.assertIsNone(response['winner'])
+        self.assertEqual(response['board'].split('/')[0], '.bbbb.')
+        self.assertIn(response['game'], self.server.games)
+
+    async def test_move(self):
+        game = (await self.client.request('new'))['game']
+        response = await self.client.request('select', game=game, pos=[0, 1])
+        self.assertIn([2, 1], response['moves'])
+        response = await self.client.request('move', game=game, to=[2, 1])
+        self.assertEqual(response['player'], 'red')
+        board = protocol.str_to_rows((await self.client.request('state', game=game))['board'])
+        self.assertEqual(board[2][1], self.server.games[game].board.players[0])
+
+    async def test_errors(self):
+        game = (await self.client.request('new'))['game']
+        cases = [
+            ({'cmd': 'nope'}, 'Unknown command'),
+            ({'cmd': 'state', 'game': 12345}, 'Unknown game'),
+            ({'cmd': 'select', 'game': game, 'pos': [1, 0]}, 'not your piece'),
+            ({'cmd': 'select', 'game': game, 'pos': [8, 0]}, 'out of the board'),
+            ({'cmd': 'move', 'game': game, 'from': [0, 1], 'to': [5, 5]}, 'not valid'),
+            ({'cmd': 'new', 'rows': 2}, 'at least 4'),
+        ]
+        for request, error in cases:
+            with self.subTest(request=request):
+                response = await self.client.request(**request)
+                self.assertFalse(response['ok'])
+                self.assertIn(error, response['error'])
+        # Malformed lines are answered as well
+        response = await self.server.handle_line(b'{not json')
+        self.assertFalse(response['ok'])
+
+    async def test_concurrent_requests(self):
+        responses = [await self.client.request('new') for _ in range(50)]
+        games = [response['game'] for response in responses]
+        self.assertEqual(len(set(games)), 50)
+        pong = await self.client.request('ping')
+        self.assertEqual(pong['games'], 50)
+
+    async def test_load_generator(self):
+        generator = LoadGenerator([self.client], think=0.0, seed=0)
+        await generator.run(idle=10, active=3, duration=0.2)
+        self.assertGreater(len(generator.latencies['move']), 0)
+        self.assertEqual(generator.errors['move'], 0)
+        self.assertIn('move', generator.report(1.0))
@@ -0,0 +1,159 @@
+from unittest import IsolatedAsyncioTestCase
+import asyncio
+import json
+
+from linesofaction.board import Board
+from linesofaction.engine import GameEngine
+from linesofaction.piece import Piece
+from linesofaction.server import GameClient, GameServer
+from linesofaction.server.spectators import GameChannel
+from linesofaction.zobrist import Zobrist
+
+
+class FakeWriter:
+    def __init__(self):
+        self.written = []
+        self.blocked = asyncio.Event()
+        self.blocked.set()
+
+    def write(self, data):
+        self.written.append(data)
+
+    def is_closing(self):
+        return False
+
+    async def drain(self):
+        await self.blocked.wait()
+
+    def events(self):
+        return [json.loads(data) for data in self.written]
+
+
+def play(engine, origin, target):
+    piece = engine.board.peek(*origin)
+    captured = engine.board.peek(*target)
+    engine.select(origin, player=True, reset=False)
+    engine.move(target)
+    return piece, captured
+
+
+class TestGameChannel(IsolatedAsyncioTestCase):
+    async def test_fan_out_encodes_once(self):
+        engine = GameEngine()
+        channel = GameChannel(0, engine)
+        writers = [FakeWriter() for _ in range(100)]
+        for writer in writers:
+            channel.subscribe(writer)
+        await asyncio.sleep(0)
+        piece, captured = play(engine, (0, 1), (2, 1))
+        data = channel.publish_move((0, 1), (2, 1), piece, captured)
+        await asyncio.sleep(0)
+        for writer in writers:
+            self.assertEqual(len(writer.written), 2)
+            self.assertIs(writer.written[1], data)  # The same bytes object
+        snapshot, move = writers[0].events()
+        self.assertEqual(snapshot['event'], 'snapshot')
+        self.assertEqual(snapshot['ply'], 0)
+        self.assertEqual(move['ply'], 1)
+        self.assertEqual(move['from'], [0, 1])
+        self.assertEqual(move['to'], [2, 1])
+        self.assertFalse(move['capture'])
+        self.assertEqual(int(move['hash'], 16), Zobrist().hash(engine.board, engine.current_player))
+
+    async def test_late_joiner_snapshot(self):
+        engine = GameEngine()
+        channel = GameChannel(0, engine, ply=3)
+        channel.publish_move((0, 1), (2, 1), *play(engine, (0, 1), (2, 1)))
+        writer = FakeWriter()
+        channel.subscribe(writer)
+        await asyncio.sleep(0)
+        (snapshot,) = writer.events()
+        self.assertEqual(snapshot['ply'], 4)
+        self.assertEqual(snapshot['player'], 'red')
+        self.assertEqual(snapshot['board'].split('/')[2][1], Piece.BLACK.char())
+        self.assertEqual(int(snapshot['hash'], 16), channel.key)
+
+    async def test_pass(self):
+        # Red has no legal move once black plays (1, 4) -> (3, 4)
+        cells = [0, 0, 2, 0, 0, 0, 1, 0, 1, 2, 0, 0, 2, 2, 2, 0, 2, 0, 1, 0, 0, 2, 0, 0, 0]
+        engine = GameEngine(board=Board(rows=5, cols=5).set_cells(cells))
+        channel = GameChannel(0, engine)
+        writer = FakeWriter()
+        channel.subscribe(writer)
+        await asyncio.sleep(0)
+        channel.publish_move((1, 4), (3, 4), *play(engine, (1, 4), (3, 4)))
+        await asyncio.sleep(0)
+        move = writer.events()[-1]
+        self.assertEqual(move['passed'], 'red')
+        self.assertEqual(move['player'], 'black')
+        self.assertEqual(channel.key, engine.position_key())
+        self.assertEqual(int(move['hash'], 16), engine.position_key())
+        # The next move hands the turn back to red
+        channel.publish_move((3, 4), (1, 4), *play(engine, (3, 4), (1, 4)))
+        self.assertIsNone(engine.passed)
+        self.assertEqual(channel.key, engine.position_key())
+
+    async def test_slow_consumer_resync(self):
+        engine = GameEngine()
+        channel = GameChannel(0, engine, max_pending=2)
+        fast, slow = FakeWriter(), FakeWriter()
+        channel.subscribe(fast)
+        subscriber = channel.subscribe(slow)
+        slow.blocked.clear()
+        await asyncio.sleep(0)
+        moves = [((0, 1), (2, 1)), ((1, 0), (1, 2)), ((0, 3), (2, 3)), ((3, 0), (3, 2))]
+        for origin, target in moves:
+            channel.publish_move(origin, target, *play(engine, origin, target))
+            await asyncio.sleep(0)
+        self.assertEqual(len(fast.written), 1 + len(moves))
+        self.assertEqual(subscriber.dropped, 1)
+        # Once drained, the slow spectator catches up with a snapshot
+        slow.blocked.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        events = slow.events()
+        self.assertEqual([event['event'] for event in events], ['snapshot', 'snapshot'])
+        self.assertEqual(events[-1]['ply'], len(moves))
+        self.assertEqual(events[-1]['hash'], fast.events()[-1]['hash'])
+
+
+class TestServerWatch(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = await GameServer(port=0).start()
+        self.player = await GameClient.connect('127.0.0.1', self.server.port)
+        self.spectator = await GameClient.connect('127.0.0.1', self.server.port)
+
+    async def asyncTearDown(self):
+        await self.player.close()
+        await self.spectator.close()
+        await self.server.close()
+
+    async def next_event(self):
+        return await asyncio.wait_for(self.spectator.events.get(), 2.0)
+
+    async def test_watch(self):
+        game = (await self.player.request('new'))['game']
+        response = await self.spectator.request('watch', game=game)
+        self.assertTrue(response['ok'], response)
+        self.assertEqual(response['spectators'], 1)
+        self.assertEqual((await self.next_event())['event'], 'snapshot')
+
+        await self.player.request('move', game=game, **{'from': [0, 1], 'to': [2, 1]})
+        event = await self.next_event()
+        self.assertEqual(event['event'], 'move')
+        self.assertEqual((event['game'], event['ply'], event['player']), (game, 1, 'red'))
+
+        await self.spectator.request('unwatch', game=game)
+        await self.player.request('move', game=game, **{'from': [1, 0], 'to': [1, 2]})
+        await self.spectator.request('watch', game=game)
+        event = await self.next_event()
+        self.assertEqual((event['event'], event['ply']), ('snapshot', 2))
+
+        await self.player.request('close', game=game)
+        self.assertEqual((await self.next_event())['event'], 'closed')
+
+    async def test_watch_errors(self):
+        response = await self.spectator.request('watch', game=123)
+        self.assertIn('Unknown game', response['error'])
+        response = await self.spectator.request('unwatch', game=123)
+        self.assertIn('Not watching', response['error'])
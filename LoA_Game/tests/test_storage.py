@@ -0,0 +1,87 @@
+from unittest import TestCase
+import random
+
+from linesofaction.board import Board
+from linesofaction.piece import Piece
+from linesofaction.rules import GameRules
+from linesofaction.storage import ListStorage, NumpyStorage, kMaxListCells, make_storage
+
+
+class TestStorageBackends(TestCase):
+    def test_default_backend_depends_on_size(self):
+        self.assertEqual(Board(8, 8).backend, 'list')
+        self.assertIsInstance(make_storage(16, 16), ListStorage)
+        self.assertGreater(64 * 64, kMaxListCells)
+        self.assertEqual(Board(64, 64).backend, 'numpy')
+        self.assertEqual(Board(8, 8, backend='numpy').backend, 'numpy')
+        with self.assertRaises(ValueError):
+            Board(8, 8, backend='tensor')
+
+    def test_backends_agree(self):
+        rng = random.Random(7)
+        boards = [Board(6, 9, backend='list'), Board(6, 9, backend='numpy')]
+        rules = GameRules()
+        for _ in range(200):
+            row, col = rng.randrange(-6, 6), rng.randrange(-9, 9)
+            piece = rng.choice([Piece.BLACK, Piece.RED])
+            results = []
+            for board in boards:
+                if board.is_empty((row, col)):
+                    board.place((row, col), piece)
+                else:
+                    results.append(board.pop((row, col)))
+            self.assertEqual(results[:1], results[1:])
+            self.assertEqual(*(board.cells() for board in boards))
+        for board in boards:
+            self.assertIsInstance(board.peek(0, 0), Piece)
+        for piece in Piece:
+            self.assertEqual(*(board.count(piece) for board in boards))
+            self.assertEqual(*(board.get_positions(piece) for board in boards))
+        self.assertEqual(*(str(board) for board in boards))
+        for position in boards[0].get_positions(Piece.BLACK):
+            self.assertEqual(*(rules.get_valid_steps(board, position, Piece.BLACK) for board in boards))
+
+    def test_list_backend_errors(self):
+        board = Board(4, 4, backend='list')
+        with self.assertRaises(IndexError):
+            board.peek(4, 0)
+        with self.assertRaises(IndexError):
+            board.peek(0, -5)
+        with self.assertRaises(ValueError):
+            board.place((0, 1), Piece.RED)
+        with self.assertRaises(ValueError):
+            board.place((0, 0), Piece.EMPTY)
+        with self.assertRaises(ValueError):
+            board.set_cells([Piece.EMPTY] * 15)
+
+    def test_array_access_switches_to_numpy(self):
+        board = Board(5, 5, backend='list')
+        cells = board.cells()
+        board.board[2, 2] = Piece.RED  # Writes through the array must be kept
+        self.assertEqual(board.backend, 'numpy')
+        self.assertIsInstance(board._storage, NumpyStorage)
+        self.assertEqual(board.peek(2, 2), Piece.RED)
+        cells[2 * 5 + 2] = Piece.RED
+        self.assertEqual(board.cells(), cells)
+
+    def test_numpy_integers_keep_the_list_backend(self):
+        import numpy as np
+        board = Board(5, 5, backend='list')
+        row, col = np.argwhere(np.array(board.tolist()) == Piece.BLACK)[0]  # NumPy integers
+        self.assertEqual(board.peek(row, col), Piece.BLACK)
+        self.assertEqual(board[row, col], Piece.BLACK)
+        self.assertEqual(board.pop((row, col)), Piece.BLACK)
+        board.place((np.int64(2), np.int32(2)), np.int64(Piece.RED))
+        self.assertEqual(board.backend, 'list')
+        self.assertEqual(board.peek(2, 2), Piece.RED)
+        self.assertEqual(board.count(Piece.BLACK), 5)
+
+    def test_cells_round_trip(self):
+        for backend in ('list', 'numpy'):
+            with self.subTest(backend=backend):
+                board = Board(4, 6, backend=backend)
+                other = Board(4, 6, backend=backend).set_cells([Piece.EMPTY] * 24)
+                self.assertEqual(other.count(Piece.BLACK), 0)
+                other.set_cells(board.cells())
+                self.assertEqual(other.tolist(), board.tolist())
+                self.assertEqual(other.to_array().tolist(), board.tolist())
@@ -0,0 +1,74 @@
+from unittest import TestCase, mock
+import os
+import tempfile
+
+from linesofaction import tables
+from linesofaction.tables import DIRECTIONS, BoardTables, get_tables, tables_path
+
+
+class TestBoardTables(TestCase):
+    def test_rays_walk_to_the_edge(self):
+        t = BoardTables(5, 7)
+        for square in range(t.size):
+            row, col = t.position(square)
+            for direction, (dr, dc) in enumerate(DIRECTIONS):
+                ray = []
+                r, c = row + dr, col + dc
+                while 0 <= r < 5 and 0 <= c < 7:
+                    ray.append(t.square((r, c)))
+                    r, c = r + dr, c + dc
+                self.assertEqual(t.rays[square][direction], tuple(ray))
+            self.assertEqual(t.neighbours[square], tuple(ray[0] for ray in t.rays[square] if ray))
+            for orientation, index in enumerate(t.line_of[square]):
+                self.assertIn(square, t.lines[index])
+
+
+class TestTablesCache(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {'LOA_CACHE_DIR': self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        get_tables.cache_clear()
+        self.addCleanup(get_tables.cache_clear)
+
+    def assertSameTables(self, a, b):
+        self.assertEqual((a.rows, a.cols, a.size), (b.rows, b.cols, b.size))
+        self.assertEqual(a.lines, b.lines)
+        self.assertEqual(a.line_of, b.line_of)
+        self.assertEqual(a.rays, b.rays)
+        self.assertEqual(a.neighbours, b.neighbours)
+        self.assertEqual(a.zobrist.keys, b.zobrist.keys)
+        self.assertEqual(a.zobrist.side, b.zobrist.side)
+
+    def test_save_load(self):
+        path = os.path.join(self.tmp.name, 'tables.bin')
+        built = BoardTables(6, 9)
+        built.save(path)
+        self.assertSameTables(BoardTables.load(path, 6, 9), built)
+        with self.assertRaises(ValueError):
+            BoardTables.load(path, 9, 6)
+
+    def test_get_tables_uses_the_cache(self):
+        path = tables_path(7, 7)
+        self.assertIn(f'tables-v{tables.kTablesVersion}', path)
+        built = get_tables(7, 7)
+        self.assertTrue(os.path.exists(path))
+        get_tables.cache_clear()
+        with mock.patch.object(BoardTables, '_build_lines', side_effect=AssertionError('built')):
+            self.assertSameTables(get_tables(7, 7), built)
+
+    def test_bad_cache_file_is_rebuilt(self):
+        path = tables_path(8, 8)
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(b'LOATBL00 truncated')
+        self.assertSameTables(get_tables(8, 8), BoardTables(8, 8))
+        self.assertSameTables(BoardTables.load(path, 8, 8), BoardTables(8, 8))
+
+    def test_cache_disabled(self):
+        with mock.patch.dict(os.environ, {'LOA_CACHE_DIR': ''}):
+            self.assertIsNone(tables_path(8, 8))
+            get_tables(8, 8)
+        self.assertEqual(os.listdir(self.tmp.name), [])
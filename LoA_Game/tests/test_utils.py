@@ -3,7 +3,7 @@ from unittest import TestCase
 from itertools import product
 import numpy as np
 
-from linesofaction._utils import line_mask, line_of_sight_mask, all_lines_of_sight_mask
+from linesofaction._utils import line_mask, line_of_sight_mask, all_lines_of_sight_mask, line_of_sight_coords
 
 class TestStrEnumImport(TestCase):
     def test_str_enum_import(self):
@@ -142,3 +142,14 @@ class TestLineOfSight(TestCase):
 
                 mask = all_lines_of_sight_mask(obstructions, pivot, include_obstacles=True)
                 self.assertTrue(np.all(mask==expected_mask), f'Expected({pivot}):\n{expected_mask}\nGot:\n{mask}')
+
+    def test_line_of_sight_coords_in_bounds(self):
+        shape = (4, 5)
+        obstacles = [(1, 1)]
+        for pivot in product(range(shape[0]), range(shape[1])):
+            for orientation in 'hvda':
+                with self.subTest(pivot=pivot, orientation=orientation):
+                    coords = line_of_sight_coords(shape, pivot, obstacles, orientation,
+                                                  include_obstacles=True)
+                    for row, col in coords:
+                        self.assertTrue(0 <= row < shape[0] and 0 <= col < shape[1], coords)
@@ -0,0 +1,120 @@
+from unittest import IsolatedAsyncioTestCase
+import asyncio
+import time
+
+from linesofaction.board import Board
+from linesofaction.piece import Piece
+from linesofaction.server import GameClient, GameServer
+from linesofaction.server.workers import AIWorkerPool
+
+
+class TestAIWorkerPool(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.pool = await AIWorkerPool(num_workers=1, shapes=((8, 8),)).start()
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+
+    async def test_suggest(self):
+        board = Board()
+        result = await self.pool.suggest(board, Piece.BLACK, budget=0.2)
+        self.assertIsNotNone(result.move)
+        origin, _ = result.move
+        self.assertEqual(board.peek(*origin), Piece.BLACK)
+        self.assertGreater(result.nodes, 0)
+
+    async def test_event_loop_responsive(self):
+        task = asyncio.ensure_future(self.pool.suggest(Board(), Piece.BLACK, budget=0.5))
+        # The loop keeps ticking while the worker searches
+        ticks = 0
+        start = time.monotonic()
+        while not task.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        self.assertGreater(ticks, 10)
+        self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+    async def test_queue_deadline(self):
+        running = asyncio.ensure_future(self.pool.suggest(Board(), Piece.BLACK, budget=0.5))
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.pool.busy, 1)
+        # Only one worker, so this one expires in the queue
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.pool.suggest(Board(), Piece.BLACK, budget=0.1,
+                                    deadline=time.monotonic() + 0.1)
+        self.assertIsNotNone((await running).move)
+
+    async def test_cancel_running(self):
+        task = asyncio.ensure_future(self.pool.suggest(Board(), Piece.BLACK, budget=5.0))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        # The worker stops searching and becomes available quickly
+        start = time.monotonic()
+        result = await self.pool.suggest(Board(), Piece.BLACK, budget=0.1)
+        self.assertIsNotNone(result.move)
+        self.assertLess(time.monotonic() - start, 2.0)
+
+    async def test_last_worker_died(self):
+        worker = self.pool._idle[-1]
+        worker.process.kill()
+        worker.process.join()
+        with self.assertRaises(ConnectionError):
+            await self.pool.suggest(Board(), Piece.BLACK, budget=0.1)
+        self.assertEqual(self.pool.busy, 0)
+
+    async def test_idle_worker_died(self):
+        pool = await AIWorkerPool(num_workers=2).start()
+        try:
+            dead = pool._idle[-1]  # The next worker to be dispatched
+            dead.process.kill()
+            dead.process.join()
+            # The request is first sent to the dead worker, then requeued
+            result = await pool.suggest(Board(), Piece.BLACK, budget=0.1)
+            self.assertIsNotNone(result.move)
+            self.assertNotIn(dead, pool._workers)
+            self.assertEqual(pool.busy, 0)
+            # The reader of the dead worker does not bring it back
+            await asyncio.sleep(0.1)
+            self.assertEqual(len(pool._workers), 1)
+            self.assertIsNotNone((await pool.suggest(Board(), Piece.BLACK, budget=0.1)).move)
+        finally:
+            await pool.close()
+
+
+class TestServerAI(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.pool = await AIWorkerPool(num_workers=1).start()
+        self.server = await GameServer(port=0, ai_pool=self.pool).start()
+        self.client = await GameClient.connect('127.0.0.1', self.server.port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+        await self.pool.close()
+
+    async def test_ai_move(self):
+        game = (await self.client.request('new'))['game']
+        ai = asyncio.ensure_future(self.client.request('ai', game=game, budget=0.3))
+        await asyncio.sleep(0.05)
+        # Other requests are served while the computer thinks
+        response = await self.client.request('move', game=game, **{'from': [0, 1], 'to': [2, 1]})
+        self.assertFalse(response['ok'])
+        self.assertIn('thinking', response['error'])
+        response = await ai
+        self.assertTrue(response['ok'], response)
+        self.assertEqual(response['player'], 'red')
+        self.assertEqual(len(response['move']), 2)
+
+    async def test_ai_cancel_on_disconnect(self):
+        client = await GameClient.connect('127.0.0.1', self.server.port)
+        game = (await client.request('new'))['game']
+        asyncio.ensure_future(client.request('ai', game=game, budget=5.0))
+        await asyncio.sleep(0.2)
+        self.assertEqual(self.pool.busy, 1)
+        await client.close()
+        start = time.monotonic()
+        while self.pool.busy and time.monotonic() - start < 2.0:
+            await asyncio.sleep(0.02)
+        self.assertEqual(self.pool.busy, 0)
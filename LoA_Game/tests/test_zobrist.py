@@ -0,0 +1,21 @@
+from unittest import TestCase
+
+from linesofaction.board import Board
+from linesofaction.piece import Piece
+from linesofaction.zobrist import Zobrist
+
+
+class TestZobrist(TestCase):
+    def test_deterministic(self):
+        self.assertEqual(Zobrist(8, 8).keys, Zobrist(8, 8).keys)
+        self.assertNotEqual(Zobrist(8, 8).keys, Zobrist(8, 10).keys)
+
+    def test_move_delta(self):
+        hasher = Zobrist(8, 8)
+        board = Board()
+        key = hasher.hash(board, Piece.BLACK)
+        # Capture: B1 (black) takes A2 (red)
+        key ^= hasher.move_delta((0, 1), (1, 0), Piece.BLACK, Piece.RED)
+        board.pop((1, 0))
+        board.place((1, 0), board.pop((0, 1)))
+        self.assertEqual(key, hasher.hash(board, Piece.RED))
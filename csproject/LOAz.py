@@ -1,311 +1,243 @@
+import argparse
+
 from graphics import *
+from adapter import EngineAdapter, Piece
+from layout import Layout
+from renderer import BoardRenderer
+from worker import SearchWorker, poll_click
 
 GRID_SIZE = 8  # 8x8 grid
 CELL_SIZE = 60  # Size of each square cell
 MARGIN = 100  # Margin from the edges of the window
 
+COLORS = {'red': 'red', 'blue': 'royalblue', 'empty': 'antiquewhite'}
+# linesofaction pieces of the players (red plays the engine's RED, blue its BLACK)
+PLAYERS = {'red': Piece.RED, 'blue': Piece.BLACK}
+
 class Cell:
-    def __init__(self, row, col, occupancy='empty'):
+    # Presentation only: the pieces are kept by the rules engine
+    __slots__ = ('row', 'col')
+
+    def __init__(self, row, col):
         self.row = row
         self.col = col
-        self.occupancy = occupancy  # 'empty', 'red', or 'blue'
-        self.rect = None
-        self.highlight_rect = None
-
-    def draw(self, win):
-        x1 = MARGIN + self.col * CELL_SIZE
-        y1 = MARGIN + (GRID_SIZE - self.row - 1) * CELL_SIZE
-        x2 = x1 + CELL_SIZE
-        y2 = y1 + CELL_SIZE
-
-        # Determine fill color
-        if self.occupancy == 'red':
-            fill_color = 'red'
-        elif self.occupancy == 'blue':
-            fill_color = 'royalblue'
-        else:
-            fill_color = 'antiquewhite'
-
-        # Draw the rectangle
-        self.rect = Rectangle(Point(x1, y1), Point(x2, y2))
-        self.rect.setFill(fill_color)
-        self.rect.setWidth(2)
-        self.rect.draw(win)
-
-    def update(self, win):
-        if self.rect:
-            # Update fill color
-            if self.occupancy == 'red':
-                fill_color = 'red'
-            elif self.occupancy == 'blue':
-                fill_color = 'royalblue'
-            else:
-                fill_color = 'antiquewhite'
-            self.rect.setFill(fill_color)
-        else:
-            self.draw(win)
 
-    def highlight(self, win, color='yellow'):
-        if self.highlight_rect:
-            self.highlight_rect.undraw()
-        x1 = MARGIN + self.col * CELL_SIZE
-        y1 = MARGIN + (GRID_SIZE - self.row - 1) * CELL_SIZE
-        x2 = x1 + CELL_SIZE
-        y2 = y1 + CELL_SIZE
+    def draw(self, renderer, occupancy):
+        renderer.fill(self.row, self.col, COLORS[occupancy])
 
-        outline_padding = 2
-        x1 += outline_padding
-        y1 += outline_padding
-        x2 -= outline_padding
-        y2 -= outline_padding
+    def update(self, renderer, occupancy):
+        # The square exists from the start: only its fill colour changes
+        self.draw(renderer, occupancy)
 
-        self.highlight_rect = Rectangle(Point(x1, y1), Point(x2, y2))
-        self.highlight_rect.setOutline(color)
-        self.highlight_rect.setWidth(5)
-        self.highlight_rect.draw(win)
+    def highlight(self, renderer, color='yellow'):
+        renderer.highlight(self.row, self.col, color)
 
-    def clear_highlight(self):
-        if self.highlight_rect:
-            self.highlight_rect.undraw()
-            self.highlight_rect = None
+    def clear_highlight(self, renderer):
+        renderer.highlight(self.row, self.col, None)
 
 class Board:
     def __init__(self, win):
         self.win = win
+        self.renderer = BoardRenderer(win, Layout(GRID_SIZE, GRID_SIZE, CELL_SIZE, MARGIN),
+                                      edge_labels=True)
         self.grid = [[Cell(row, col) for col in range(GRID_SIZE)]
                      for row in range(GRID_SIZE)]
         self.initialize_board()
         self.draw_board()
 
     def initialize_board(self):
-        # Set up blue pieces
-        for col in range(1, 7):
-            self.grid[0][col].occupancy = 'blue'  # Top row
-            self.grid[7][col].occupancy = 'blue'  # Bottom row
-
-        # Set up red pieces
-        for row in range(1, 7):
-            self.grid[row][0].occupancy = 'red'  # Left column
-            self.grid[row][7].occupancy = 'red'  # Right column
+        # Blue pieces on the top and bottom rows, red pieces on the left
+        # and right columns, red moves first
+        self.game = EngineAdapter(PLAYERS, first='red', empty='empty',
+                                  rows=GRID_SIZE, cols=GRID_SIZE)
 
     def draw_board(self):
         for row in range(GRID_SIZE):
             for col in range(GRID_SIZE):
-                self.grid[row][col].draw(self.win)
-        self.draw_labels()
-
-    def draw_labels(self):
-        # Draw column labels (A-H) at top and bottom
-        for col in range(GRID_SIZE):
-            x_label = MARGIN + col * CELL_SIZE + CELL_SIZE / 2
-            # Top label
-            y_label_top = MARGIN - 20
-            col_label_top = Text(Point(x_label, y_label_top),
-                                 chr(65 + col))
-            col_label_top.setSize(12)
-            col_label_top.setStyle('bold')
-            col_label_top.draw(self.win)
-            # Bottom label
-            y_label_bottom = MARGIN + GRID_SIZE * CELL_SIZE + 20
-            col_label_bottom = Text(Point(x_label, y_label_bottom),
-                                    chr(65 + col))
-            col_label_bottom.setSize(12)
-            col_label_bottom.setStyle('bold')
-            col_label_bottom.draw(self.win)
-        # Draw row labels (1-8) on left and right
-        for row in range(GRID_SIZE):
-            y_label = MARGIN + (GRID_SIZE - row - 1) * CELL_SIZE + \
-                      CELL_SIZE / 2
-            # Left label
-            x_label_left = MARGIN - 20
-            row_label_left = Text(Point(x_label_left, y_label),
-                                  str(GRID_SIZE - row))
-            row_label_left.setSize(12)
-            row_label_left.setStyle('bold')
-            row_label_left.draw(self.win)
-            # Right label
-            x_label_right = MARGIN + GRID_SIZE * CELL_SIZE + 20
-            row_label_right = Text(Point(x_label_right, y_label),
-                                   str(GRID_SIZE - row))
-            row_label_right.setSize(12)
-            row_label_right.setStyle('bold')
-            row_label_right.draw(self.win)
+                self.grid[row][col].draw(self.renderer,
+                                         self.game.occupancy(row, col))
+        self.renderer.flush()
 
     def get_cell(self, row, col):
         return self.grid[row][col]
 
-    def move_piece(self, start_row, start_col, end_row, end_col, player):
-        self.grid[end_row][end_col].occupancy = player
-        self.grid[start_row][start_col].occupancy = 'empty'
+    def occupancy(self, row, col):
+        return self.game.occupancy(row, col)
+
+    def cells(self):
+        # Row by row, as linesofaction Piece values
+        return self.game.cells()
+
+    def move_piece(self, start_row, start_col, end_row, end_col):
+        # The engine moves the piece of the player to move and captures
+        self.game.move((start_row, start_col), (end_row, end_col))
         # Update cells
-        self.grid[start_row][start_col].update(self.win)
-        self.grid[end_row][end_col].update(self.win)
+        for row, col in ((start_row, start_col), (end_row, end_col)):
+            self.grid[row][col].update(self.renderer,
+                                       self.game.occupancy(row, col))
+        self.renderer.flush()
 
     def highlight_cell(self, row, col, color='yellow'):
-        self.grid[row][col].highlight(self.win, color)
+        self.grid[row][col].highlight(self.renderer, color)
+        self.renderer.flush()
 
     def highlight_possible_moves(self, possible_moves):
         for move_row, move_col in possible_moves:
-            self.grid[move_row][move_col].highlight(self.win, 'green')
+            self.grid[move_row][move_col].highlight(self.renderer, 'green')
+        self.renderer.flush()
 
     def clear_highlights(self):
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                self.grid[row][col].clear_highlight()
+        self.renderer.clear_highlights()
+        self.renderer.flush()
 
-    def get_possible_moves(self, row, col, player_color):
-        possible_moves = []
-        directions = [
-            (0, 1), (0, -1), (1, 0), (-1, 0),
-            (1, 1), (-1, -1), (1, -1), (-1, 1)
-        ]
-        for direction in directions:
-            row_delta, col_delta = direction
-            occupied_cells = []
-            # Check forward
-            check_row, check_col = row, col
-            while 0 <= check_row < GRID_SIZE and \
-                  0 <= check_col < GRID_SIZE:
-                if self.grid[check_row][check_col].occupancy != 'empty':
-                    occupied_cells.append((check_row, check_col))
-                check_row += row_delta
-                check_col += col_delta
-            # Check backward
-            check_row, check_col = row, col
-            while 0 <= check_row < GRID_SIZE and \
-                  0 <= check_col < GRID_SIZE:
-                if self.grid[check_row][check_col].occupancy != 'empty':
-                    occupied_cells.append((check_row, check_col))
-                check_row -= row_delta
-                check_col -= col_delta
-            occupied_count = len(occupied_cells)
-            target_row = row + row_delta * (occupied_count - 1)
-            target_col = col + col_delta * (occupied_count - 1)
-            if (0 <= target_row < GRID_SIZE and
-                0 <= target_col < GRID_SIZE and
-                (self.grid[target_row][target_col].occupancy == 'empty' or
-                 self.grid[target_row][target_col].occupancy != player_color)):
-                possible_moves.append((target_row, target_col))
-        return possible_moves
-
-    def is_connected(self, row, col, player_color, visited):
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1),
-                      (-1, -1), (-1, 1), (1, -1), (1, 1)]
-        stack = [(row, col)]
-        connected_cells = 0
-        while stack:
-            r, c = stack.pop()
-            if (r, c) not in visited:
-                visited.add((r, c))
-                connected_cells += 1
-                for dr, dc in directions:
-                    nr, nc = r + dr, c + dc
-                    if (0 <= nr < GRID_SIZE and 0 <= nc < GRID_SIZE and
-                        self.grid[nr][nc].occupancy == player_color and
-                        (nr, nc) not in visited):
-                        stack.append((nr, nc))
-        return connected_cells
+    def get_possible_moves(self, row, col):
+        return self.game.moves(row, col)
 
     def check_win(self, player_color):
-        visited = set()
-        total_pieces = sum(1 for row in self.grid for cell in row
-                           if cell.occupancy == player_color)
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                if (self.grid[row][col].occupancy == player_color and
-                    (row, col) not in visited):
-                    connected_cells = self.is_connected(row, col,
-                                                        player_color,
-                                                        visited)
-                    if connected_cells == total_pieces:
-                        return True
-        return False
+        # A move connecting both players' pieces ties: a win for both
+        return self.game.winner in (player_color, EngineAdapter.TIE)
 
 class Player:
     def __init__(self, color):
         self.color = color  # 'red' or 'blue'
 
 class Game:
-    def __init__(self):
+    def __init__(self, computer=None, budget=2.0):
         self.win = GraphWin("Lines of Action", 680, 680)
         self.win.setBackground("white")
         self.board = Board(self.win)
-        self.players = [Player('red'), Player('blue')]
-        self.current_player_index = 0
+        self.players = {'red': Player('red'), 'blue': Player('blue')}
+        # Color played by the computer, whose moves are searched in the background
+        self.computer = computer
+        self.worker = SearchWorker(budget) if computer is not None else None
+        # Piece selected by the human player and its possible moves
+        self.selected = None
+        self.possible_moves = []
 
     def play(self):
-        while True:
-            current_player = self.players[self.current_player_index]
-            print(f"{current_player.color.capitalize()}'s turn.")
-            # Clear previous highlights
-            self.board.clear_highlights()
-            # Ask player to select a piece
-            row, col = self.ask_player_for_move(current_player)
-            print(f"{current_player.color.capitalize()} selected "
+        # The window is polled, never waited on: it stays responsive while the computer thinks
+        self.announce_turn()
+        while not self.win.isClosed():
+            current_player = self.players[self.board.game.current]
+            if current_player.color == self.computer:
+                move_successful = self.computer_move(current_player)
+                if move_successful is None:
+                    poll_click(self.win)  # Clicks are ignored while thinking
+                    continue
+                if not move_successful:
+                    print(f"{current_player.color.capitalize()} has no legal move.")
+                    break
+            else:
+                click = poll_click(self.win)
+                if click is None or not self.handle_click(current_player, click):
+                    continue
+            # Check for win conditions
+            red_wins = self.board.check_win('red')
+            blue_wins = self.board.check_win('blue')
+            if red_wins and blue_wins:
+                print("It's a tie!")
+                break
+            elif red_wins:
+                print("Red wins!")
+                break
+            elif blue_wins:
+                print("Blue wins!")
+                break
+            # The engine switched to the next player
+            self.announce_turn()
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def announce_turn(self):
+        current_player = self.players[self.board.game.current]
+        print(f"{current_player.color.capitalize()}'s turn.")
+
+    def handle_click(self, player, click):
+        # First click: select a piece, second click: move it. True once moved.
+        if self.selected is None:
+            cell = self.ask_player_for_move(player, click)
+            if cell is None:
+                return False
+            row, col = cell
+            print(f"{player.color.capitalize()} selected "
                   f"{chr(col + ord('A'))}{8 - row}")
-            # Highlight selected cell
+            # Clear previous highlights, highlight selected cell
+            self.board.clear_highlights()
             self.board.highlight_cell(row, col, 'yellow')
             # Get possible moves
-            possible_moves = self.board.get_possible_moves(
-                row, col, current_player.color)
+            possible_moves = self.board.get_possible_moves(row, col)
             if not possible_moves:
                 print("No possible moves for this piece.")
-                continue
+                self.board.clear_highlights()
+                return False
             # Highlight possible moves
             self.board.highlight_possible_moves(possible_moves)
-            # Move piece
-            move_successful = self.move_piece(row, col, possible_moves,
-                                              current_player.color)
-            if move_successful:
-                # Check for win conditions
-                red_wins = self.board.check_win('red')
-                blue_wins = self.board.check_win('blue')
-                if red_wins and blue_wins:
-                    print("It's a tie!")
-                    break
-                elif red_wins:
-                    print("Red wins!")
-                    break
-                elif blue_wins:
-                    print("Blue wins!")
-                    break
-                # Switch to next player
-                self.current_player_index = 1 - self.current_player_index
-
-    def ask_player_for_move(self, player):
-        while True:
-            click = self.win.getMouse()
-            click_x, click_y = click.getX(), click.getY()
-            col = int((click_x - MARGIN) // CELL_SIZE)
-            row = int((GRID_SIZE - 1) - (click_y - MARGIN) // CELL_SIZE)
-            if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE:
-                if self.board.grid[row][col].occupancy == player.color:
-                    return row, col
-                else:
-                    print(f"Invalid selection. Please select a "
-                          f"{player.color} piece.")
-            else:
-                print("Invalid click. Please click within the board.")
-
-    def move_piece(self, start_row, start_col, possible_moves, player_color):
-        while True:
-            click = self.win.getMouse()
-            click_x, click_y = click.getX(), click.getY()
-            target_col = int((click_x - MARGIN) // CELL_SIZE)
-            target_row = int((GRID_SIZE - 1) - (click_y - MARGIN) // CELL_SIZE)
-            if 0 <= target_row < GRID_SIZE and 0 <= target_col < GRID_SIZE:
-                if (target_row, target_col) in possible_moves:
-                    self.board.move_piece(start_row, start_col,
-                                          target_row, target_col,
-                                          player_color)
-                    print(f"{player_color.capitalize()} moved to "
-                          f"{chr(target_col + ord('A'))}{8 - target_row}")
-                    return True
-                else:
-                    print("Invalid move. Please select a highlighted cell.")
-            else:
-                print("Invalid click. Please click within the board.")
+            self.selected, self.possible_moves = cell, possible_moves
+            return False
+        # Move piece
+        if not self.move_piece(*self.selected, self.possible_moves,
+                               player.color, click):
+            return False
+        self.selected = None
+        return True
+
+    def computer_move(self, player):
+        # None while thinking, True once moved, False without a legal move
+        if not self.worker.busy:
+            self.worker.start(self.board.cells(), GRID_SIZE, GRID_SIZE,
+                              PLAYERS[player.color])
+        move = self.worker.poll()
+        if move is None:
+            self.board.renderer.status(
+                f"{player.color.capitalize()}: {self.worker.progress}")
+            return None
+        self.board.renderer.status('')
+        if move is False:
+            return False
+        (start_row, start_col), (end_row, end_col) = move
+        self.board.clear_highlights()
+        self.board.move_piece(start_row, start_col, end_row, end_col)
+        print(f"{player.color.capitalize()} moved to "
+              f"{chr(end_col + ord('A'))}{8 - end_row}")
+        # Show the move until the next selection
+        self.board.highlight_cell(start_row, start_col, 'yellow')
+        self.board.highlight_cell(end_row, end_col, 'green')
+        return True
+
+    def ask_player_for_move(self, player, click):
+        cell = self.board.renderer.layout.cell_at(click.getX(), click.getY())
+        if cell is None:
+            print("Invalid click. Please click within the board.")
+            return None
+        row, col = cell
+        if self.board.occupancy(row, col) != player.color:
+            print(f"Invalid selection. Please select a "
+                  f"{player.color} piece.")
+            return None
+        return row, col
+
+    def move_piece(self, start_row, start_col, possible_moves, player_color,
+                   click):
+        cell = self.board.renderer.layout.cell_at(click.getX(), click.getY())
+        if cell is None:
+            print("Invalid click. Please click within the board.")
+            return False
+        if cell not in possible_moves:
+            print("Invalid move. Please select a highlighted cell.")
+            return False
+        target_row, target_col = cell
+        self.board.move_piece(start_row, start_col,
+                              target_row, target_col)
+        print(f"{player_color.capitalize()} moved to "
+              f"{chr(target_col + ord('A'))}{8 - target_row}")
+        return True
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Lines of Action")
+    parser.add_argument("--computer", choices=("red", "blue"),
+                        help="color played by the computer")
+    parser.add_argument("--budget", type=float, default=2.0,
+                        help="computer thinking time per move, in seconds")
+    args = parser.parse_args()
+    game = Game(args.computer, args.budget)
     game.play()
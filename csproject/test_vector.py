@@ -0,0 +1,64 @@
+import numpy as nmp
+import pytest
+
+from vector import Vector, VectorArray
+
+
+def test_vector_slots():
+    v = Vector(1, 2)
+    assert not hasattr(v, '__dict__')
+    with pytest.raises(AttributeError):
+        v.z = 3
+    assert v + Vector(2, 3) == Vector(3, 5) and v.times(2) == Vector(2, 4)
+
+
+def test_round_trip():
+    vectors = [Vector(0, 0), Vector(3, 4), Vector(-1.5, 2)]
+    array = VectorArray(vectors)
+    assert len(array) == 3 and array.array.shape == (3, 2)
+    assert array.to_vectors() == vectors and list(array) == vectors
+    assert array[1] == Vector(3, 4) and array[1:] == VectorArray(vectors[1:])
+    assert VectorArray([(0, 0), (3, 4), (-1.5, 2)]) == array
+    assert VectorArray.from_xy([0, 3, -1.5], [0, 4, 2]) == array
+    assert len(VectorArray()) == 0
+
+
+def test_arithmetic_matches_vector():
+    vectors = [Vector(1, 2), Vector(-3, 0.5), Vector(4, 4)]
+    others = [Vector(0, 1), Vector(2, 2), Vector(-1, 3)]
+    a, b = VectorArray(vectors), VectorArray(others)
+    assert (a + b).to_vectors() == [v + o for v, o in zip(vectors, others)]
+    assert (a - b).to_vectors() == [v - o for v, o in zip(vectors, others)]
+    assert a.times(2.5).to_vectors() == [v.times(2.5) for v in vectors]
+    assert a.times([1, 2, 3]).to_vectors() == [v.times(k) for v, k in zip(vectors, (1, 2, 3))]
+    # A single Vector applies to every vector
+    assert (a + Vector(1, 1)).to_vectors() == [v + Vector(1, 1) for v in vectors]
+    assert (a - Vector(1, 1)).to_vectors() == [v - Vector(1, 1) for v in vectors]
+    assert (Vector(1, 1) - a).to_vectors() == [Vector(1, 1) - v for v in vectors]
+    with pytest.raises(ValueError):
+        a + b[:2]
+    with pytest.raises(TypeError):
+        a + 1
+    with pytest.raises(TypeError):
+        a.times([1, 2])
+
+
+def test_distances():
+    a = VectorArray([Vector(0, 0), Vector(3, 4)])
+    assert a.distance_to(Vector(0, 0)).tolist() == [0.0, 5.0]
+    assert a.distance_to(VectorArray([Vector(0, 1), Vector(0, 0)])).tolist() == [1.0, 5.0]
+    b = VectorArray([Vector(6, 8), Vector(0, 4), Vector(3, 0)])
+    expected = [[v.distance_to(o) for o in b] for v in a]
+    assert nmp.allclose(a.pairwise_distances(b), expected)
+    assert a.pairwise_distances().tolist() == [[0.0, 5.0], [5.0, 0.0]]
+    assert b.nearest(Vector(1, 5)) == 1
+
+
+def test_hit_testing_many_points():
+    # Nearest of 64 cell centres for 10,000 clicks at once
+    centers = VectorArray([(30 + 60 * c, 30 + 60 * r) for r in range(8) for c in range(8)])
+    rng = nmp.random.default_rng(0)
+    clicks = VectorArray(rng.uniform(0, 480, size=(10000, 2)))
+    cells = clicks.pairwise_distances(centers).argmin(axis=1)
+    x, y = clicks.get_x(), clicks.get_y()
+    assert (cells == (y // 60).astype(int) * 8 + (x // 60).astype(int)).all()
@@ -0,0 +1,63 @@
+import time
+
+from worker import SearchWorker, poll_click
+
+# Initial position, row by row: 2 (linesofaction BLACK) on the first and last rows, 1 (RED) on the sides
+CELLS = [0, 2, 2, 2, 2, 2, 2, 0] + [1, 0, 0, 0, 0, 0, 0, 1] * 6 + [0, 2, 2, 2, 2, 2, 2, 0]
+
+
+class FakeWin:
+    def __init__(self, clicks=()):
+        self.clicks = list(clicks)
+
+    def checkMouse(self):
+        return self.clicks.pop(0) if self.clicks else None
+
+
+def wait(worker, timeout=10.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        move = worker.poll()
+        if move is not None:
+            return move
+        time.sleep(0.01)
+    raise AssertionError('No move')
+
+
+def test_search_in_background():
+    worker = SearchWorker(budget=0.2)
+    assert not worker.busy and worker.progress == ''
+    worker.start(CELLS, 8, 8, 2)
+    assert worker.busy and worker.progress.startswith('Thinking...')
+    (row, col), target = wait(worker)
+    assert CELLS[row * 8 + col] == 2 and target != (row, col)
+    assert not worker.busy
+
+
+def test_no_legal_move():
+    worker = SearchWorker(budget=0.2)
+    cells = [0] * 16
+    cells[0] = 1
+    worker.start(cells, 4, 4, 2)
+    assert wait(worker) is False
+
+
+def test_cancel_discards_the_move():
+    worker = SearchWorker(budget=30.0)
+    worker.start(CELLS, 8, 8, 2)
+    started = time.monotonic()
+    worker.cancel()
+    assert time.monotonic() - started < 1.0 and not worker.busy
+    assert worker.poll() is None  # The cancelled search's result is dropped
+    worker.budget = 0.1
+    worker.start(CELLS, 8, 8, 1)
+    (row, col), _ = wait(worker)
+    assert CELLS[row * 8 + col] == 1
+
+
+def test_poll_click():
+    win = FakeWin(['click'])
+    assert poll_click(win) == 'click'
+    started = time.monotonic()
+    assert poll_click(win, 0.05) is None
+    assert time.monotonic() - started >= 0.05
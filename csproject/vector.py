@@ -1,10 +1,15 @@
 """Vector"""
 
 import math as m
+import numbers
+
+import numpy as nmp
 
 __author__ = "Askar Takhirov"
 
 class Vector:
+    __slots__ = ('_x', '_y')
+
     def __init__(self, x:float=0.0, y:float=0.0): #I couldnt figure out how to pass test 1 without doing this
         self._x = x
         self._y = y
@@ -40,12 +45,16 @@ class Vector:
     def __add__(self, other):
         if isinstance(other, Vector):
             return Vector(self._x + other.get_x(), self._y + other.get_y())
+        if isinstance(other, VectorArray):
+            return NotImplemented  # VectorArray applies the vector to each of its vectors
         raise TypeError("Operand must be a Vector")
 
     # Vector subtraction
     def __sub__(self, other):
         if isinstance(other, Vector):
             return Vector(self._x - other.get_x(), self._y - other.get_y())
+        if isinstance(other, VectorArray):
+            return NotImplemented  # VectorArray applies the vector to each of its vectors
         raise TypeError("Operand must be a Vector")
 
     # Scalar multiplication (times)
@@ -60,4 +69,125 @@ class Vector:
             dx = self._x - other.get_x()
             dy = self._y - other.get_y()
             return m.sqrt(dx ** 2 + dy ** 2)
-        raise TypeError("Operand must be a Vector")
\ No newline at end of file
+        raise TypeError("Operand must be a Vector")
+
+
+class VectorArray:
+    """N vectors stored in a contiguous (N, 2) float array.
+
+    The bulk counterpart of Vector: +, -, times and distance_to work on all the
+    vectors at once, with another VectorArray of the same length or with a single
+    Vector (applied to every vector). Indexing returns a Vector.
+
+    Example:
+        centers = VectorArray([Vector(30, 30), Vector(90, 30)])
+        centers.distance_to(Vector(35, 40))   # array([11.18..., 55.9...])
+        centers.nearest(Vector(35, 40))       # 0
+    """
+    __slots__ = ('_xy',)
+
+    def __init__(self, vectors=()):
+        # Vectors, (x, y) pairs or an (N, 2) array
+        if not isinstance(vectors, nmp.ndarray):
+            vectors = [(v.get_x(), v.get_y()) if isinstance(v, Vector) else tuple(v) for v in vectors]
+        self._xy = nmp.ascontiguousarray(nmp.array(vectors, dtype=float).reshape(-1, 2))
+
+    @classmethod
+    def from_xy(cls, x, y):
+        """Builds the array from the sequences of x and y coordinates."""
+        return cls(nmp.column_stack((nmp.asarray(x, dtype=float), nmp.asarray(y, dtype=float))))
+
+    # Getters
+    def get_x(self):
+        return self._xy[:, 0]
+
+    def get_y(self):
+        return self._xy[:, 1]
+
+    @property
+    def array(self):
+        """The (N, 2) array of the vectors (a view, not a copy)."""
+        return self._xy
+
+    def to_vectors(self):
+        return [Vector(x, y) for x, y in self._xy.tolist()]
+
+    def __len__(self):
+        return len(self._xy)
+
+    def __getitem__(self, index):
+        if isinstance(index, numbers.Integral):
+            x, y = self._xy[index].tolist()
+            return Vector(x, y)
+        return VectorArray(self._xy[index])
+
+    def __iter__(self):
+        return iter(self.to_vectors())
+
+    # String representation for testing purposes
+    def __str__(self):
+        return "[" + ", ".join(f"<{x}, {y}>" for x, y in self._xy.tolist()) + "]"
+
+    def __repr__(self):
+        return f"VectorArray({self._xy.tolist()})"
+
+    # Equality check
+    def __eq__(self, other):
+        return isinstance(other, VectorArray) and nmp.array_equal(self._xy, other._xy)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def _operand(self, other):
+        # The (N, 2) or (2,) array of another VectorArray or of a Vector (broadcast to every vector)
+        if isinstance(other, VectorArray):
+            if len(other) != len(self):
+                raise ValueError(f"VectorArrays of different lengths ({len(self)} and {len(other)})")
+            return other._xy
+        if isinstance(other, Vector):
+            return nmp.array((other.get_x(), other.get_y()), dtype=float)
+        raise TypeError("Operand must be a Vector or a VectorArray")
+
+    # Vector addition
+    def __add__(self, other):
+        return VectorArray(self._xy + self._operand(other))
+
+    __radd__ = __add__
+
+    # Vector subtraction
+    def __sub__(self, other):
+        return VectorArray(self._xy - self._operand(other))
+
+    def __rsub__(self, other):
+        return VectorArray(self._operand(other) - self._xy)
+
+    # Scalar multiplication (times): one scalar, or one per vector
+    def times(self, scalar):
+        if isinstance(scalar, numbers.Real):
+            return VectorArray(self._xy * scalar)
+        scalars = nmp.asarray(scalar, dtype=float)
+        if scalars.shape != (len(self),):
+            raise TypeError("Operand must be a scalar or one scalar per vector")
+        return VectorArray(self._xy * scalars[:, None])
+
+    # Distances between the vectors and a Vector, or the vectors of a VectorArray pairwise by index
+    def distance_to(self, other):
+        d = self._xy - self._operand(other)
+        return nmp.hypot(d[:, 0], d[:, 1])
+
+    def pairwise_distances(self, other=None):
+        """Returns the (N, M) distances between each vector and each vector of other (default: self)."""
+        if other is None:
+            other = self
+        elif not isinstance(other, VectorArray):
+            other = VectorArray(other)
+        d = self._xy[:, None, :] - other._xy[None, :, :]
+        return nmp.hypot(d[..., 0], d[..., 1])
+
+    def nearest(self, vector):
+        """Returns the index of the vector closest to a Vector (e.g. the cell centre nearest to a click)."""
+        if not len(self):
+            raise ValueError("Empty VectorArray")
+        return int(nmp.argmin(self.distance_to(vector)))
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Background computer player for the graphics front-ends
+
+The front-ends never block on `win.getMouse()`: their loops poll for clicks
+with `poll_click`, so the window keeps redrawing while a computer move is
+being searched. `SearchWorker` runs the search of the linesofaction engine in
+a background thread. The GUI thread starts it, reads its `progress` between
+polls, and picks the move up with `poll`. Only the GUI thread touches the
+graphics objects; the search thread hands its result over through a queue.
+
+Example:
+    worker = SearchWorker(budget=2.0)
+    worker.start(cells, 8, 8, player)
+    while (move := worker.poll()) is None:
+        renderer.status(worker.progress)
+        poll_click(win)
+"""
+
+import queue
+import threading
+import time
+
+POLL_INTERVAL = 1 / 60  # Seconds between polls of an idle window
+
+
+def poll_click(win, interval=POLL_INTERVAL):
+    """Returns the click since the last poll, or None after a short idle sleep.
+
+    Unlike `win.getMouse()` this never blocks, so the caller's loop can keep
+    updating the window (and the progress of a search) while waiting.
+    """
+    click = win.checkMouse()  # Also processes the pending window events
+    if click is None:
+        time.sleep(interval)
+    return click
+
+
+class SearchWorker:
+    """Searches computer moves in a background thread.
+
+    Parameters:
+        budget: Search time per move, in seconds.
+        searcher: The linesofaction Searcher (default: a new one, kept between moves
+                  so its transposition table is reused).
+    """
+
+    def __init__(self, budget=2.0, searcher=None):
+        from adapter import use_linesofaction
+        use_linesofaction()
+        from linesofaction.search import Searcher
+        self.budget = budget
+        self.searcher = searcher if searcher is not None else Searcher()
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cancelled = None
+        self._started = 0.0
+        self._info = None  # SearchResult of the last completed depth
+
+    @property
+    def busy(self):
+        """True from `start` until the move was picked up with `poll`."""
+        return self._thread is not None
+
+    def start(self, cells, rows, cols, player):
+        """Starts searching a move.
+
+        Parameters:
+            cells: Flat row-major linesofaction Piece values of the board.
+            rows: Number of rows of the board.
+            cols: Number of columns of the board.
+            player: The linesofaction Piece to move.
+        """
+        if self.busy:
+            raise RuntimeError('A search is already running')
+        from linesofaction.movegen import Position
+        from linesofaction.tables import get_tables
+        position = Position(get_tables(rows, cols), cells, player)
+        self._cancelled = threading.Event()
+        self._started = time.monotonic()
+        with self._lock:
+            self._info = None
+        self._thread = threading.Thread(target=self._run, args=(position, self._cancelled),
+                                        name='SearchWorker', daemon=True)
+        self._thread.start()
+
+    def _run(self, position, cancelled):
+        # Search thread: no graphics calls here, the GUI thread polls for the result
+        try:
+            result = self.searcher.search(position, deadline=self._started + self.budget,
+                                          should_stop=cancelled.is_set, on_info=self._on_info)
+            move = result.move
+        except Exception as e:  # Handed over and raised in the GUI thread
+            move = e
+        self._results.put((cancelled, move))
+
+    def _on_info(self, info):
+        with self._lock:
+            self._info = info
+
+    @property
+    def progress(self):
+        """A line describing the running search, e.g. 'Thinking... 1.2s, depth 4, 35,012 nodes'."""
+        if not self.busy:
+            return ''
+        with self._lock:
+            info = self._info
+        text = f'Thinking... {time.monotonic() - self._started:.1f}s'
+        if info is not None:
+            # The node count of the running iteration is read without a lock: an int is read atomically
+            text += f', depth {info.depth}, {self.searcher.nodes:,} nodes'
+        return text
+
+    def poll(self):
+        """Returns the searched move once it is ready, None while searching.
+
+        The move is ((row, col), (row, col)) in the coordinates of the cells
+        given to `start`; a search that finds no legal move returns False.
+
+        Raises:
+            Exception: The error raised by the search, if it failed.
+        """
+        while True:
+            try:
+                token, move = self._results.get_nowait()
+            except queue.Empty:
+                return None
+            if token is self._cancelled and not token.is_set():
+                break
+            # Result of a cancelled search: dropped
+        self._thread = None
+        if isinstance(move, Exception):
+            raise move
+        return move if move is not None else False
+
+    def cancel(self):
+        """Stops the running search; its move is discarded."""
+        if self._thread is not None:
+            self._cancelled.set()
+            # The searcher is reused by the next search: wait for it (a few milliseconds)
+            self._thread.join()
+            self._thread = None